@@ -1,23 +1,143 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy import event, text
+from contextvars import ContextVar
+from fastapi import Request
+import asyncio
+import hashlib
 import os
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+asyncpg://user:password@db:5432/interview_db")
 
-if "postgresql" in DATABASE_URL:
-    engine = create_async_engine(
-        DATABASE_URL, 
-        echo=True,
-        connect_args={"ssl": "require"}
-    )
+# Optional read replica for polling-heavy GET endpoints (see get_read_db)
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+# How long a client keeps reading from the primary after its own writes
+READ_STICKY_SECONDS = float(os.getenv("READ_STICKY_SECONDS", "5"))
+
+# SQLite concurrency mode: WAL, separate read connections and serialized writes
+SQLITE_CONCURRENCY_MODE = DATABASE_URL.startswith("sqlite") and os.getenv("SQLITE_CONCURRENCY_MODE", "1") == "1"
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_WRITE_TIMEOUT = float(os.getenv("SQLITE_WRITE_TIMEOUT", "30"))
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL", # Durable at checkpoints, safe against corruption in WAL mode
+    f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000", # ~20MB page cache per connection
+)
+
+def configure_sqlite(async_engine, read_only: bool = False):
+    """Applies SQLITE_PRAGMAS to every new connection of the engine."""
+    pragmas = SQLITE_PRAGMAS + (("PRAGMA query_only=ON",) if read_only else ())
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+def _create_engine(url: str):
+    if "postgresql" in url:
+        return create_async_engine(
+            url, 
+            echo=True,
+            connect_args={"ssl": "require"}
+        )
+    return create_async_engine(url, echo=True)
+
+engine = _create_engine(DATABASE_URL)
+if DATABASE_REPLICA_URL:
+    read_engine = _create_engine(DATABASE_REPLICA_URL)
+elif SQLITE_CONCURRENCY_MODE:
+    # WAL readers never block the writer and always see the last commit
+    read_engine = _create_engine(DATABASE_URL)
 else:
-    engine = create_async_engine(DATABASE_URL, echo=True)
+    read_engine = engine
+
+if SQLITE_CONCURRENCY_MODE:
+    configure_sqlite(engine)
+    if not DATABASE_REPLICA_URL:
+        configure_sqlite(read_engine, read_only=True)
+
+# SQLite allows one writer at a time; app coroutines queue here instead of
+# failing with "database is locked" or upgrading a stale read snapshot
+_sqlite_write_lock = asyncio.Lock()
+# Task of the SerializedWriteSession holding the lock, to catch re-entrant writes
+_write_lock_owner: asyncio.Task | None = None
+
+class WriteLockReentered(RuntimeError):
+    """A task that already holds the SQLite write lock waited for it again (a certain deadlock)."""
+
+    def __init__(self, what: str):
+        super().__init__(f"{what} while this task holds the SQLite write lock; write through the session that holds it")
+
+class SerializedWriteSession(AsyncSession):
+    """
+    AsyncSession that holds the process-wide SQLite write lock from its first write
+    (flush, DML statement or commit) until the transaction ends. Reads before the
+    first write run concurrently; pysqlite only opens the transaction at the first DML.
+    """
+
+    _holds_write_lock = False
+
+    async def _acquire_write_lock(self):
+        global _write_lock_owner
+        if not self._holds_write_lock:
+            if _write_lock_owner is not None and _write_lock_owner is asyncio.current_task():
+                raise WriteLockReentered("A second write session started writing")
+            await asyncio.wait_for(_sqlite_write_lock.acquire(), SQLITE_WRITE_TIMEOUT)
+            self._holds_write_lock = True
+            _write_lock_owner = asyncio.current_task()
+
+    def _release_write_lock(self):
+        global _write_lock_owner
+        if self._holds_write_lock:
+            self._holds_write_lock = False
+            _write_lock_owner = None
+            _sqlite_write_lock.release()
+
+    async def execute(self, statement, *args, **kwargs):
+        if getattr(statement, "is_dml", False):
+            await self._acquire_write_lock()
+        return await super().execute(statement, *args, **kwargs)
+
+    async def flush(self, objects=None):
+        await self._acquire_write_lock()
+        await super().flush(objects)
+
+    async def commit(self):
+        await self._acquire_write_lock()
+        try:
+            await super().commit()
+        finally:
+            self._release_write_lock()
+
+    async def rollback(self):
+        try:
+            await super().rollback()
+        finally:
+            self._release_write_lock()
+
+    async def close(self):
+        try:
+            await super().close()
+        finally:
+            self._release_write_lock()
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
+    class_=SerializedWriteSession if SQLITE_CONCURRENCY_MODE else AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+ReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
     class_=AsyncSession,
     expire_on_commit=False,
     autoflush=False,
@@ -26,6 +146,197 @@ AsyncSessionLocal = async_sessionmaker(
 class Base(DeclarativeBase):
     pass
 
+# Per-request query counting (see QueryCounter and the middleware in main.py)
+_active_query_counter: ContextVar["QueryCounter | None"] = ContextVar("active_query_counter", default=None)
+
+class QueryCounter:
+    """Counts statements executed in the current context: `with QueryCounter() as c: ...; c.count`"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __enter__(self):
+        self._token = _active_query_counter.set(self)
+        return self
+
+    def __exit__(self, *exc):
+        _active_query_counter.reset(self._token)
+
+def current_query_count() -> int | None:
+    counter = _active_query_counter.get()
+    return counter.count if counter else None
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _active_query_counter.get()
+    if counter is not None:
+        counter.count += 1
+
+event.listen(engine.sync_engine, "before_cursor_execute", _count_query)
+if read_engine is not engine:
+    event.listen(read_engine.sync_engine, "before_cursor_execute", _count_query)
+
+# Read-your-writes: clients that wrote recently are pinned to the primary.
+# Kept in process memory, so with several workers the window is per worker.
+_last_write_at: dict[str, float] = {}
+
+def sticky_key(request: Request) -> str:
+    """Identifies the client: its bearer token when present, otherwise its address."""
+    token = request.headers.get("authorization")
+    if token:
+        return "auth:" + hashlib.sha256(token.encode()).hexdigest()
+    return "host:" + (request.client.host if request.client else "unknown")
+
+def mark_write(key: str):
+    now = time.monotonic()
+    _last_write_at[key] = now
+    if len(_last_write_at) > 10000:
+        for stale in [k for k, t in _last_write_at.items() if now - t > READ_STICKY_SECONDS]:
+            del _last_write_at[stale]
+
+def wrote_recently(key: str) -> bool:
+    written = _last_write_at.get(key)
+    return written is not None and time.monotonic() - written < READ_STICKY_SECONDS
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+async def get_read_db(request: Request):
+    """
+    Session for read-only handlers. Uses the replica when one is configured,
+    unless this client wrote within READ_STICKY_SECONDS (it may not have replicated yet).
+    """
+    if read_engine is engine or (DATABASE_REPLICA_URL and wrote_recently(sticky_key(request))):
+        factory = AsyncSessionLocal
+    else:
+        factory = ReadSessionLocal
+    async with factory() as session:
+        yield session
+
+class WriteQueue:
+    """
+    Single writer task with group commit. Callers submit `async def op(session)`
+    callables; the writer takes whatever is queued (up to GROUP_COMMIT_MAX ops, waiting
+    at most GROUP_COMMIT_WINDOW seconds for more), runs each op in its own savepoint so
+    one failing op does not abort the rest, and commits the group once.
+    """
+
+    GROUP_COMMIT_MAX = int(os.getenv("GROUP_COMMIT_MAX", "64"))
+    GROUP_COMMIT_WINDOW = float(os.getenv("GROUP_COMMIT_WINDOW", "0.002"))
+
+    def __init__(self, session_factory, write_lock: asyncio.Lock | None = None, lock_timeout: float = SQLITE_WRITE_TIMEOUT):
+        self._session_factory = session_factory
+        self._lock_timeout = lock_timeout
+        self._write_lock = write_lock or asyncio.Lock()
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self.commits = 0
+        self.ops = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def in_writer(self) -> bool:
+        """True inside an op, which runs on the writer task."""
+        return self._task is not None and self._task is asyncio.current_task()
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, op):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((op, future))
+        return await future
+
+    async def _next_group(self) -> list:
+        group = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.GROUP_COMMIT_WINDOW
+        while len(group) < self.GROUP_COMMIT_MAX:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0 and self._queue.empty():
+                break
+            try:
+                group.append(await asyncio.wait_for(self._queue.get(), max(timeout, 0)))
+            except asyncio.TimeoutError:
+                break
+        return group
+
+    async def _run(self):
+        while True:
+            group = await self._next_group()
+            try:
+                results = await self._commit_group(group)
+            except Exception as e:
+                results = [(False, e)] * len(group)
+            self.commits += 1
+            self.ops += len(group)
+            for (_, future), (ok, value) in zip(group, results):
+                if future.done():
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+    async def _commit_group(self, group: list) -> list:
+        # Bounded like SerializedWriteSession: a stuck lock holder fails this group
+        # instead of stalling every queued write behind it
+        await asyncio.wait_for(self._write_lock.acquire(), self._lock_timeout)
+        try:
+            results = []
+            async with self._session_factory() as session:
+                if session.bind.dialect.name == "sqlite":
+                    # pysqlite emits no BEGIN before a SAVEPOINT, which then opens a
+                    # transaction of its own that its RELEASE commits: one commit per
+                    # op. An explicit BEGIN makes the savepoints nest in the group's
+                    # transaction (IMMEDIATE takes the file's write lock up front).
+                    await session.execute(text("BEGIN IMMEDIATE"))
+                for op, _ in group:
+                    try:
+                        async with session.begin_nested():
+                            results.append((True, await op(session)))
+                    except Exception as e:
+                        results.append((False, e))
+                await session.commit()
+            return results
+        finally:
+            self._write_lock.release()
+
+# Plain sessions for the writer task: it already holds the write lock
+write_queue = WriteQueue(
+    async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False),
+    _sqlite_write_lock,
+)
+
+async def run_write(op):
+    """
+    Runs `async def op(session)` and commits it: through the group-committing
+    writer task in SQLite mode, otherwise in a session of its own.
+
+    Meant for blind appends such as the voice pipeline's transcript turns. Handlers
+    that read before they write (the interview unit of work, uploads) keep their own
+    SerializedWriteSession, since their reads must stay in the writing transaction.
+    Raises WriteLockReentered from a task that already holds the write lock.
+    """
+    if write_queue.in_writer:
+        raise WriteLockReentered("run_write was called from a queued op")
+    if _write_lock_owner is not None and _write_lock_owner is asyncio.current_task():
+        raise WriteLockReentered("run_write was called")
+    if write_queue.running:
+        return await write_queue.submit(op)
+    async with AsyncSessionLocal() as session:
+        result = await op(session)
+        await session.commit()
+        return result
@@ -2,15 +2,28 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
-from .database import engine, Base
-from .routers import candidates, interview, auth, learning
+import os
+from .database import engine, QueryCounter, sticky_key, mark_write, write_queue, SQLITE_CONCURRENCY_MODE
+from .routers import candidates, interview, auth, learning, analytics
+from .migrations.runner import run_migrations
+from .utils import password_hashing_stats
+from .services.rate_limiter import login_throttle
+from .services.principal_cache import principal_cache
+from .services.tts_cache import tts_cache
+from .services.media_lifecycle import media_sweeper
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Create tables on startup
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Bring the schema up to date (see app/migrations); set AUTO_MIGRATE=0
+    # to run `python migrate_db.py` as a separate deploy step instead
+    if os.getenv("AUTO_MIGRATE", "1") == "1":
+        await run_migrations(engine)
+    if SQLITE_CONCURRENCY_MODE:
+        write_queue.start()
+    media_sweeper.start()
     yield
+    await media_sweeper.stop()
+    await write_queue.stop()
 
 app = FastAPI(title="Automated Technical Interviewer API", lifespan=lifespan)
 
@@ -30,8 +43,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-DB-Query-Count"],
 )
 
+@app.middleware("http")
+async def count_db_queries(request, call_next):
+    # Exposes per-request DB round trips so query regressions are visible in tests
+    with QueryCounter() as counter:
+        response = await call_next(request)
+    response.headers["X-DB-Query-Count"] = str(counter.count)
+    return response
+
+@app.middleware("http")
+async def pin_writers_to_primary(request, call_next):
+    # Starts the read-your-writes window used by get_read_db
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS"):
+        mark_write(sticky_key(request))
+    return response
+
 # Mount static files for uploads
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
@@ -40,6 +70,7 @@ app.include_router(auth.router)
 app.include_router(candidates.router)
 app.include_router(interview.router)
 app.include_router(learning.router)
+app.include_router(analytics.router)
 
 @app.get("/")
 async def root():
@@ -48,3 +79,13 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "password_hashing": password_hashing_stats(),
+        "login_throttle": login_throttle.stats(),
+        "principal_cache": principal_cache.stats(),
+        "tts_cache": tts_cache.stats(),
+        "media": media_sweeper.stats(),
+    }
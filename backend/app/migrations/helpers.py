@@ -0,0 +1,22 @@
+from sqlalchemy import inspect, text
+
+def has_column(conn, table: str, column: str) -> bool:
+    return any(c["name"] == column for c in inspect(conn).get_columns(table))
+
+def add_column(conn, table: str, column: str, ddl_type: str, default: str | None = None):
+    """ALTER TABLE ... ADD COLUMN unless the column already exists."""
+    if has_column(conn, table, column):
+        return
+    ddl = f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"
+    if default is not None:
+        ddl += f" DEFAULT {default}"
+    conn.execute(text(ddl))
+
+def create_index(conn, name: str, table: str, columns: list[str], unique: bool = False):
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    conn.execute(text(f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"))
+
+def create_tables(conn, *tables):
+    """Creates model tables (and their declared indexes) that do not exist yet."""
+    for table in tables:
+        table.create(conn, checkfirst=True)
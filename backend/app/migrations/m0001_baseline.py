@@ -0,0 +1,8 @@
+from ..database import Base
+from .. import models  # noqa: F401  (registers the tables on Base.metadata)
+
+VERSION = 1
+DESCRIPTION = "baseline schema"
+
+def upgrade(conn):
+    Base.metadata.create_all(conn, checkfirst=True)
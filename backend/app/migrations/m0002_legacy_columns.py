@@ -0,0 +1,15 @@
+from .helpers import add_column, create_index
+
+VERSION = 2
+DESCRIPTION = "columns added before versioned migrations (candidates, interview_sessions)"
+
+def upgrade(conn):
+    # Databases created by older create_all runs never received these
+    add_column(conn, "candidates", "status", "VARCHAR NOT NULL", default="'processing'")
+    add_column(conn, "candidates", "analytics", "JSON")
+    add_column(conn, "candidates", "resume_hash", "VARCHAR(64)")
+    add_column(conn, "candidates", "resume_text_complete", "BOOLEAN", default="TRUE")
+    create_index(conn, "ix_candidates_resume_hash", "candidates", ["resume_hash"])
+
+    add_column(conn, "interview_sessions", "decision", "VARCHAR")
+    add_column(conn, "interview_sessions", "breakdown", "JSON")
@@ -0,0 +1,7 @@
+from ..services.resume_search import install_search_index
+
+VERSION = 3
+DESCRIPTION = "full-text search index over resumes"
+
+def upgrade(conn):
+    install_search_index(conn)
@@ -0,0 +1,18 @@
+from .helpers import create_index
+
+VERSION = 4
+DESCRIPTION = "indexes for foreign keys used in hot filters"
+
+# The composite indexes also serve plain lookups on their leading column
+# (interview_sessions.candidate_id, candidates.user_id).
+INDEXES = [
+    ("ix_questions_candidate_id", "questions", ["candidate_id"]),
+    ("ix_questions_session_id", "questions", ["session_id"]),
+    ("ix_analytics_snapshots_interview_session_id", "analytics_snapshots", ["interview_session_id"]),
+    ("ix_interview_sessions_candidate_id_start_time", "interview_sessions", ["candidate_id", "start_time"]),
+    ("ix_candidates_user_id_created_at", "candidates", ["user_id", "created_at"]),
+]
+
+def upgrade(conn):
+    for name, table, columns in INDEXES:
+        create_index(conn, name, table, columns)
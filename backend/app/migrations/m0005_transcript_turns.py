@@ -0,0 +1,8 @@
+from ..models import TranscriptTurn
+from .helpers import create_tables
+
+VERSION = 5
+DESCRIPTION = "append-only transcript_turns table"
+
+def upgrade(conn):
+    create_tables(conn, TranscriptTurn.__table__)
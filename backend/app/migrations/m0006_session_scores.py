@@ -0,0 +1,8 @@
+from ..models import SessionScore
+from .helpers import create_tables
+
+VERSION = 6
+DESCRIPTION = "materialized per-session session_scores table"
+
+def upgrade(conn):
+    create_tables(conn, SessionScore.__table__)
@@ -0,0 +1,8 @@
+from ..models import AnalyticsRollup
+from .helpers import create_tables
+
+VERSION = 7
+DESCRIPTION = "pre-aggregated analytics_rollups table"
+
+def upgrade(conn):
+    create_tables(conn, AnalyticsRollup.__table__)
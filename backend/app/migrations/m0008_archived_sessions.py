@@ -0,0 +1,8 @@
+from ..models import ArchivedSession
+from .helpers import create_tables
+
+VERSION = 8
+DESCRIPTION = "archived_sessions index for cold-stored sessions"
+
+def upgrade(conn):
+    create_tables(conn, ArchivedSession.__table__)
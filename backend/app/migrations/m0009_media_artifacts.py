@@ -0,0 +1,8 @@
+from ..models import MediaArtifact
+from .helpers import create_tables
+
+VERSION = 9
+DESCRIPTION = "media_artifacts index of stored uploads and audio"
+
+def upgrade(conn):
+    create_tables(conn, MediaArtifact.__table__)
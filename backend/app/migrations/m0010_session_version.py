@@ -0,0 +1,7 @@
+from .helpers import add_column
+
+VERSION = 10
+DESCRIPTION = "interview_sessions.version for compare-and-swap state changes"
+
+def upgrade(conn):
+    add_column(conn, "interview_sessions", "version", "INTEGER NOT NULL", default="0")
@@ -0,0 +1,8 @@
+from ..models import SessionEvent, SessionSnapshot
+from .helpers import create_tables
+
+VERSION = 11
+DESCRIPTION = "session_events log and session_snapshots"
+
+def upgrade(conn):
+    create_tables(conn, SessionEvent.__table__, SessionSnapshot.__table__)
@@ -0,0 +1,34 @@
+from sqlalchemy import inspect, text
+from ..models import InterviewSession
+from .helpers import create_tables
+
+VERSION = 12
+DESCRIPTION = "interview_sessions ids are never reused after archiving (SQLite AUTOINCREMENT)"
+
+def upgrade(conn):
+    # Postgres ids come from a sequence and are never reused
+    if conn.dialect.name != "sqlite":
+        return
+    ddl = conn.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'interview_sessions'")).scalar()
+    if "AUTOINCREMENT" not in ddl.upper():
+        # SQLite cannot add AUTOINCREMENT in place: rebuild the table under the model's DDL.
+        # legacy_alter_table keeps other tables' foreign keys pointing at "interview_sessions".
+        old_columns = {c["name"] for c in inspect(conn).get_columns("interview_sessions")}
+        columns = ", ".join(c.name for c in InterviewSession.__table__.columns if c.name in old_columns)
+        conn.execute(text("PRAGMA legacy_alter_table=ON"))
+        conn.execute(text("ALTER TABLE interview_sessions RENAME TO interview_sessions_old"))
+        for index in inspect(conn).get_indexes("interview_sessions_old"):
+            conn.execute(text(f"DROP INDEX IF EXISTS {index['name']}"))
+        create_tables(conn, InterviewSession.__table__)
+        conn.execute(text(f"INSERT INTO interview_sessions ({columns}) SELECT {columns} FROM interview_sessions_old"))
+        conn.execute(text("DROP TABLE interview_sessions_old"))
+        conn.execute(text("PRAGMA legacy_alter_table=OFF"))
+
+    # Skip ids of sessions that were archived after the highest live one
+    archived_max = conn.execute(text("SELECT MAX(session_id) FROM archived_sessions")).scalar()
+    if archived_max:
+        seq = conn.execute(text("SELECT seq FROM sqlite_sequence WHERE name = 'interview_sessions'")).scalar()
+        if seq is None:
+            conn.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES ('interview_sessions', :seq)"), {"seq": archived_max})
+        elif seq < archived_max:
+            conn.execute(text("UPDATE sqlite_sequence SET seq = :seq WHERE name = 'interview_sessions'"), {"seq": archived_max})
@@ -0,0 +1,16 @@
+from sqlalchemy import text
+from ..models import MediaRef
+from .helpers import create_tables
+
+VERSION = 13
+DESCRIPTION = "media_refs: per-owner references to stored files, for quotas and cleanup"
+
+def upgrade(conn):
+    create_tables(conn, MediaRef.__table__)
+    # Every indexed file so far had exactly one owner
+    conn.execute(text("""
+        INSERT INTO media_refs (artifact_id, owner_id, size, created_at, expires_at)
+        SELECT a.id, a.owner_id, a.size, a.created_at, a.expires_at
+        FROM media_artifacts a
+        WHERE NOT EXISTS (SELECT 1 FROM media_refs r WHERE r.artifact_id = a.id)
+    """))
@@ -0,0 +1,96 @@
+"""
+Versioned schema migrations for Postgres and SQLite.
+
+Each migration is a module with VERSION, DESCRIPTION and `upgrade(conn)` taking a
+sync Connection. Applied versions are recorded in `schema_migrations`; pending ones
+run in order, each in its own transaction. On a fresh database the baseline builds
+the current models, so every later migration must be idempotent (IF NOT EXISTS /
+column checks).
+"""
+from datetime import datetime
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from . import (
+    m0001_baseline,
+    m0002_legacy_columns,
+    m0003_resume_search,
+    m0004_hot_path_indexes,
+    m0005_transcript_turns,
+    m0006_session_scores,
+    m0007_analytics_rollups,
+    m0008_archived_sessions,
+    m0009_media_artifacts,
+    m0010_session_version,
+    m0011_session_events,
+    m0012_session_ids_autoincrement,
+    m0013_media_refs,
+)
+
+MIGRATIONS = [
+    m0001_baseline,
+    m0002_legacy_columns,
+    m0003_resume_search,
+    m0004_hot_path_indexes,
+    m0005_transcript_turns,
+    m0006_session_scores,
+    m0007_analytics_rollups,
+    m0008_archived_sessions,
+    m0009_media_artifacts,
+    m0010_session_version,
+    m0011_session_events,
+    m0012_session_ids_autoincrement,
+    m0013_media_refs,
+]
+
+# Serializes concurrent app workers migrating the same Postgres database
+ADVISORY_LOCK_KEY = 727_001
+
+def _ensure_version_table(conn):
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version INTEGER PRIMARY KEY, "
+        "description VARCHAR NOT NULL, "
+        "applied_at TIMESTAMP NOT NULL)"
+    ))
+
+def applied_versions(conn) -> set[int]:
+    _ensure_version_table(conn)
+    return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+def upgrade(conn) -> list[int]:
+    """Applies all pending migrations. Returns the versions applied."""
+    is_postgres = conn.dialect.name == "postgresql"
+    if is_postgres:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        conn.commit()
+
+    applied = []
+    try:
+        done = applied_versions(conn)
+        conn.commit()
+
+        for migration in sorted(MIGRATIONS, key=lambda m: m.VERSION):
+            if migration.VERSION in done:
+                continue
+            print(f"Applying migration {migration.VERSION:04d}: {migration.DESCRIPTION}")
+            try:
+                migration.upgrade(conn)
+                conn.execute(
+                    text("INSERT INTO schema_migrations (version, description, applied_at) VALUES (:v, :d, :t)"),
+                    {"v": migration.VERSION, "d": migration.DESCRIPTION, "t": datetime.utcnow()},
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            applied.append(migration.VERSION)
+    finally:
+        if is_postgres:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+            conn.commit()
+
+    return applied
+
+async def run_migrations(engine: AsyncEngine) -> list[int]:
+    async with engine.connect() as conn:
+        return await conn.run_sync(upgrade)
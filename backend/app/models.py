@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -19,12 +19,17 @@ class User(Base):
 
 class Candidate(Base):
     __tablename__ = "candidates"
+    __table_args__ = (
+        Index("ix_candidates_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     email = Column(String, index=True, nullable=False)
     resume_url = Column(String, nullable=False)
     resume_text = Column(String, nullable=True)
+    resume_text_complete = Column(Boolean, default=True) # False while resume_text only holds the parse budget
+    resume_hash = Column(String(64), index=True, nullable=True) # sha256 of the uploaded file
     status = Column(String, default="processing", nullable=False) # processing, ready, failed
     analytics = Column(JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -42,11 +47,16 @@ class Question(Base):
     correct_answer = Column(Integer)
     difficulty = Column(String)
     tags = Column(JSON)
-    candidate_id = Column(Integer, ForeignKey("candidates.id")) # Keep for history/ref?
-    session_id = Column(Integer, ForeignKey("interview_sessions.id"), nullable=True) # Link to specific session
+    candidate_id = Column(Integer, ForeignKey("candidates.id"), index=True) # Keep for history/ref?
+    session_id = Column(Integer, ForeignKey("interview_sessions.id"), nullable=True, index=True) # Link to specific session
 
 class InterviewSession(Base):
     __tablename__ = "interview_sessions"
+    __table_args__ = (
+        Index("ix_interview_sessions_candidate_id_start_time", "candidate_id", "start_time"),
+        # Archived session ids must never be handed out again (SQLite reuses the highest rowid)
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     candidate_id = Column(Integer, ForeignKey("candidates.id"))
@@ -57,6 +67,7 @@ class InterviewSession(Base):
     #               prep_tech_1 -> tech_1 -> prep_tech_2 -> tech_2 -> completed
     current_round = Column(String, default="resume_analysis") 
     round_data = Column(JSON, default={}) 
+    version = Column(Integer, nullable=False, default=0, server_default="0") # Bumped by every state change (compare-and-swap)
     
     start_time = Column(DateTime, default=datetime.utcnow)
     end_time = Column(DateTime, nullable=True)
@@ -70,18 +81,142 @@ class InterviewSession(Base):
     decision = Column(String, nullable=True) # "Hire", "No Hire", "Strong Hire"
     breakdown = Column(JSON, nullable=True) # Detailed scoring breakdown
 
+class TranscriptTurn(Base):
+    """Append-only conversation log of the voice/chat rounds (replaces round_data[...]["transcript"])."""
+    __tablename__ = "transcript_turns"
+    __table_args__ = (
+        Index("ux_transcript_turns_session_round_seq", "session_id", "round", "seq", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    session_id = Column(Integer, ForeignKey("interview_sessions.id"), nullable=False)
+    round = Column(String, nullable=False)
+    seq = Column(Integer, nullable=False) # 1-based position within the session's round
+    role = Column(String, nullable=False) # "user_audio", "user", "ai"
+    content = Column(String, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class SessionEvent(Base):
+    """Append-only log of interview actions; session state can be rebuilt from it (see services/session_events.py)."""
+    __tablename__ = "session_events"
+    __table_args__ = (
+        Index("ix_session_events_session_id_id", "session_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True) # Global order of events
+    session_id = Column(Integer, ForeignKey("interview_sessions.id"), nullable=False)
+    type = Column(String, nullable=False) # "session_started", "round_submitted", "round_advanced", "voice_turn", "session_completed"
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class SessionSnapshot(Base):
+    """Session state folded from its events up to and including last_event_id."""
+    __tablename__ = "session_snapshots"
+    __table_args__ = (
+        Index("ix_session_snapshots_session_id_last_event_id", "session_id", "last_event_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    session_id = Column(Integer, ForeignKey("interview_sessions.id"), nullable=False)
+    last_event_id = Column(Integer, nullable=False)
+    state = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class SessionScore(Base):
+    """Per-session score record kept current as rounds are submitted (served by GET /results)."""
+    __tablename__ = "session_scores"
+
+    session_id = Column(Integer, ForeignKey("interview_sessions.id"), primary_key=True)
+    candidate_id = Column(Integer, ForeignKey("candidates.id"), nullable=False)
+    mcq_score = Column(Integer, default=0)
+    mcq_total = Column(Integer, default=0)
+    coding_passed = Column(Boolean, default=False)
+    overall_status = Column(String, default="Reject")
+    results = Column(JSON, nullable=False) # Same shape as calculate_final_results()
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class AnalyticsRollup(Base):
+    """Pre-aggregated counters per recruiter/day, incremented when a session completes."""
+    __tablename__ = "analytics_rollups"
+    __table_args__ = (
+        Index("ux_analytics_rollups_key", "user_id", "day", "dimension", "key", "metric", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False, default=0) # Recruiter owning the candidate (0 = unowned)
+    day = Column(String(10), nullable=False) # UTC date, YYYY-MM-DD
+    dimension = Column(String, nullable=False) # "all", "problem", "tag"
+    key = Column(String, nullable=False, default="")
+    metric = Column(String, nullable=False) # e.g. "sessions", "decision:Strong Hire", "score_bucket:7"
+    value = Column(Integer, nullable=False, default=0)
+
 class AnalyticsSnapshot(Base):
     __tablename__ = "analytics_snapshots"
 
     id = Column(Integer, primary_key=True, index=True)
     resume_id = Column(Integer, ForeignKey("candidates.id"), nullable=False)
-    interview_session_id = Column(Integer, ForeignKey("interview_sessions.id"), nullable=False)
+    interview_session_id = Column(Integer, ForeignKey("interview_sessions.id"), nullable=False, index=True)
     data = Column(JSON, nullable=False) # The frozen analytics data
     created_at = Column(DateTime, default=datetime.utcnow)
 
     resume = relationship("Candidate")
     session = relationship("InterviewSession")
 
+class ArchivedSession(Base):
+    """Index of sessions moved to cold storage (see services/session_archive.py)."""
+    __tablename__ = "archived_sessions"
+    __table_args__ = (
+        Index("ix_archived_sessions_candidate_id_start_time", "candidate_id", "start_time"),
+    )
+
+    session_id = Column(Integer, primary_key=True) # No FK: the session row is deleted on archival
+    candidate_id = Column(Integer, nullable=False)
+    decision = Column(String, nullable=True)
+    score = Column(Integer, nullable=True)
+    start_time = Column(DateTime, nullable=True)
+    end_time = Column(DateTime, nullable=True)
+    segment = Column(String, nullable=False) # File name under ARCHIVE_DIR
+    offset = Column(Integer, nullable=False) # Byte offset of the record's gzip member
+    length = Column(Integer, nullable=False)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+class MediaArtifact(Base):
+    """Index of stored media files for quotas and cleanup (see services/media_lifecycle.py)."""
+    __tablename__ = "media_artifacts"
+    __table_args__ = (
+        Index("ix_media_artifacts_owner_id_size", "owner_id", "size"), # Covers the quota sum
+        Index("ix_media_artifacts_expires_at", "expires_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    path = Column(String, unique=True, nullable=False) # Relative to the app root, e.g. uploads/audio/...
+    kind = Column(String, nullable=False) # "resume", "user_audio", "reply_audio"
+    owner_id = Column(Integer, nullable=False, default=0) # First owner; each owner is charged through media_refs
+    session_id = Column(Integer, nullable=True, index=True) # No FK: sessions are archived
+    size = Column(Integer, nullable=False, default=0)
+    remote_id = Column(String, nullable=True) # Provider copy still to be deleted (e.g. a Gemini file name)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=True) # Of the first reference; the sweep goes by media_refs
+
+class MediaRef(Base):
+    """
+    One owner's reference to a stored file. Each owner is charged the file's size
+    against its quota; the file is deleted once its last reference is gone.
+    """
+    __tablename__ = "media_refs"
+    __table_args__ = (
+        Index("ux_media_refs_artifact_owner", "artifact_id", "owner_id", unique=True),
+        Index("ix_media_refs_owner_id_size", "owner_id", "size"), # Covers the quota sum
+        Index("ix_media_refs_expires_at", "expires_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    artifact_id = Column(Integer, ForeignKey("media_artifacts.id", ondelete="CASCADE"), nullable=False)
+    owner_id = Column(Integer, nullable=False, default=0) # Recruiter (tenant), 0 = unowned
+    size = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=True) # None = kept until the owner's use of it ends
+
 class CodingProblem(Base):
     __tablename__ = "coding_problems"
 
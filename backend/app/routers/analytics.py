@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_read_db
+from ..models import User
+from ..routers.auth import get_current_user
+from ..services.analytics_rollups import dashboard, MAX_DASHBOARD_DAYS
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+@router.get("/dashboard")
+async def get_dashboard(
+    days: int = Query(7, ge=1, le=MAX_DASHBOARD_DAYS),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Pass rates, score histogram, per-problem and per-tag MCQ stats for the recruiter's sessions."""
+    return await dashboard(db, current_user.id, days)
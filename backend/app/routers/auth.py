@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -6,7 +6,13 @@ from pydantic import BaseModel, EmailStr
 from jose import JWTError, jwt
 from ..database import get_db
 from ..models import User, Candidate, Subscription
-from ..utils import verify_password, get_password_hash, create_access_token, SECRET_KEY, ALGORITHM
+from ..utils import (
+    hash_password_async, verify_and_update_password, PasswordHashingBusy,
+    create_access_token, SECRET_KEY, ALGORITHM,
+)
+from ..services.rate_limiter import login_throttle
+from ..services.principal_cache import principal_cache
+import uuid
 from datetime import datetime, timedelta
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -56,13 +62,27 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
+        user_id: int | None = payload.get("uid")
     except JWTError:
         raise credentials_exception
-        
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalars().first()
-    if user is None:
+
+    # Tokens issued before `uid` was added are cached by email
+    cache_key = user_id if user_id is not None else f"email:{email}"
+    user = principal_cache.get(cache_key)
+    if user is not None and user.email == email:
+        return user
+
+    if user_id is not None:
+        user = await db.get(User, user_id)
+    else:
+        result = await db.execute(select(User).where(User.email == email))
+        user = result.scalars().first()
+    if user is None or user.email != email:
         raise credentials_exception
+
+    # Detached, so no request's rollback can expire the shared instance
+    db.expunge(user)
+    principal_cache.set(cache_key, user)
     return user
 
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -73,8 +93,8 @@ async def signup(user: UserCreate, db: AsyncSession = Depends(get_db)):
         if result.scalars().first():
             raise HTTPException(status_code=400, detail="Email already registered")
 
-        # Hash password
-        hashed_password = get_password_hash(user.password)
+        # Hash password (off the event loop, bounded concurrency)
+        hashed_password = await hash_password_async(user.password)
 
         # Create User
         new_user = User(email=user.email, hashed_password=hashed_password, full_name=user.full_name)
@@ -94,26 +114,55 @@ async def signup(user: UserCreate, db: AsyncSession = Depends(get_db)):
         await db.refresh(new_user)
         
         return new_user
+    except HTTPException:
+        raise
+    except PasswordHashingBusy:
+        raise HTTPException(status_code=503, detail="Server busy, please retry", headers={"Retry-After": "1"})
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Signup Failed: {str(e)}")
 
 @router.post("/login", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+    # Throttle before doing any bcrypt work
+    client_ip = request.client.host if request.client else "unknown"
+    retry_after = login_throttle.check(client_ip, form_data.username)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, please try again later",
+            headers={"Retry-After": str(int(retry_after) + 1)},
+        )
+
     # Find user
     result = await db.execute(select(User).where(User.email == form_data.username))
     user = result.scalars().first()
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await verify_and_update_password(form_data.password, user.hashed_password)
+        except PasswordHashingBusy:
+            raise HTTPException(status_code=503, detail="Server busy, please retry", headers={"Retry-After": "1"})
+
+    if not valid:
+        login_throttle.failed(form_data.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    login_throttle.succeeded(form_data.username)
+
+    # Transparent rehash when BCRYPT_ROUNDS was raised since the hash was stored
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+        principal_cache.invalidate(user_id=user.id)
     
-    # Generate Token
-    access_token = create_access_token(data={"sub": user.email})
+    # Generate Token (uid makes the get_current_user cache miss a primary key lookup)
+    access_token = create_access_token(data={"sub": user.email, "uid": user.id, "jti": uuid.uuid4().hex})
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserResponse)
@@ -6,35 +6,87 @@ from fastapi import UploadFile
 from fastapi import File
 from fastapi import Form
 from fastapi import BackgroundTasks
+from fastapi import Query
+from fastapi import Response
+from fastapi.concurrency import run_in_threadpool
 # Verify status import
 # print(f"DEBUG: status type: {type(status)}")
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
-import shutil
-import os
-from ..services.resume_parser import parse_resume, generate_analytics
+from ..services.resume_parser import parse_resume_bounded, generate_analytics, ensure_full_resume_text
+from ..services.resume_search import search_candidates
+from ..services.pagination import fetch_page, parse_fields, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ..services.upload_storage import save_upload, UploadTooLarge, MAX_RESUME_BYTES
+from ..services.media_lifecycle import admit_upload, MediaQuotaExceeded
+from ..services.session_events import record_events, session_started_row
 from ..models import Candidate, InterviewSession, Question, User
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..routers.auth import get_current_user
 from ..services.question_generator import generate_mcqs
+from ..services.question_bank import live_candidate_questions
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/candidates", tags=["candidates"])
 
+# List views only need these; large columns are opt-in through `fields`
+CANDIDATE_SUMMARY_COLUMNS = (
+    Candidate.id, Candidate.name, Candidate.email, Candidate.resume_url,
+    Candidate.status, Candidate.created_at,
+)
+CANDIDATE_OPTIONAL_FIELDS = {
+    "analytics": Candidate.analytics,
+    "resume_text": Candidate.resume_text,
+}
+
 @router.get("/", status_code=status.HTTP_200_OK)
 async def get_candidates(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = Query(None, description="Comma separated extra columns: analytics, resume_text"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    columns = CANDIDATE_SUMMARY_COLUMNS + tuple(parse_fields(fields, CANDIDATE_OPTIONAL_FIELDS))
+    return await fetch_page(
+        db,
+        select(*columns).where(Candidate.user_id == current_user.id),
+        Candidate.created_at, Candidate.id,
+        limit, cursor, response,
+    )
+
+@router.get("/search", status_code=status.HTTP_200_OK)
+async def search_resumes(
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db),
+    write_db: AsyncSession = Depends(get_db),
 ):
+    if await complete_resume_texts(write_db, current_user.id):
+        # The index rows were just rewritten on the primary; a replica may not have them yet
+        db = write_db
+    results = await search_candidates(db, current_user.id, q, limit=limit, offset=offset)
+    return {"query": q, "limit": limit, "offset": offset, "results": results}
+
+async def complete_resume_texts(db: AsyncSession, user_id: int) -> bool:
+    """
+    Replaces the budget-limited resume_text of user_id's resumes with the full
+    extraction, so the search index covers whole documents. Returns whether any
+    rows changed (and were committed).
+    """
     result = await db.execute(
-        select(Candidate)
-        .where(Candidate.user_id == current_user.id)
-        .order_by(Candidate.created_at.desc())
+        select(Candidate).where(Candidate.user_id == user_id, Candidate.resume_text_complete.is_(False))
     )
-    candidates = result.scalars().all()
-    return candidates
+    pending = result.scalars().all()
+    for candidate in pending:
+        await run_in_threadpool(ensure_full_resume_text, candidate)
+    if pending:
+        await db.commit()
+    return bool(pending)
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
 async def register_candidate(
@@ -48,39 +100,69 @@ async def register_candidate(
         if resume.content_type != "application/pdf":
             raise HTTPException(status_code=400, detail="Only PDF files are allowed")
 
-        # 2. Save File
-        upload_dir = "uploads/resumes"
-        os.makedirs(upload_dir, exist_ok=True)
-        file_location = os.path.join(upload_dir, resume.filename)
-        
+        # 2. Save File (content-addressed, hashed while streaming to disk)
         try:
-            with open(file_location, "wb") as buffer:
-                shutil.copyfileobj(resume.file, buffer)
+            stored = await save_upload(resume, "uploads/resumes", MAX_RESUME_BYTES, suffix=".pdf")
+        except UploadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to save file: {e}")
+        try:
+            await admit_upload(db, stored, "resume", current_user.id)
+        except MediaQuotaExceeded as e:
+            raise HTTPException(status_code=507, detail=str(e))
+        file_location = stored.path
+        resume_hash = stored.sha256
+
+        # 3. Reuse a previous analysis of the exact same file
+        result = await db.execute(
+            select(Candidate)
+            .where(Candidate.resume_hash == resume_hash, Candidate.status == "ready")
+            .order_by(Candidate.id.desc())
+            .limit(1)
+        )
+        previous = result.scalars().first()
             
-        # 3. Create New Resume Version (Always)
+        # 4. Create New Resume Version (Always)
         new_candidate = Candidate(
             name=name,
             email=current_user.email,
             resume_url=file_location,
             resume_text="", 
+            resume_hash=resume_hash,
             user_id=current_user.id,
             status="processing"
         )
         db.add(new_candidate)
+
+        if previous:
+            new_candidate.resume_text = previous.resume_text
+            new_candidate.resume_text_complete = previous.resume_text_complete
+            new_candidate.analytics = previous.analytics
+            new_candidate.status = "ready"
+            await db.commit()
+            await db.refresh(new_candidate)
+
+            return {
+                 "id": new_candidate.id,
+                 "status": new_candidate.status,
+                 "message": "Resume already analysed, reused previous results",
+                 "resume_url": new_candidate.resume_url,
+                 "analytics": new_candidate.analytics
+            }
         
         await db.commit()
         await db.refresh(new_candidate)
 
-        # 4. Parsing & Analysis (Safe Wrap)
+        # 5. Parsing & Analysis (Safe Wrap)
         try:
-            # Parse
-            resume_text = parse_resume(file_location)
+            # Parse (only as much text as the analysis uses)
+            resume_text, complete = await run_in_threadpool(parse_resume_bounded, file_location)
             new_candidate.resume_text = resume_text
+            new_candidate.resume_text_complete = complete
             
             # Analytics
-            analytics_data = generate_analytics(resume_text)
+            analytics_data = await run_in_threadpool(generate_analytics, resume_text)
             new_candidate.analytics = analytics_data
             new_candidate.status = "ready"
             
@@ -108,9 +190,36 @@ async def register_candidate(
         await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/{candidate_id}")
+async def get_candidate(
+    candidate_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    result = await db.execute(
+        select(Candidate).where(Candidate.id == candidate_id, Candidate.user_id == current_user.id)
+    )
+    candidate = result.scalars().first()
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    if candidate.resume_text_complete is False:
+        # Uploads only parse the analysis budget; the detail view shows the whole resume
+        await run_in_threadpool(ensure_full_resume_text, candidate)
+        await db.commit()
+    return {
+        "id": candidate.id,
+        "name": candidate.name,
+        "email": candidate.email,
+        "resume_url": candidate.resume_url,
+        "resume_text": candidate.resume_text,
+        "status": candidate.status,
+        "analytics": candidate.analytics,
+        "created_at": candidate.created_at,
+    }
+
 @router.get("/{candidate_id}/questions")
-async def get_candidate_questions(candidate_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Question).where(Question.candidate_id == candidate_id))
+async def get_candidate_questions(candidate_id: int, db: AsyncSession = Depends(get_read_db)):
+    result = await db.execute(live_candidate_questions(candidate_id))
     questions = result.scalars().all()
     if not questions:
         raise HTTPException(status_code=404, detail="No questions found for this candidate")
@@ -122,7 +231,7 @@ class QuizSubmission(BaseModel):
 @router.post("/{candidate_id}/quiz_submit")
 async def submit_quiz(candidate_id: int, submission: QuizSubmission, db: AsyncSession = Depends(get_db)):
     # Fetch questions
-    result = await db.execute(select(Question).where(Question.candidate_id == candidate_id))
+    result = await db.execute(live_candidate_questions(candidate_id))
     questions = result.scalars().all()
     
     if not questions:
@@ -148,6 +257,8 @@ async def submit_quiz(candidate_id: int, submission: QuizSubmission, db: AsyncSe
         current_round="resume_analysis" # Start with Resume Analysis
     )
     db.add(new_session)
+    await db.flush()
+    await record_events(db, [session_started_row(new_session.id, new_session.current_round, score=score)])
     await db.commit()
     await db.refresh(new_session)
     
@@ -1,18 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Response, WebSocket
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.sql.expression import func
+from sqlalchemy.sql.expression import func, literal, null, union_all
 from pydantic import BaseModel
-from ..database import get_db
-from ..models import InterviewSession, Question, CodingProblem, Candidate
+from ..database import get_db, get_read_db, AsyncSessionLocal
+from ..models import InterviewSession, Question, CodingProblem, Candidate, ArchivedSession
 from ..services.llm_service import generate_text
 from ..services.code_executor import execute_code, execute_with_test_cases
-from ..services.interview_flow import get_round_state, advance_round_state, submit_round
+from ..services.interview_flow import get_round_state, advance_round_state, submit_round, compare_and_set, TransitionConflict
+from ..services.unit_of_work import InterviewUnitOfWork, get_uow, get_read_uow
+from ..services.transcript_store import append_turns, recent_turns
+from ..services.question_bank import create_sessions_with_questions, live_candidate_questions
+from ..services.session_scores import ensure_session_score
+from ..services.analytics_rollups import record_completed_session
+from ..services.session_archive import load_archived_session, archived_results
+from ..services.pagination import fetch_page, parse_fields, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ..services.upload_storage import save_upload, UploadTooLarge, MAX_AUDIO_BYTES
+from ..services.media_lifecycle import MediaQuotaExceeded
+from ..services.session_events import record_state_change
+from ..services.voice_socket import VoiceSocketSession
+from ..services.voice_pipeline import voice_turn_events, run_voice_turn, load_voice_context, reply_audio_query, read_reply_audio, AUDIO_DIR
 from datetime import datetime
-from gtts import gTTS
+import asyncio
+import base64
+import json
 import os
-import uuid
-import shutil
+import re
 import google.generativeai as genai
 from dotenv import load_dotenv
 
@@ -42,55 +57,30 @@ async def create_session(request: CreateSessionRequest, db: AsyncSession = Depen
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
 
-    # Create NEW Session (Stateless, always new)
-    new_session = InterviewSession(
-        candidate_id=resume.id,
-        status="active",
-        current_round="prep_oa",
-        start_time=datetime.utcnow()
-    )
-    db.add(new_session)
-    await db.commit()
-    await db.refresh(new_session)
-
     # Generate Unique Questions
-    # 1. Fetch existing questions for this candidate
-    existing_q_result = await db.execute(select(Question).where(Question.candidate_id == resume.id))
-    existing_q_objs = existing_q_result.scalars().all()
-    existing_questions_text = [q.text for q in existing_q_objs]
+    # 1. Fetch existing question texts for this candidate
+    existing_q_result = await db.execute(live_candidate_questions(resume.id, Question.text))
+    existing_questions_text = list(existing_q_result.scalars().all())
 
     # 2. Generate New Questions
     from ..services.question_generator import generate_mcqs
-    new_questions_data = generate_mcqs(resume.resume_text, existing_questions_text)
-    
-    # 3. Save Questions
-    for q_data in new_questions_data:
-        q = Question(
-            candidate_id=resume.id,
-            session_id=new_session.id,
-            text=q_data["text"],
-            options=q_data["options"],
-            correct_answer=q_data["correct_answer"],
-            difficulty=q_data.get("difficulty", "medium"),
-            tags=q_data.get("tags", [])
-        )
-        db.add(q)
+    new_questions_data = await run_in_threadpool(generate_mcqs, resume.resume_text, existing_questions_text)
     
+    # 3. Create NEW Session (Stateless, always new) and its questions in one transaction
+    session_ids = await create_sessions_with_questions(db, [(resume.id, new_questions_data)])
     await db.commit()
     
-    return {"session_id": new_session.id, "status": "initialized"}
+    return {"session_id": session_ids[0], "status": "initialized"}
 
 @router.post("/{session_id}/complete")
-async def complete_session(session_id: int, db: AsyncSession = Depends(get_db)):
+async def complete_session(session_id: int, uow: InterviewUnitOfWork = Depends(get_uow)):
     # Fetch session
-    result = await db.execute(select(InterviewSession).where(InterviewSession.id == session_id))
-    session = result.scalars().first()
+    session = await uow.get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
         
-    # Calculate Final Results Logic
-    from ..services.results_aggregator import calculate_final_results
-    final_results = await calculate_final_results(session_id, db)
+    # Final results are kept current by submit_round
+    final_results = (await ensure_session_score(uow, session)).results
     
     # Freeze Decision & Score
     decision = final_results.get("overall_status", "Pending")
@@ -103,8 +93,9 @@ async def complete_session(session_id: int, db: AsyncSession = Depends(get_db)):
                    scores.get("tech_2", 0)) / 4 # Rough average/sum
                    
     # Snapshot
-    resume_result = await db.execute(select(Candidate).where(Candidate.id == session.candidate_id))
-    resume = resume_result.scalars().first()
+    resume = await uow.get_candidate(session.candidate_id)
+    # Rollups count each session once; decision is only set here
+    first_completion = session.decision is None
     
     snapshot_data = {
         "resume_analytics": resume.analytics if resume else {},
@@ -117,29 +108,41 @@ async def complete_session(session_id: int, db: AsyncSession = Depends(get_db)):
         interview_session_id=session.id,
         data=snapshot_data
     )
-    db.add(snapshot)
+    uow.add(snapshot)
     
-    # Update Session with Frozen Data
-    session.status = "completed"
-    session.end_time = datetime.utcnow()
-    session.decision = decision
-    session.score = int(final_score)
-    session.breakdown = final_results # Freeze the detailed JSON
+    # Update Session with Frozen Data; a concurrent completion of the same state loses
+    try:
+        await compare_and_set(
+            uow, session,
+            status="completed",
+            end_time=datetime.utcnow(),
+            decision=decision,
+            score=int(final_score),
+            breakdown=final_results, # Freeze the detailed JSON
+        )
+    except TransitionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    await record_state_change(uow.db, session, "session_completed", {
+        "status": session.status, "end_time": session.end_time, "decision": decision,
+        "score": session.score, "version": session.version,
+    }, force_snapshot=True)
+
+    if first_completion:
+        await record_completed_session(uow.db, resume.user_id if resume else None, session, final_results)
     
-    await db.commit()
+    await uow.commit()
     
     return {"message": "Interview completed", "decision": decision}
 
 @router.get("/{session_id}/state")
-async def get_interview_state(session_id: int, db: AsyncSession = Depends(get_db)):
+async def get_interview_state(session_id: int, uow: InterviewUnitOfWork = Depends(get_read_uow)):
     try:
         # Check if completed
-        result = await db.execute(select(InterviewSession).where(InterviewSession.id == session_id))
-        session = result.scalars().first()
+        session = await uow.get_session(session_id)
         if session and session.status == "completed":
              return {"status": "completed", "current_round": "completed"}
 
-        state = await get_round_state(session_id, db)
+        state = await get_round_state(session_id, uow)
         if "error" in state:
             raise HTTPException(status_code=404, detail=state["error"])
         return state
@@ -157,21 +160,36 @@ async def get_interview_state(session_id: int, db: AsyncSession = Depends(get_db
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
 @router.post("/{session_id}/advance")
-async def advance_interview_round(session_id: int, db: AsyncSession = Depends(get_db)):
-    state = await advance_round_state(session_id, db)
+async def advance_interview_round(session_id: int, uow: InterviewUnitOfWork = Depends(get_uow)):
+    try:
+        state = await advance_round_state(session_id, uow)
+    except TransitionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if "error" in state:
         raise HTTPException(status_code=404, detail=state["error"])
     return state
 
 @router.post("/{session_id}/submit_round")
-async def submit_current_round(session_id: int, submission: RoundSubmission, db: AsyncSession = Depends(get_db)):
-    result = await submit_round(session_id, submission.data, db)
+async def submit_current_round(
+    session_id: int,
+    submission: RoundSubmission,
+    problem_id: int | None = Query(None, description="Coding round: the problem that was solved"),
+    uow: InterviewUnitOfWork = Depends(get_uow),
+):
+    data = submission.data
+    if problem_id is not None:
+        # Kept in the round data, where the per-problem rollups read it
+        data = {**data, "problem_id": problem_id}
+    try:
+        result = await submit_round(session_id, data, uow)
+    except TransitionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if "error" in result:
         raise HTTPException(status_code=404, detail=result["error"])
     return result
 
 @router.get("/{session_id}/questions")
-async def get_session_questions(session_id: int, db: AsyncSession = Depends(get_db)):
+async def get_session_questions(session_id: int, db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(select(Question).where(Question.session_id == session_id))
     questions = result.scalars().all()
     if not questions:
@@ -185,122 +203,143 @@ async def get_session(session_id: int, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(InterviewSession).where(InterviewSession.id == session_id))
     session = result.scalars().first()
     if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
+        record = await load_archived_session(db, session_id)
+        if record is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return {**record["session"], "archived": True}
     return session
 
 @router.get("/{session_id}/results")
-async def get_results(session_id: int, db: AsyncSession = Depends(get_db)):
-    # 1. Try to get frozen results first
-    result = await db.execute(select(InterviewSession).where(InterviewSession.id == session_id))
-    session = result.scalars().first()
+async def get_results(session_id: int, uow: InterviewUnitOfWork = Depends(get_read_uow)):
+    # 1. Materialized score record: a single-row lookup
+    score = await uow.get_session_score(session_id)
+    if score:
+        return score.results
+
+    session = await uow.get_session(session_id)
     if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
+        record = await load_archived_session(uow.db, session_id)
+        if record is None or archived_results(record) is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return archived_results(record)
         
     if session.status == "completed" and session.breakdown:
         return session.breakdown # Return immutable frozen data
         
-    # 2. Else calculate on fly
+    # 2. Sessions with no score record yet (nothing submitted, or pre-dating it)
     from ..services.results_aggregator import calculate_final_results
-    results = await calculate_final_results(session_id, db)
+    results = await calculate_final_results(session_id, uow)
     if not results:
         raise HTTPException(status_code=404, detail="Results not found")
     return results
 
+SESSION_SUMMARY_COLUMNS = (
+    InterviewSession.id, InterviewSession.candidate_id, InterviewSession.status,
+    InterviewSession.current_round, InterviewSession.score, InterviewSession.decision,
+    InterviewSession.start_time, InterviewSession.end_time,
+)
+SESSION_OPTIONAL_FIELDS = {
+    "round_data": InterviewSession.round_data,
+    "breakdown": InterviewSession.breakdown,
+}
+
+# Archived sessions stay listed, served from the archived_sessions index
+ARCHIVED_SUMMARY_COLUMNS = (
+    ArchivedSession.session_id.label("id"), ArchivedSession.candidate_id, literal("completed").label("status"),
+    literal("completed").label("current_round"), ArchivedSession.score, ArchivedSession.decision,
+    ArchivedSession.start_time, ArchivedSession.end_time,
+)
+
 @router.get("/resume/{resume_id}")
-async def get_resume_sessions(resume_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(InterviewSession)
-        .where(InterviewSession.candidate_id == resume_id)
-        .order_by(InterviewSession.start_time.desc())
+async def get_resume_sessions(
+    resume_id: int,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = Query(None, description="Comma separated extra columns: round_data, breakdown"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    extra = parse_fields(fields, SESSION_OPTIONAL_FIELDS)
+    hot = select(
+        *SESSION_SUMMARY_COLUMNS, *extra, literal(False).label("archived"),
+    ).where(InterviewSession.candidate_id == resume_id)
+    archived = select(
+        *ARCHIVED_SUMMARY_COLUMNS, *(null().label(column.key) for column in extra), literal(True).label("archived"),
+    ).where(ArchivedSession.candidate_id == resume_id)
+    sessions = union_all(hot, archived).subquery()
+    return await fetch_page(
+        db,
+        select(sessions),
+        sessions.c.start_time, sessions.c.id,
+        limit, cursor, response,
     )
-    sessions = result.scalars().all()
-    return sessions
 
-@router.post("/{session_id}/speak")
-async def speak_endpoint(session_id: int, audio: UploadFile = File(...), db: AsyncSession = Depends(get_db)):
-    # 1. Save User Audio
-    upload_dir = "uploads/audio"
-    os.makedirs(upload_dir, exist_ok=True)
-    
+async def _save_user_audio(session_id: int, audio: UploadFile) -> str:
     # We use webm as it is standard for browser recording
-    user_filename = f"{session_id}_{uuid.uuid4()}_user.webm" 
-    user_filepath = os.path.join(upload_dir, user_filename)
-    
-    with open(user_filepath, "wb") as buffer:
-        shutil.copyfileobj(audio.file, buffer)
-        
-    # 2. Process with Gemini (Multimodal)
     try:
-        print(f"DEBUG: Starting Gemini processing for {user_filename}")
-        # Upload to Gemini File API
-        # Note: In a real app, you might want to reuse the file or delete it later
-        user_audio_file = genai.upload_file(user_filepath)
-        print(f"DEBUG: File uploaded to Gemini: {user_audio_file}")
-        
-        # Get Chat History (Context)
-        result = await db.execute(select(InterviewSession).where(InterviewSession.id == session_id))
-        session = result.scalars().first()
-        history_context = ""
-        if session and session.round_data:
-             transcript = session.round_data.get(session.current_round, {}).get("transcript", [])
-             history_context = "\n".join([f"{msg['role']}: {msg['content']}" for msg in transcript[-5:]])
+        stored = await save_upload(audio, AUDIO_DIR, MAX_AUDIO_BYTES, prefix=f"{session_id}_", suffix="_user.webm")
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    return stored.path
 
-        prompt = (
-            "You are an expert technical interviewer. "
-            "You are conducting a spoken interview. "
-            "Listen to the candidate's audio input. "
-            "Respond naturally as an interviewer. "
-            "If they answered a question, acknowledge it and ask a follow-up or move to the next topic. "
-            "Keep your response concise (1-3 sentences) suitable for spoken conversation. "
-            f"\n\nContext:\n{history_context}"
-        )
-        
-        print("DEBUG: Generating content with Gemini...")
-        model = genai.GenerativeModel("gemini-1.5-flash") # Check model name!
-        # gemini-1.5-flash is often safer/faster. gemini-pro-latest might be deprecated or require 1.5.
-        # Let's try "gemini-1.5-flash" if this fails, or "gemini-pro".
-        result = model.generate_content([prompt, user_audio_file])
-        
-        ai_text = result.text
-        print(f"DEBUG: AI Response: {ai_text}")
-        
-        # 3. Text to Speech
-        tts_filename = f"{session_id}_{uuid.uuid4()}_ai.mp3"
-        tts_filepath = os.path.join(upload_dir, tts_filename)
-        
-        print(f"DEBUG: Generating TTS to {tts_filepath}")
-        tts = gTTS(text=ai_text, lang='en')
-        tts.save(tts_filepath)
-        print("DEBUG: TTS saved successfully")
-        
-        # Save transcript
-        if session:
-             if not session.round_data: session.round_data = {}
-             if session.current_round not in session.round_data:
-                 session.round_data[session.current_round] = {}
-             
-             # Need to init transcript if not exists
-             if "transcript" not in session.round_data[session.current_round]:
-                 session.round_data[session.current_round]["transcript"] = []
-                 
-             current_hist = session.round_data[session.current_round]["transcript"]
-             current_hist.append({"role": "user_audio", "content": "(Audio Input)"})
-             current_hist.append({"role": "ai", "content": ai_text})
-             
-             # Force update
-             session.round_data[session.current_round]["transcript"] = current_hist
-             session.round_data = dict(session.round_data)
-             db.add(session)
-             await db.commit()
-        
-        return {
-            "text": ai_text,
-            "audio_url": f"http://localhost:8000/uploads/audio/{tts_filename}"
-        }
+@router.post("/{session_id}/speak")
+async def speak_endpoint(session_id: int, response: Response, audio: UploadFile = File(...), db: AsyncSession = Depends(get_db)):
+    # 1. Save User Audio
+    user_filepath = await _save_user_audio(session_id, audio)
         
+    # 2. Gemini upload + context, streamed reply, per-sentence TTS, transcript
+    try:
+        turn = await run_voice_turn(user_filepath, load_voice_context(db, session_id))
+    except MediaQuotaExceeded as e:
+        raise HTTPException(status_code=507, detail=str(e))
     except Exception as e:
         print(f"CRITICAL ERROR in /speak: {e}")
         import traceback
         traceback.print_exc()
         # Fallback if Gemini fails (e.g. file upload error)
         raise HTTPException(status_code=500, detail=str(e))
+
+    response.headers["Server-Timing"] = turn.timer.server_timing()
+    return {
+        "text": turn.text,
+        "audio_url": f"http://localhost:8000/interviews/{session_id}/reply_audio?{reply_audio_query(turn.audio_keys)}",
+        "timings": turn.timer.as_dict(),
+    }
+
+@router.get("/{session_id}/reply_audio")
+async def get_reply_audio(session_id: int, k: list[str] = Query(...)):
+    # Keys are TTS cache file names: sha256 hex digests only
+    if len(k) > 32 or not all(re.fullmatch(r"[0-9a-f]{64}", key) for key in k):
+        raise HTTPException(status_code=400, detail="Invalid audio key")
+    audio = await asyncio.to_thread(read_reply_audio, k)
+    if audio is None:
+        raise HTTPException(status_code=404, detail="Reply audio expired")
+    return Response(content=audio, media_type="audio/mpeg")
+
+@router.websocket("/{session_id}/voice")
+async def voice_socket(websocket: WebSocket, session_id: int):
+    # Full-duplex voice transport, see VoiceSocketSession for the protocol
+    await VoiceSocketSession(websocket, session_id).run()
+
+@router.post("/{session_id}/speak/stream")
+async def speak_stream_endpoint(session_id: int, audio: UploadFile = File(...)):
+    """
+    Same turn as /speak, streamed as NDJSON: a "text" line per sentence as soon as it
+    is generated, an "audio" line with that sentence's base64 mp3 as soon as it is
+    synthesized, then "done" with the full text and per-stage timings.
+    """
+    user_filepath = await _save_user_audio(session_id, audio)
+
+    async def ndjson():
+        # Own session: request dependencies are closed before a streamed body is sent
+        try:
+            async with AsyncSessionLocal() as db:
+                async for event in voice_turn_events(user_filepath, load_voice_context(db, session_id)):
+                    if event["type"] == "audio":
+                        event = {**event, "audio": base64.b64encode(event["audio"]).decode()}
+                    yield json.dumps(event) + "\n"
+        except Exception as e:
+            print(f"CRITICAL ERROR in /speak/stream: {e}")
+            yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
@@ -0,0 +1,130 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from ..models import AnalyticsRollup, InterviewSession
+
+PASS_DECISION = "Strong Hire"
+SCORE_BUCKETS = 10 # score_bucket:0 .. score_bucket:9 cover 0-100 in steps of 10
+MAX_DASHBOARD_DAYS = 366
+
+def session_increments(session: InterviewSession, results: dict) -> Counter:
+    """(dimension, key, metric) -> increment contributed by one completed session."""
+    inc = Counter()
+    scores = results.get("scores", {})
+    mcq = scores.get("oa_mcq", {})
+    coding_passed = scores.get("oa_coding", 0) == 100
+    decision = session.decision or results.get("overall_status", "Pending")
+    score = session.score or 0
+    bucket = f"score_bucket:{min(max(score, 0) // 10, SCORE_BUCKETS - 1)}"
+
+    inc[("all", "", "sessions")] += 1
+    inc[("all", "", f"decision:{decision}")] += 1
+    inc[("all", "", "passed")] += int(decision == PASS_DECISION)
+    inc[("all", "", "score_sum")] += score
+    inc[("all", "", bucket)] += 1
+    inc[("all", "", "mcq_correct")] += mcq.get("score", 0)
+    inc[("all", "", "mcq_total")] += mcq.get("total", 0)
+    inc[("all", "", "coding_passed")] += int(coding_passed)
+
+    # Written into the round data by the oa_coding submit_round
+    problem_id = ((session.round_data or {}).get("oa_coding") or {}).get("problem_id")
+    if problem_id is not None:
+        inc[("problem", str(problem_id), "attempts")] += 1
+        inc[("problem", str(problem_id), "passed")] += int(coding_passed)
+        inc[("problem", str(problem_id), bucket)] += 1
+
+    # Tag rows count MCQ answers, not sessions, so they carry no score histogram
+    for item in results.get("questions_analysis", []):
+        for tag in item.get("tags") or []:
+            inc[("tag", str(tag).lower(), "mcq_total")] += 1
+            inc[("tag", str(tag).lower(), "mcq_correct")] += int(bool(item.get("is_correct")))
+    return inc
+
+def _dialect_insert(db: AsyncSession):
+    return postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+
+async def apply_increments(db: AsyncSession, user_id: int | None, day: str, increments: Counter):
+    """Adds the increments to the rollup counters with one upsert statement; the caller commits."""
+    rows = [
+        {"user_id": user_id or 0, "day": day, "dimension": dimension, "key": key, "metric": metric, "value": value}
+        for (dimension, key, metric), value in increments.items()
+        if value
+    ]
+    if not rows:
+        return
+    insert = _dialect_insert(db)
+    stmt = insert(AnalyticsRollup).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "day", "dimension", "key", "metric"],
+        set_={"value": AnalyticsRollup.value + stmt.excluded.value},
+    )
+    await db.execute(stmt)
+
+async def record_completed_session(db: AsyncSession, user_id: int | None, session: InterviewSession, results: dict):
+    day = (session.end_time or datetime.utcnow()).strftime("%Y-%m-%d")
+    await apply_increments(db, user_id, day, session_increments(session, results))
+
+def _ratio(num: int, den: int) -> float | None:
+    return round(num / den, 4) if den else None
+
+async def dashboard(db: AsyncSession, user_id: int, days: int = 7) -> dict:
+    """
+    Reads the rollup counters for the last `days` days. Cost depends on the number
+    of days, problems and tags, not on how many sessions were run.
+    """
+    days = max(1, min(days, MAX_DASHBOARD_DAYS))
+    until = datetime.utcnow().date()
+    since = until - timedelta(days=days - 1)
+    result = await db.execute(
+        select(AnalyticsRollup.day, AnalyticsRollup.dimension, AnalyticsRollup.key, AnalyticsRollup.metric, AnalyticsRollup.value)
+        .where(AnalyticsRollup.user_id == user_id, AnalyticsRollup.day >= since.isoformat(), AnalyticsRollup.day <= until.isoformat())
+    )
+
+    totals, daily, problems, tags = Counter(), {}, {}, {}
+    for day, dimension, key, metric, value in result.all():
+        if dimension == "all":
+            totals[metric] += value
+            daily.setdefault(day, Counter())[metric] += value
+        elif dimension == "problem":
+            problems.setdefault(key, Counter())[metric] += value
+        elif dimension == "tag":
+            tags.setdefault(key, Counter())[metric] += value
+
+    return {
+        "from": since.isoformat(),
+        "to": until.isoformat(),
+        "totals": {
+            "sessions": totals["sessions"],
+            "passed": totals["passed"],
+            "pass_rate": _ratio(totals["passed"], totals["sessions"]),
+            "average_score": _ratio(totals["score_sum"], totals["sessions"]),
+            "decisions": {m.split(":", 1)[1]: v for m, v in totals.items() if m.startswith("decision:")},
+            "score_histogram": [totals[f"score_bucket:{b}"] for b in range(SCORE_BUCKETS)],
+            "mcq_accuracy": _ratio(totals["mcq_correct"], totals["mcq_total"]),
+            "coding_pass_rate": _ratio(totals["coding_passed"], totals["sessions"]),
+        },
+        "daily": [
+            {"day": day, "sessions": c["sessions"], "passed": c["passed"], "pass_rate": _ratio(c["passed"], c["sessions"])}
+            for day, c in sorted(daily.items())
+        ],
+        "problems": sorted(
+            [
+                {
+                    "problem_id": key, "attempts": c["attempts"], "passed": c["passed"],
+                    "pass_rate": _ratio(c["passed"], c["attempts"]),
+                    "score_histogram": [c[f"score_bucket:{b}"] for b in range(SCORE_BUCKETS)],
+                }
+                for key, c in problems.items()
+            ],
+            key=lambda p: -p["attempts"],
+        ),
+        "tags": sorted(
+            [
+                {"tag": key, "correct": c["mcq_correct"], "total": c["mcq_total"], "accuracy": _ratio(c["mcq_correct"], c["mcq_total"])}
+                for key, c in tags.items()
+            ],
+            key=lambda t: -t["total"],
+        ),
+    }
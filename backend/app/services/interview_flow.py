@@ -1,113 +1,130 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from ..models import InterviewSession, Question, Candidate
+from sqlalchemy import update
+from sqlalchemy.orm.attributes import set_committed_value
+from ..models import InterviewSession
+from .unit_of_work import InterviewUnitOfWork
+from .session_scores import apply_round_submission
+from .session_events import record_state_change
 from datetime import datetime
 
 PIPELINE = [
-    "resume_analysis", 
-    "prep_oa", 
-    "oa_mcq", 
-    "prep_coding", 
-    "oa_coding", 
-    "prep_tech_1", 
-    "tech_1", 
-    "prep_tech_2", 
-    "tech_2", 
+    "resume_analysis",
+    "prep_oa",
+    "oa_mcq",
+    "prep_coding",
+    "oa_coding",
+    "prep_tech_1",
+    "tech_1",
+    "prep_tech_2",
+    "tech_2",
     "completed"
 ]
 
-async def get_session(session_id: int, db: AsyncSession):
-    result = await db.execute(select(InterviewSession).where(InterviewSession.id == session_id))
-    return result.scalars().first()
+# Strict Flow Definition: round -> next round
+TRANSITIONS = dict(zip(PIPELINE, PIPELINE[1:]))
+ROUND_INDEX = {name: i for i, name in enumerate(PIPELINE)}
 
-async def get_round_state(session_id: int, db: AsyncSession):
-    session = await get_session(session_id, db)
+def _on_enter_completed() -> dict:
+    return {"status": "completed", "end_time": datetime.utcnow()}
+
+# Per-round hooks run when the round is entered; they return extra column values
+# written in the same UPDATE as the transition
+ON_ENTER = {
+    "completed": _on_enter_completed,
+}
+
+class TransitionConflict(Exception):
+    """The session was changed by another request since it was read."""
+
+    def __init__(self, session_id: int):
+        super().__init__(f"Session {session_id} was changed concurrently, reload its state")
+        self.session_id = session_id
+
+async def compare_and_set(uow: InterviewUnitOfWork, session: InterviewSession, **values):
+    """
+    Writes `values` with one `UPDATE ... WHERE id = ? AND version = ?` and bumps the
+    version, so the update only applies to the state the caller read. Raises
+    TransitionConflict if another request got there first. The loaded object is
+    updated to match; the caller commits.
+    """
+    version = session.version or 0
+    values["version"] = version + 1
+    result = await uow.db.execute(
+        update(InterviewSession)
+        .where(InterviewSession.id == session.id, InterviewSession.version == version)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        raise TransitionConflict(session.id)
+    for key, value in values.items():
+        set_committed_value(session, key, value)
+
+async def _advance(uow: InterviewUnitOfWork, session: InterviewSession, **values) -> dict | None:
+    """Moves the session to its next round; returns the round_advanced event payload (None if already completed)."""
+    previous_round = session.current_round
+    next_round = TRANSITIONS.get(previous_round)
+    if next_round is None:
+        # Already completed; only the extra values change
+        if values:
+            await compare_and_set(uow, session, **values)
+        return None
+    hook = ON_ENTER.get(next_round)
+    entered = hook() if hook else {}
+    await compare_and_set(uow, session, current_round=next_round, **entered, **values)
+    return {"from": previous_round, "current_round": next_round, **entered, "version": session.version}
+
+async def get_round_state(session_id: int, uow: InterviewUnitOfWork):
+    session = await uow.get_session(session_id)
     if not session:
         return {"error": "Session not found"}
-    
-    current_index = PIPELINE.index(session.current_round)
-    
+
     # If already completed, return
     if session.current_round == "completed":
         return {"status": "completed"}
-        
+
     return {
         "session_id": session.id,
         "current_round": session.current_round,
         "round_type": session.current_round,
-        "candidate_id": session.candidate_id 
+        "round_index": ROUND_INDEX[session.current_round],
+        "candidate_id": session.candidate_id
     }
 
-async def advance_round_state(session_id: int, db: AsyncSession):
-    session = await get_session(session_id, db)
+async def advance_round_state(session_id: int, uow: InterviewUnitOfWork):
+    session = await uow.get_session(session_id)
     if not session:
         return {"error": "Session not found"}
-    
-    current_round = session.current_round
-    
-    # Strict Flow Definition
-    # resume_analysis -> prep_oa -> oa_mcq -> prep_coding -> oa_coding -> 
-    # prep_tech_1 -> tech_1 -> prep_tech_2 -> tech_2 -> completed
-
-    if current_round == "resume_analysis":
-        session.current_round = "prep_oa"
-    elif current_round == "prep_oa":
-        session.current_round = "oa_mcq"
-    elif current_round == "oa_mcq":
-        session.current_round = "prep_coding" 
-    elif current_round == "prep_coding":
-        session.current_round = "oa_coding"
-    elif current_round == "oa_coding":
-        session.current_round = "prep_tech_1"
-    elif current_round == "prep_tech_1":
-        session.current_round = "tech_1"
-    elif current_round == "tech_1":
-        session.current_round = "prep_tech_2"
-    elif current_round == "prep_tech_2":
-        session.current_round = "tech_2"
-    elif current_round == "tech_2":
-        session.current_round = "completed"
-        session.end_time = datetime.utcnow()
-        session.status = "completed"
-        
-    db.add(session)
-    await db.commit()
-    await db.refresh(session)
-    
+
+    advanced = await _advance(uow, session)
+    if advanced:
+        await record_state_change(uow.db, session, "round_advanced", advanced)
+    await uow.commit()
+
     return {
         "session_id": session.id,
         "current_round": session.current_round
     }
 
-async def submit_round(session_id: int, data: dict, db: AsyncSession):
-    session = await get_session(session_id, db)
+async def submit_round(session_id: int, data: dict, uow: InterviewUnitOfWork):
+    session = await uow.get_session(session_id)
     if not session:
         return {"error": "Session not found"}
-        
-    # Update score/data
-    if not session.round_data: session.round_data = {}
-    
-    # Store round data
+
     current_round = session.current_round
-    if current_round not in session.round_data:
-        session.round_data[current_round] = {}
-        
-    session.round_data[current_round] = data
-    # Force JSON update
-    session.round_data = dict(session.round_data)
-    
-    # Calculate score if MCQ
-    if data.get("type") == "oa_mcq":
-        # logic to calc score... assumed done in frontend or here.
-        # Simple count for now if data has 'score' or we calc it?
-        # User's frontend sends 'answers'. We should calculate score here strictly?
-        # For now, let's just proceed to next round.
-        pass
-
-    db.add(session)
-    await db.commit()
-    
-    # auto-advance
-    await advance_round_state(session_id, db) # Changed to advance_round_state as per original logic for advancing
-    
+    round_data = dict(session.round_data or {})
+    round_data[current_round] = data
+    # Visible to the score rebuild below; persisted by the transition's UPDATE
+    set_committed_value(session, "round_data", round_data)
+
+    # Keep the materialized score record current (read by GET /results)
+    await apply_round_submission(uow, session, current_round, data)
+
+    # auto-advance; the round data is written by the same conditional UPDATE
+    advanced = await _advance(uow, session, round_data=round_data)
+    # One event for the submission and the advance it caused
+    await record_state_change(uow.db, session, "round_submitted", {
+        "round": current_round, "data": data, **(advanced or {"version": session.version}),
+    })
+    await uow.commit()
+
     return {"status": "success", "next_round": session.current_round}
@@ -31,7 +31,7 @@ def generate_text(prompt: str) -> str:
         traceback.print_exc()
         return "Sorry, I am having trouble thinking right now."
 
-def generate_json(prompt: str) -> dict:
+def generate_json(prompt: str, timeout: float | None = None) -> dict:
     if not GEMINI_API_KEY:
         return {}
 
@@ -40,7 +40,8 @@ def generate_json(prompt: str) -> dict:
     
     try:
         model = genai.GenerativeModel(MODEL_NAME)
-        response = model.generate_content(json_prompt)
+        request_options = {"timeout": timeout} if timeout else None
+        response = model.generate_content(json_prompt, request_options=request_options)
         text = response.text
         
         # Clean up potential markdown code blocks
@@ -0,0 +1,321 @@
+import asyncio
+import os
+import re
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from sqlalchemy import delete, exists, func, literal, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from ..database import AsyncSessionLocal
+from ..models import Candidate, InterviewSession, MediaArtifact, MediaRef
+from .speech_backends import get_speech_backend
+from .upload_storage import StoredUpload
+
+MEDIA_QUOTA_BYTES = int(os.getenv("MEDIA_QUOTA_BYTES", 2 * 1024 * 1024 * 1024)) # Per recruiter
+AUDIO_RETENTION_DAYS = int(os.getenv("AUDIO_RETENTION_DAYS", "30"))
+MEDIA_SWEEP_INTERVAL = int(os.getenv("MEDIA_SWEEP_INTERVAL", "3600")) # Seconds, 0 disables the background sweep
+# Untracked files younger than this may belong to a request still in flight
+MEDIA_ORPHAN_GRACE_SECONDS = int(os.getenv("MEDIA_ORPHAN_GRACE_SECONDS", "3600"))
+
+AUDIO_DIR = "uploads/audio"
+RESUME_DIR = "uploads/resumes"
+MEDIA_DIRS = [AUDIO_DIR, RESUME_DIR] # uploads/tts_cache bounds itself (see tts_cache.py)
+SWEEP_BATCH = 500
+REMOTE_DELETE_BATCH = 20 # Provider deletes per commit in the sweep
+
+# Session audio is stored as `{session_id}_...` (see session_archive.prune_session_audio)
+_SESSION_AUDIO_NAME = re.compile(r"^(\d+)_")
+
+class MediaQuotaExceeded(Exception):
+    def __init__(self, owner_id: int, quota: int | None = None):
+        quota = quota or MEDIA_QUOTA_BYTES
+        super().__init__(f"Media storage quota of {quota} bytes exceeded")
+        self.owner_id = owner_id
+        self.quota = quota
+
+def over_quota(used: int, incoming: int) -> bool:
+    return used + incoming > MEDIA_QUOTA_BYTES
+
+def expiry_for(kind: str, created_at: datetime) -> datetime | None:
+    """Recordings expire after AUDIO_RETENTION_DAYS; resumes live as long as a candidate uses them."""
+    if kind in ("user_audio", "reply_audio"):
+        return created_at + timedelta(days=AUDIO_RETENTION_DAYS)
+    return None
+
+def remove_files(paths: list[str]) -> int:
+    removed = 0
+    for path in paths:
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+def _dialect_insert(db: AsyncSession):
+    return postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+
+def usage_subquery(owner_id):
+    """Bytes referenced by an owner; `owner_id` may be a column for use in a correlated query."""
+    return (
+        select(func.coalesce(func.sum(MediaRef.size), 0))
+        .where(MediaRef.owner_id == owner_id)
+        .scalar_subquery()
+    )
+
+async def usage_bytes(db: AsyncSession, owner_id: int) -> int:
+    return (await db.execute(select(usage_subquery(owner_id)))).scalar_one()
+
+async def track_artifact(
+    db: AsyncSession,
+    path: str,
+    kind: str,
+    size: int,
+    owner_id: int | None,
+    session_id: int | None = None,
+    remote_id: str | None = None,
+    created_at: datetime | None = None,
+):
+    """
+    Indexes a stored file and records owner_id's reference to it. Content-addressed
+    paths already indexed keep their row; an owner already referencing the file is
+    not recorded twice. The caller commits.
+    """
+    created_at = created_at or datetime.utcnow()
+    owner_id = owner_id or 0
+    expires_at = expiry_for(kind, created_at)
+    insert = _dialect_insert(db)
+    stmt = insert(MediaArtifact).values(
+        path=path, kind=kind, size=size, owner_id=owner_id, session_id=session_id,
+        remote_id=remote_id, created_at=created_at, expires_at=expires_at,
+    )
+    await db.execute(stmt.on_conflict_do_nothing(index_elements=["path"]))
+    ref = insert(MediaRef).from_select(
+        ["artifact_id", "owner_id", "size", "created_at", "expires_at"],
+        select(MediaArtifact.id, literal(owner_id), literal(size), literal(created_at), literal(expires_at, MediaRef.expires_at.type))
+        .where(MediaArtifact.path == path),
+    )
+    await db.execute(ref.on_conflict_do_nothing(index_elements=["artifact_id", "owner_id"]))
+
+async def admit_upload(db: AsyncSession, stored: StoredUpload, kind: str, owner_id: int | None, session_id: int | None = None):
+    """
+    Quota check and indexing for a file that was just saved. Every owner of identical
+    content is charged for it once. A file that pushes its owner over MEDIA_QUOTA_BYTES
+    is deleted again (unless another owner or candidate still uses it) and
+    MediaQuotaExceeded is raised. The caller commits.
+    """
+    owner_id = owner_id or 0
+    artifact_id, owned = (await db.execute(
+        select(MediaArtifact.id, MediaRef.id)
+        .outerjoin(MediaRef, (MediaRef.artifact_id == MediaArtifact.id) & (MediaRef.owner_id == owner_id))
+        .where(MediaArtifact.path == stored.path)
+    )).first() or (None, None)
+    if owned is not None:
+        return # This owner already stores identical content and is charged for it
+    if over_quota(await usage_bytes(db, owner_id), stored.size):
+        in_use = artifact_id is not None or (kind == "resume" and await db.scalar(
+            select(Candidate.id).where(Candidate.resume_url == stored.path).limit(1)
+        ))
+        if not in_use:
+            await asyncio.to_thread(remove_files, [stored.path])
+        raise MediaQuotaExceeded(owner_id)
+    await track_artifact(db, stored.path, kind, stored.size, owner_id, session_id)
+
+def _chunks(items: list, size: int = SWEEP_BATCH):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def _scan_media() -> list[tuple[str, int, float]]:
+    files = []
+    for directory in MEDIA_DIRS:
+        if not os.path.isdir(directory):
+            continue
+        for entry in os.scandir(directory):
+            if entry.is_file():
+                stat = entry.stat()
+                files.append((os.path.join(directory, entry.name), stat.st_size, stat.st_mtime))
+    return files
+
+def _kind_of(path: str) -> str | None:
+    """Artifact kind of a file by location: everything under RESUME_DIR is a resume, whatever its extension."""
+    directory, name = os.path.split(path)
+    if directory == RESUME_DIR:
+        return "resume"
+    if directory == AUDIO_DIR:
+        return "user_audio" if name.endswith("_user.webm") else "reply_audio"
+    return None
+
+def _audio_session_id(path: str) -> int | None:
+    match = _SESSION_AUDIO_NAME.match(os.path.basename(path))
+    return int(match.group(1)) if match and os.path.dirname(path) == AUDIO_DIR else None
+
+@dataclass
+class SweepReport:
+    expired: int = 0 # Files removed because their retention ran out
+    orphaned: int = 0 # Untracked files nothing refers to (including abandoned .part files)
+    adopted: int = 0 # Untracked files still in use, now indexed (e.g. stored before the index existed)
+    missing: int = 0 # Index rows whose file was gone
+    remote_deleted: int = 0 # Provider copies deleted on retry
+    bytes_freed: int = 0
+
+async def sweep(db: AsyncSession, now: datetime | None = None) -> SweepReport:
+    """
+    One garbage collection pass over the media directories:
+    provider copies left behind by a failed release are deleted again, expired
+    artifacts are deleted, index rows of vanished files are dropped, and files missing
+    from the index are either adopted (a candidate or session still refers to them)
+    or removed once older than MEDIA_ORPHAN_GRACE_SECONDS.
+    """
+    now = now or datetime.utcnow()
+    report = SweepReport()
+
+    # 1. Provider copies whose deletion failed when the turn ended (before their rows can expire)
+    backend = get_speech_backend()
+    pending = (await db.execute(
+        select(MediaArtifact.id, MediaArtifact.remote_id).where(MediaArtifact.remote_id.is_not(None))
+    )).all()
+    # No transaction (or write lock) is held across the provider calls; each batch
+    # of deletions is recorded in a short transaction of its own
+    await db.commit()
+    for chunk in _chunks(pending, REMOTE_DELETE_BATCH):
+        deleted = []
+        for row in chunk:
+            try:
+                await backend.delete_remote(row.remote_id)
+            except Exception as e:
+                print(f"Could not delete remote media {row.remote_id}: {e}")
+                continue
+            deleted.append(row.id)
+        if deleted:
+            await db.execute(update(MediaArtifact).where(MediaArtifact.id.in_(deleted)).values(remote_id=None))
+            await db.commit()
+            report.remote_deleted += len(deleted)
+
+    # 2. Expired references, oldest first; a file goes once no reference to it is left
+    while True:
+        refs = (await db.execute(
+            select(MediaRef.id, MediaRef.artifact_id)
+            .where(MediaRef.expires_at < now)
+            .order_by(MediaRef.expires_at)
+            .limit(SWEEP_BATCH)
+        )).all()
+        if not refs:
+            break
+        await db.execute(delete(MediaRef).where(MediaRef.id.in_([ref.id for ref in refs])))
+        rows = (await db.execute(
+            select(MediaArtifact.id, MediaArtifact.path, MediaArtifact.size)
+            .where(
+                MediaArtifact.id.in_({ref.artifact_id for ref in refs}),
+                ~exists().where(MediaRef.artifact_id == MediaArtifact.id),
+            )
+        )).all()
+        await db.execute(delete(MediaArtifact).where(MediaArtifact.id.in_([row.id for row in rows])))
+        await db.commit()
+        # Files left behind by a crash here are untracked and go as orphans
+        report.expired += await asyncio.to_thread(remove_files, [row.path for row in rows])
+        report.bytes_freed += sum(row.size for row in rows)
+
+    # 3. Index against disk
+    tracked = set((await db.execute(select(MediaArtifact.path))).scalars().all())
+    files = await asyncio.to_thread(_scan_media)
+    on_disk = {path for path, _, _ in files}
+
+    missing = list(tracked - on_disk)
+    for chunk in _chunks(missing):
+        await db.execute(delete(MediaRef).where(
+            MediaRef.artifact_id.in_(select(MediaArtifact.id).where(MediaArtifact.path.in_(chunk)))
+        ))
+        await db.execute(delete(MediaArtifact).where(MediaArtifact.path.in_(chunk)))
+    report.missing = len(missing)
+
+    cutoff = time.time() - MEDIA_ORPHAN_GRACE_SECONDS
+    untracked = [(path, size, mtime) for path, size, mtime in files if path not in tracked and mtime < cutoff]
+
+    # Owners of whatever still refers to the untracked files. Every file is checked
+    # against both resume_url and session audio before it can be deleted.
+    resume_owners, session_owners = {}, {}
+    for chunk in _chunks([path for path, _, _ in untracked]):
+        rows = await db.execute(select(Candidate.resume_url, Candidate.user_id).where(Candidate.resume_url.in_(chunk)))
+        for url, user_id in rows.all():
+            resume_owners.setdefault(url, set()).add(user_id)
+    session_ids = list({session_id for path, _, _ in untracked if (session_id := _audio_session_id(path)) is not None})
+    for chunk in _chunks(session_ids):
+        rows = await db.execute(
+            select(InterviewSession.id, Candidate.user_id)
+            .outerjoin(Candidate, Candidate.id == InterviewSession.candidate_id)
+            .where(InterviewSession.id.in_(chunk))
+        )
+        session_owners.update({session_id: user_id for session_id, user_id in rows.all()})
+
+    orphans = []
+    for path, size, mtime in untracked:
+        created_at = datetime.utcfromtimestamp(mtime)
+        session_id = _audio_session_id(path)
+        if path in resume_owners:
+            # Every recruiter whose candidates use the file holds a reference
+            for owner_id in resume_owners[path]:
+                await track_artifact(db, path, "resume", size, owner_id, created_at=created_at)
+            report.adopted += 1
+        elif session_id in session_owners:
+            await track_artifact(db, path, _kind_of(path), size, session_owners[session_id], session_id, created_at=created_at)
+            report.adopted += 1
+        else:
+            orphans.append((path, size))
+    await db.commit()
+
+    report.orphaned = await asyncio.to_thread(remove_files, [path for path, _ in orphans])
+    report.bytes_freed += sum(size for _, size in orphans)
+    return report
+
+class MediaSweeper:
+    """Runs `sweep` every MEDIA_SWEEP_INTERVAL seconds in the background (started by the app lifespan)."""
+
+    def __init__(self, session_factory, interval: int = MEDIA_SWEEP_INTERVAL):
+        self.session_factory = session_factory
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+        self.runs = 0
+        self.last_run: datetime | None = None
+        self.last_report: SweepReport | None = None
+
+    def start(self):
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self) -> SweepReport:
+        async with self.session_factory() as db:
+            report = await sweep(db)
+        self.runs += 1
+        self.last_run = datetime.utcnow()
+        self.last_report = report
+        return report
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"Media sweep failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> dict:
+        return {
+            "quota_bytes": MEDIA_QUOTA_BYTES,
+            "sweep_interval": self.interval,
+            "runs": self.runs,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "last_report": asdict(self.last_report) if self.last_report else None,
+        }
+
+media_sweeper = MediaSweeper(AsyncSessionLocal)
@@ -0,0 +1,92 @@
+import base64
+from datetime import datetime
+from fastapi import HTTPException, Response
+from sqlalchemy import String, and_, or_, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def encode_cursor(sort_value: datetime | str | None, row_id: int) -> str:
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = f"{sort_value or ''}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str) -> tuple[str | None, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        sort_part, id_part = raw.rsplit("|", 1)
+        return (sort_part or None), int(id_part)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def sort_key(sort_column, dialect: str):
+    """
+    The expression pages are ordered and compared by. SQLite keeps datetimes as text
+    in whatever form wrote them (server defaults: `2024-01-01 10:00:00`, Python values:
+    `2024-01-01 10:00:00.000000`), so there the cursor carries and is compared as the
+    stored text, the same values ORDER BY sees (and the column's index still applies).
+    """
+    if dialect == "sqlite":
+        return type_coerce(sort_column, String)
+    return sort_column
+
+def keyset_after(sort_key, id_column, cursor: str | None):
+    """WHERE clause for the page after `cursor` when ordering by (sort_key DESC NULLS LAST, id DESC)."""
+    if not cursor:
+        return None
+    sort_value, row_id = decode_cursor(cursor)
+    if sort_value is None:
+        return and_(sort_key.is_(None), id_column < row_id)
+    if not isinstance(sort_key.type, String):
+        try:
+            sort_value = datetime.fromisoformat(sort_value)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    return or_(
+        sort_key < sort_value,
+        and_(sort_key == sort_value, id_column < row_id),
+        sort_key.is_(None),
+    )
+
+def parse_fields(fields: str | None, allowed: dict) -> list:
+    """Maps a comma separated `fields` query parameter to the opt-in columns it names."""
+    if not fields:
+        return []
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [n for n in names if n not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}",
+        )
+    return [allowed[n] for n in names]
+
+async def fetch_page(
+    db: AsyncSession,
+    stmt,
+    sort_column,
+    id_column,
+    limit: int,
+    cursor: str | None,
+    response: Response,
+) -> list[dict]:
+    """
+    Runs a column-projected select one keyset page at a time, newest first.
+    Fetches limit + 1 rows to detect a next page and exposes its cursor in the
+    X-Next-Cursor header so the response body stays a plain list.
+    """
+    key = sort_key(sort_column, db.get_bind().dialect.name)
+    condition = keyset_after(key, id_column, cursor)
+    if condition is not None:
+        stmt = stmt.where(condition)
+    stmt = stmt.add_columns(key.label("_cursor_sort"))
+    stmt = stmt.order_by(key.desc().nulls_last(), id_column.desc()).limit(limit + 1)
+
+    rows = [dict(row._mapping) for row in (await db.execute(stmt)).all()]
+    cursor_values = [row.pop("_cursor_sort") for row in rows]
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(cursor_values[limit - 1], rows[-1][id_column.key])
+    return rows
@@ -0,0 +1,59 @@
+import os
+import time
+from threading import Lock
+
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+
+class PrincipalCache:
+    """
+    Short-TTL in-process cache of authenticated users, keyed by token subject
+    (user id for tokens carrying `uid`). Entries are detached User objects; other
+    workers see changes after at most PRINCIPAL_CACHE_TTL seconds.
+    """
+
+    def __init__(self, ttl: float = PRINCIPAL_CACHE_TTL, max_size: int = PRINCIPAL_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: dict = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() >= entry[0]:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, user):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if len(self._entries) >= self.max_size:
+                now = time.monotonic()
+                for stale in [k for k, (expires, _) in self._entries.items() if now >= expires]:
+                    del self._entries[stale]
+                if len(self._entries) >= self.max_size:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.monotonic() + self.ttl, user)
+
+    def invalidate(self, user_id: int | None = None, email: str | None = None):
+        with self._lock:
+            for key in [k for k, (_, u) in self._entries.items() if u.id == user_id or u.email == email]:
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+        }
+
+principal_cache = PrincipalCache()
@@ -0,0 +1,75 @@
+from datetime import datetime
+from sqlalchemy import insert, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from ..models import InterviewSession, Question
+from .session_events import record_events, session_started_row
+
+def _question_row(candidate_id: int, session_id: int, q_data: dict) -> dict:
+    return {
+        "candidate_id": candidate_id,
+        "session_id": session_id,
+        "text": q_data["text"],
+        "options": q_data["options"],
+        "correct_answer": q_data["correct_answer"],
+        "difficulty": q_data.get("difficulty", "medium"),
+        "tags": q_data.get("tags", []),
+    }
+
+def live_candidate_questions(candidate_id: int, *columns):
+    """
+    Candidate-level question lookup (quiz grading, MCQ scoring, /candidates/{id}/questions):
+    session-less questions and those of live sessions. Questions of archived sessions
+    moved to the archive with their session (session_archive.archive_batch).
+    """
+    return (
+        select(*(columns or (Question,)))
+        .outerjoin(InterviewSession, Question.session_id == InterviewSession.id)
+        .where(Question.candidate_id == candidate_id, or_(Question.session_id.is_(None), InterviewSession.id.is_not(None)))
+    )
+
+async def insert_questions(db: AsyncSession, rows: list[dict]) -> list[int]:
+    """
+    Inserts question rows as one multi-row INSERT ... RETURNING id. The ids are not
+    guaranteed to be in input order: requesting that would make SQLite fall back to
+    one statement per row.
+    """
+    if not rows:
+        return []
+    result = await db.execute(insert(Question).returning(Question.id), rows)
+    return list(result.scalars().all())
+
+async def create_sessions_with_questions(
+    db: AsyncSession,
+    items: list[tuple[int, list[dict]]],
+    current_round: str = "prep_oa",
+) -> list[int]:
+    """
+    Creates one active session per (candidate_id, questions) item together with its
+    question set: one multi-row INSERT for the sessions and one for all questions,
+    inside the caller's transaction (the caller commits). Returns the session ids
+    in item order (on SQLite the ordered session insert runs row by row, which is
+    cheap without a network round trip).
+    Used by POST /interviews/ and by bulk campaign setup (bulk_ingest.py).
+    """
+    if not items:
+        return []
+
+    now = datetime.utcnow()
+    result = await db.execute(
+        insert(InterviewSession).returning(InterviewSession.id, sort_by_parameter_order=True),
+        [
+            {"candidate_id": candidate_id, "status": "active", "current_round": current_round, "start_time": now}
+            for candidate_id, _ in items
+        ],
+    )
+    session_ids = list(result.scalars().all())
+    await record_events(db, [session_started_row(session_id, current_round) for session_id in session_ids])
+
+    rows = [
+        _question_row(candidate_id, session_id, q_data)
+        for session_id, (candidate_id, questions) in zip(session_ids, items)
+        for q_data in questions
+    ]
+    await insert_questions(db, rows)
+    return session_ids
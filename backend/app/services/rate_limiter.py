@@ -0,0 +1,78 @@
+import os
+import time
+from collections import deque
+
+class SlidingWindowLimiter:
+    """At most `limit` events per key within the last `window` seconds (in-process)."""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self._events: dict[str, deque] = {}
+
+    def _prune(self, key: str, now: float) -> deque:
+        events = self._events.get(key)
+        if events is None:
+            return deque()
+        while events and now - events[0] >= self.window:
+            events.popleft()
+        if not events:
+            del self._events[key]
+        return events
+
+    def retry_after(self, key: str) -> float:
+        """Seconds until the key may act again; 0 when it is under the limit."""
+        now = time.monotonic()
+        events = self._prune(key, now)
+        if len(events) < self.limit:
+            return 0
+        return self.window - (now - events[0])
+
+    def hit(self, key: str):
+        now = time.monotonic()
+        self._events.setdefault(key, deque()).append(now)
+        if len(self._events) > 50000:
+            for stale in [k for k, e in self._events.items() if now - e[-1] >= self.window]:
+                del self._events[stale]
+
+    def reset(self, key: str):
+        self._events.pop(key, None)
+
+    def __len__(self):
+        return len(self._events)
+
+class LoginThrottle:
+    """
+    Login attempts are limited per client IP (all attempts, against credential
+    stuffing across many accounts) and per account (failures only, so a correct
+    password resets it). Checked before any bcrypt work is done.
+    """
+
+    def __init__(self):
+        self.per_ip = SlidingWindowLimiter(
+            int(os.getenv("LOGIN_MAX_ATTEMPTS_PER_IP", "30")), float(os.getenv("LOGIN_IP_WINDOW_SECONDS", "60"))
+        )
+        self.per_account = SlidingWindowLimiter(
+            int(os.getenv("LOGIN_MAX_FAILURES_PER_ACCOUNT", "5")), float(os.getenv("LOGIN_ACCOUNT_WINDOW_SECONDS", "900"))
+        )
+        self.throttled = 0
+
+    def check(self, ip: str, account: str) -> float:
+        """Records the attempt and returns the Retry-After seconds when it must be refused."""
+        wait = max(self.per_ip.retry_after(ip), self.per_account.retry_after(account.lower()))
+        if wait:
+            self.throttled += 1
+            return wait
+        self.per_ip.hit(ip)
+        return 0
+
+    def failed(self, account: str):
+        self.per_account.hit(account.lower())
+
+    def succeeded(self, account: str):
+        self.per_account.reset(account.lower())
+
+    def stats(self) -> dict:
+        return {"tracked_ips": len(self.per_ip), "tracked_accounts": len(self.per_account), "throttled": self.throttled}
+
+login_throttle = LoginThrottle()
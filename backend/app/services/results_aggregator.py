@@ -1,60 +1,32 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from ..models import InterviewSession, Question
+from .unit_of_work import InterviewUnitOfWork
 
-async def calculate_final_results(session_id: int, db: AsyncSession):
-    # Fetch Session
-    result = await db.execute(select(InterviewSession).where(InterviewSession.id == session_id))
-    session = result.scalars().first()
-    
-    if not session:
-        return None
-        
-    data = session.round_data or {}
-    
-    # 1. OA MCQ Score
-    # Fetch total questions for this candidate
-    q_result = await db.execute(select(Question).where(Question.candidate_id == session.candidate_id))
-    questions = q_result.scalars().all()
-    
-    oa_mcq_data = data.get('oa_mcq', {})
-    answers = oa_mcq_data.get('answers', {})
-    
+# Chat Scores (Mocked for now - ideally LLM evaluates transcript)
+# In a real system, we would run an evaluation prompt here.
+TECH_1_SCORE = 85 # Placeholder
+TECH_2_SCORE = 90 # Placeholder
+
+def score_mcq(questions, answers: dict) -> tuple[int, int, list[dict]]:
+    """Returns (correct, total, per-question answersheet) for the submitted MCQ answers."""
     mcq_score = 0
-    total_mcq = len(questions)
-    for q in questions:
-        if str(q.id) in answers and int(answers[str(q.id)]) == q.correct_answer:
-            mcq_score += 1
-            
-    # 2. OA Coding Score
-    oa_coding_data = data.get('oa_coding', {})
-    coding_passed = oa_coding_data.get('passed', False)
-    coding_score = 100 if coding_passed else 0
-    
-    # 3. Chat Scores (Mocked for now - ideally LLM evaluates transcript)
-    # In a real system, we would run an evaluation prompt here.
-    tech_1_score = 85 # Placeholder
-    tech_2_score = 90 # Placeholder
-    
-    # 4. Detailed Question Analysis (Answersheet)
     questions_analysis = []
     for q in questions:
         user_ans_idx = answers.get(str(q.id))
         user_answer_text = "Not Answered"
         is_correct = False
-        
+
         options = q.options if isinstance(q.options, list) else []
-        
+
         if user_ans_idx is not None:
             idx = int(user_ans_idx)
             if 0 <= idx < len(options):
                 user_answer_text = options[idx]
-            
+
             if idx == q.correct_answer:
                 is_correct = True
-                
+                mcq_score += 1
+
         correct_text = options[q.correct_answer] if 0 <= q.correct_answer < len(options) else "Unknown"
-        
+
         questions_analysis.append({
             "question": q.text,
             "user_answer": user_answer_text,
@@ -63,18 +35,54 @@ async def calculate_final_results(session_id: int, db: AsyncSession):
             "difficulty": q.difficulty,
             "tags": q.tags
         })
+    return mcq_score, len(questions), questions_analysis
 
+def overall_status(mcq_score: int, total_mcq: int, coding_passed: bool) -> str:
+    return "Strong Hire" if (coding_passed and mcq_score > total_mcq * 0.7) else "Reject"
+
+def assemble_results(
+    session_id: int,
+    candidate_id: int,
+    mcq_score: int,
+    total_mcq: int,
+    questions_analysis: list[dict],
+    coding_passed: bool,
+) -> dict:
     return {
-        "session_id": session.id,
-        "candidate_id": session.candidate_id,
+        "session_id": session_id,
+        "candidate_id": candidate_id,
         "scores": {
             "oa_mcq": {"score": mcq_score, "total": total_mcq},
-            "oa_coding": coding_score,
-            "tech_1": tech_1_score,
-            "tech_2": tech_2_score,
+            "oa_coding": 100 if coding_passed else 0,
+            "tech_1": TECH_1_SCORE,
+            "tech_2": TECH_2_SCORE,
             # "behavioral": 0 # Removed
         },
         "questions_analysis": questions_analysis,
-        "overall_status": "Strong Hire" if (coding_passed and mcq_score > total_mcq * 0.7) else "Reject",
+        "overall_status": overall_status(mcq_score, total_mcq, coding_passed),
         "feedback": "Candidate showed strong problem solving skills."
     }
+
+async def calculate_final_results(session_id: int, uow: InterviewUnitOfWork):
+    """
+    Full recomputation from round_data and the candidate's questions.
+    Live scores are kept in session_scores (see session_scores.py); this is for rebuilds.
+    """
+    # Fetch Session (already loaded if the caller used the same unit of work)
+    session = await uow.get_session(session_id)
+
+    if not session:
+        return None
+
+    data = session.round_data or {}
+
+    # 1. OA MCQ Score
+    # Fetch total questions for this candidate
+    questions = await uow.get_candidate_questions(session.candidate_id)
+    answers = data.get('oa_mcq', {}).get('answers', {})
+    mcq_score, total_mcq, questions_analysis = score_mcq(questions, answers)
+
+    # 2. OA Coding Score
+    coding_passed = data.get('oa_coding', {}).get('passed', False)
+
+    return assemble_results(session.id, session.candidate_id, mcq_score, total_mcq, questions_analysis, coding_passed)
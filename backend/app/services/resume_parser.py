@@ -1,51 +1,120 @@
-
 import pypdf
 import docx
 import os
 import io
 import re
-from typing import Dict, Any
+from itertools import islice
+from typing import Dict, Any, Optional, Tuple
+
+# generate_analytics only looks at text[:4000] and generate_mcqs at text[:1000],
+# so uploads are parsed up to this budget; the full text is extracted on demand.
+RESUME_TEXT_BUDGET = 4000
 
-def extract_text_from_pdf(file_path: str) -> str:
-    text = ""
+def _join_bounded(chunks, max_chars: Optional[int]) -> Tuple[str, bool]:
+    """
+    Joins text chunks, stopping once max_chars is reached: no chunk is pulled past
+    the budget (chunks are extracted lazily). Returns (text, complete); text that
+    ends exactly at the budget is reported incomplete, since the rest is not read.
+    """
+    parts = []
+    length = 0
+    for chunk in chunks:
+        parts.append(chunk)
+        length += len(chunk)
+        if max_chars is not None and length >= max_chars:
+            return "".join(parts)[:max_chars], False
+
+    text = "".join(parts)
+    if max_chars is not None and len(text) > max_chars:
+        return text[:max_chars], False
+    return text, True
+
+def extract_pdf_text(file_path: str, max_chars: Optional[int] = None, max_pages: Optional[int] = None) -> Tuple[str, bool]:
+    """
+    Extracts text page by page and stops as soon as the character or page budget
+    is used up, so long CVs and portfolios are not parsed in full.
+    Returns (text, complete).
+    """
     try:
         reader = pypdf.PdfReader(file_path)
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
+        pages = islice(reader.pages, max_pages)
+        text, complete = _join_bounded(((page.extract_text() or "") + "\n" for page in pages), max_chars)
+        if max_pages is not None and len(reader.pages) > max_pages:
+            complete = False
+        return text, complete
     except Exception as e:
         print(f"Error reading PDF {file_path}: {e}")
-        return ""
-    return text
+        return "", True
+
+def extract_text_from_pdf(file_path: str, max_chars: Optional[int] = None, max_pages: Optional[int] = None) -> str:
+    return extract_pdf_text(file_path, max_chars, max_pages)[0]
 
-def extract_text_from_docx(file_path: str) -> str:
-    text = ""
+def extract_docx_text(file_path: str, max_chars: Optional[int] = None) -> Tuple[str, bool]:
     try:
         doc = docx.Document(file_path)
-        for para in doc.paragraphs:
-            text += para.text + "\n"
+        return _join_bounded((para.text + "\n" for para in doc.paragraphs), max_chars)
     except Exception as e:
         print(f"Error reading DOCX {file_path}: {e}")
-        return ""
-    return text
+        return "", True
 
-def parse_resume(file_path: str) -> str:
+def extract_text_from_docx(file_path: str, max_chars: Optional[int] = None) -> str:
+    return extract_docx_text(file_path, max_chars)[0]
+
+def parse_resume_bounded(file_path: str, max_chars: Optional[int] = RESUME_TEXT_BUDGET) -> Tuple[str, bool]:
+    """Parses at most max_chars of the resume. Returns (text, complete)."""
     _, ext = os.path.splitext(file_path)
     ext = ext.lower()
     
     if ext == '.pdf':
-        return extract_text_from_pdf(file_path)
+        return extract_pdf_text(file_path, max_chars=max_chars)
     elif ext in ['.docx', '.doc']:
-        return extract_text_from_docx(file_path)
+        return extract_docx_text(file_path, max_chars=max_chars)
     else:
-        return ""
+        return "", True
+
+def parse_resume(file_path: str) -> str:
+    return parse_resume_bounded(file_path, max_chars=None)[0]
+
+def ensure_full_resume_text(candidate) -> str:
+    """
+    Replaces a budget-limited resume_text with the full extraction.
+    Only call this where the whole document is needed; the caller commits.
+    """
+    if candidate.resume_text_complete is False:
+        candidate.resume_text = parse_resume(candidate.resume_url)
+        candidate.resume_text_complete = True
+    return candidate.resume_text or ""
 
 from .llm_service import generate_json
+from .skill_extractor import build_local_analytics
+
+# Seconds to wait for the LLM analysis before falling back to the local skill scan
+RESUME_LLM_TIMEOUT = float(os.getenv("RESUME_LLM_TIMEOUT", "20"))
 
-def generate_analytics(text: str) -> Dict[str, Any]:
-    """Generates deep analytics from resume text using LLM."""
+def _merge_ranked(local: list, llm: Any, limit: int = 5) -> list:
+    """Local matches first (they are backed by the text), then LLM entries for names the scan missed."""
+    merged = list(local)
+    seen = {item["name"].lower() for item in local}
+    for item in llm if isinstance(llm, list) else []:
+        name = item.get("name") if isinstance(item, dict) else None
+        if isinstance(name, str) and name.lower() not in seen:
+            seen.add(name.lower())
+            merged.append(item)
+    return merged[:limit]
+
+def generate_analytics(text: str, use_llm: bool = True) -> Dict[str, Any]:
+    """
+    Resume analytics from the LLM, with languages and domains merged from the
+    local skill scan. The scan alone is returned when the LLM fails or times out.
+    """
     if not text:
         return _get_default_analytics()
-    
+
+    # Deterministic skill scan: milliseconds, and the fallback when the LLM is unavailable
+    local = build_local_analytics(text)
+    if not use_llm:
+        return local
+
     prompt = f"""
     You are an expert Technical Interviewer and Resume Analyzer. 
     Analyze the following resume text and provide a structured JSON assessment.
@@ -74,26 +143,26 @@ def generate_analytics(text: str) -> Dict[str, Any]:
     - primary_languages should focus on programming languages.
     - core_domains should be high-level engineering domains.
     """
-    
+
     try:
-        data = generate_json(prompt)
+        data = generate_json(prompt, timeout=RESUME_LLM_TIMEOUT)
         
         # Validate/Sanitize critical fields to prevent frontend crash
-        if not isinstance(data, dict):
-            return _get_default_analytics()
+        if not isinstance(data, dict) or not data:
+            return local
             
         return {
             "experience_level": data.get("experience_level", "Junior"),
             "readiness_score": data.get("readiness_score", 50),
-            "primary_languages": data.get("primary_languages", []),
-            "core_domains": data.get("core_domains", []),
+            "primary_languages": _merge_ranked(local["primary_languages"], data.get("primary_languages")),
+            "core_domains": _merge_ranked(local["core_domains"], data.get("core_domains")),
             "strengths": data.get("strengths", []),
             "improvement_areas": data.get("improvement_areas", []),
             "recommended_focus": data.get("recommended_focus", [])
         }
     except Exception as e:
         print(f"Analytics Generation Failed: {e}")
-        return _get_default_analytics()
+        return local
 
 def _get_default_analytics():
     return {
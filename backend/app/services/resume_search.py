@@ -0,0 +1,116 @@
+"""
+Full-text search over candidate resumes.
+
+Postgres: a generated, weighted `resume_tsv` tsvector column with a GIN index.
+SQLite (single-node mode): an external-content FTS5 table kept in sync by triggers.
+"""
+import re
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+POSTGRES_DDL = [
+    """
+    ALTER TABLE candidates ADD COLUMN IF NOT EXISTS resume_tsv tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(resume_text, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_candidates_resume_tsv ON candidates USING GIN (resume_tsv)",
+]
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5(
+        name, resume_text, content='candidates', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS candidates_fts_ai AFTER INSERT ON candidates BEGIN
+        INSERT INTO candidates_fts(rowid, name, resume_text) VALUES (new.id, new.name, new.resume_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS candidates_fts_ad AFTER DELETE ON candidates BEGIN
+        INSERT INTO candidates_fts(candidates_fts, rowid, name, resume_text) VALUES ('delete', old.id, old.name, old.resume_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS candidates_fts_au AFTER UPDATE OF name, resume_text ON candidates BEGIN
+        INSERT INTO candidates_fts(candidates_fts, rowid, name, resume_text) VALUES ('delete', old.id, old.name, old.resume_text);
+        INSERT INTO candidates_fts(rowid, name, resume_text) VALUES (new.id, new.name, new.resume_text);
+    END
+    """,
+]
+
+POSTGRES_SEARCH = text("""
+    SELECT c.id, c.name, c.email, c.status, c.created_at, hits.rank,
+           ts_headline('english', coalesce(c.resume_text, ''), hits.query,
+                       'MaxFragments=2, MinWords=5, MaxWords=18, StartSel=<b>, StopSel=</b>') AS snippet
+    FROM (
+        SELECT c.id, ts_rank_cd(c.resume_tsv, q) AS rank, q AS query
+        FROM candidates c, websearch_to_tsquery('english', :query) q
+        WHERE c.resume_tsv @@ q AND c.user_id = :user_id
+        ORDER BY rank DESC, c.id DESC
+        LIMIT :limit OFFSET :offset
+    ) hits
+    JOIN candidates c ON c.id = hits.id
+    ORDER BY hits.rank DESC, c.id DESC
+""")
+
+SQLITE_SEARCH = text("""
+    SELECT c.id, c.name, c.email, c.status, c.created_at,
+           -bm25(candidates_fts, 10.0, 1.0) AS rank,
+           snippet(candidates_fts, 1, '<b>', '</b>', '...', 18) AS snippet
+    FROM candidates_fts
+    JOIN candidates c ON c.id = candidates_fts.rowid
+    WHERE candidates_fts MATCH :query AND c.user_id = :user_id
+    ORDER BY bm25(candidates_fts, 10.0, 1.0), c.id DESC
+    LIMIT :limit OFFSET :offset
+""")
+
+def install_search_index(conn):
+    """Creates the dialect's full-text index if missing. Takes a sync Connection."""
+    if conn.dialect.name == "postgresql":
+        for ddl in POSTGRES_DDL:
+            conn.execute(text(ddl))
+    elif conn.dialect.name == "sqlite":
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'candidates_fts'")
+        ).first()
+        for ddl in SQLITE_DDL:
+            conn.execute(text(ddl))
+        if not exists:
+            # Index rows that existed before the FTS table
+            conn.execute(text("INSERT INTO candidates_fts(candidates_fts) VALUES ('rebuild')"))
+
+def _fts5_query(query: str) -> str:
+    """Turns free text into an FTS5 AND-query of quoted prefix terms (no syntax errors on user input)."""
+    terms = re.findall(r"[\w+#.]+", query.lower())
+    return " ".join(f'"{term}"*' for term in terms)
+
+async def search_candidates(db: AsyncSession, user_id: int, query: str, limit: int = 20, offset: int = 0) -> list[dict]:
+    """Ranked matches among the resumes uploaded by user_id."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt, q = POSTGRES_SEARCH, query
+    elif dialect == "sqlite":
+        stmt, q = SQLITE_SEARCH, _fts5_query(query)
+        if not q:
+            return []
+    else:
+        raise NotImplementedError(f"Full-text search is not supported on {dialect}")
+
+    result = await db.execute(stmt, {"query": q, "user_id": user_id, "limit": limit, "offset": offset})
+    return [
+        {
+            "id": row.id,
+            "name": row.name,
+            "email": row.email,
+            "status": row.status,
+            "created_at": row.created_at,
+            "rank": round(float(row.rank), 4),
+            "snippet": row.snippet,
+        }
+        for row in result
+    ]
@@ -0,0 +1,135 @@
+import asyncio
+import glob
+import gzip
+import json
+import os
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from ..models import (
+    AnalyticsSnapshot, ArchivedSession, InterviewSession, MediaArtifact, MediaRef, Question, SessionEvent, SessionScore,
+    SessionSnapshot, TranscriptTurn,
+)
+
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "archive")
+ARCHIVE_RETENTION_DAYS = int(os.getenv("ARCHIVE_RETENTION_DAYS", "90"))
+AUDIO_DIR = "uploads/audio"
+
+# Child tables moved together with their session: (model, session id column).
+# Candidate-level question lookups only see live sessions (question_bank.live_candidate_questions).
+SESSION_CHILDREN = [
+    (Question, Question.session_id),
+    (AnalyticsSnapshot, AnalyticsSnapshot.interview_session_id),
+    (TranscriptTurn, TranscriptTurn.session_id),
+    (SessionScore, SessionScore.session_id),
+    (SessionEvent, SessionEvent.session_id),
+    (SessionSnapshot, SessionSnapshot.session_id),
+]
+
+def _row(obj) -> dict:
+    return {column.key: getattr(obj, column.key) for column in obj.__table__.columns}
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+def write_segment(records: list[dict]) -> tuple[str, list[tuple[int, int]]]:
+    """
+    Writes records as one gzip member per JSON line, so a single record can be read
+    back by seeking to its offset. The file is renamed into place once synced.
+    Returns the segment name and each record's (offset, length).
+    """
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    name = f"sessions-{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.jsonl.gz"
+    tmp_path = os.path.join(ARCHIVE_DIR, name + ".part")
+    positions = []
+    with open(tmp_path, "wb") as f:
+        for record in records:
+            member = gzip.compress((json.dumps(record, default=_json_default) + "\n").encode())
+            positions.append((f.tell(), len(member)))
+            f.write(member)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, os.path.join(ARCHIVE_DIR, name))
+    return name, positions
+
+def read_record(segment: str, offset: int, length: int) -> dict:
+    with open(os.path.join(ARCHIVE_DIR, segment), "rb") as f:
+        f.seek(offset)
+        return json.loads(gzip.decompress(f.read(length)))
+
+def prune_session_audio(session_ids: list[int]) -> int:
+    """Deletes recorded and synthesized audio of the sessions (files are named `{session_id}_...`)."""
+    removed = 0
+    for session_id in session_ids:
+        for path in glob.glob(os.path.join(AUDIO_DIR, f"{session_id}_*")):
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+async def archive_batch(db: AsyncSession, older_than_days: int = ARCHIVE_RETENTION_DAYS, batch_size: int = 200) -> tuple[int, int]:
+    """
+    Moves up to `batch_size` sessions completed more than `older_than_days` ago into
+    a new segment, indexes them in archived_sessions, deletes their hot rows and then
+    their audio. Returns (sessions archived, audio files removed); 0 sessions means done.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    result = await db.execute(
+        select(InterviewSession)
+        .where(InterviewSession.status == "completed", InterviewSession.end_time < cutoff)
+        .order_by(InterviewSession.id)
+        .limit(batch_size)
+    )
+    sessions = list(result.scalars().all())
+    if not sessions:
+        return 0, 0
+    ids = [s.id for s in sessions]
+
+    records = {s.id: {"session": _row(s)} for s in sessions}
+    for model, session_column in SESSION_CHILDREN:
+        rows = (await db.execute(select(model).where(session_column.in_(ids)))).scalars().all()
+        for row in rows:
+            records[getattr(row, session_column.key)].setdefault(model.__tablename__, []).append(_row(row))
+
+    # The segment is durable before any hot row is deleted
+    segment, positions = await asyncio.to_thread(write_segment, [records[i] for i in ids])
+
+    await db.execute(insert(ArchivedSession), [
+        {
+            "session_id": s.id, "candidate_id": s.candidate_id, "decision": s.decision, "score": s.score,
+            "start_time": s.start_time, "end_time": s.end_time,
+            "segment": segment, "offset": offset, "length": length,
+        }
+        for s, (offset, length) in zip(sessions, positions)
+    ])
+    for model, session_column in SESSION_CHILDREN:
+        await db.execute(delete(model).where(session_column.in_(ids)))
+    await db.execute(delete(InterviewSession).where(InterviewSession.id.in_(ids)))
+    await db.execute(delete(MediaRef).where(
+        MediaRef.artifact_id.in_(select(MediaArtifact.id).where(MediaArtifact.session_id.in_(ids)))
+    ))
+    await db.execute(delete(MediaArtifact).where(MediaArtifact.session_id.in_(ids)))
+    await db.commit()
+
+    removed = await asyncio.to_thread(prune_session_audio, ids)
+    return len(ids), removed
+
+async def load_archived_session(db: AsyncSession, session_id: int) -> dict | None:
+    """Full archived record of a session ({"session": ..., "<child table>": [...]}) or None."""
+    result = await db.execute(select(ArchivedSession).where(ArchivedSession.session_id == session_id))
+    entry = result.scalars().first()
+    if entry is None:
+        return None
+    return await asyncio.to_thread(read_record, entry.segment, entry.offset, entry.length)
+
+def archived_results(record: dict) -> dict | None:
+    scores = record.get(SessionScore.__tablename__)
+    if scores:
+        return scores[0]["results"]
+    return record["session"].get("breakdown")
@@ -0,0 +1,97 @@
+import copy
+import os
+from datetime import datetime
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from ..models import InterviewSession, SessionEvent, SessionSnapshot
+
+# A snapshot is taken every SNAPSHOT_EVERY state changes (session versions) and at
+# completion, so a rebuild replays at most that many rounds' worth of events
+SNAPSHOT_EVERY = int(os.getenv("SESSION_SNAPSHOT_EVERY", "4"))
+
+# Columns of interview_sessions that make up the event-sourced state
+STATE_FIELDS = ("current_round", "status", "round_data", "decision", "score", "end_time", "version")
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def session_state(session: InterviewSession) -> dict:
+    return {field: _json_value(getattr(session, field)) for field in STATE_FIELDS}
+
+def initial_state(payload: dict) -> dict:
+    return {
+        "current_round": "resume_analysis", "status": "active", "round_data": {},
+        "decision": None, "score": 0, "end_time": None, "version": 0,
+        **payload,
+    }
+
+def apply_event(state: dict | None, event_type: str, payload: dict) -> dict | None:
+    """Folds one event into the state (the reducer used for rebuilds and replays)."""
+    if event_type == "session_started":
+        return initial_state(payload)
+    if state is None:
+        return None # Session predates the event log
+    if event_type == "round_submitted":
+        state["round_data"] = {**state["round_data"], payload["round"]: payload["data"]}
+    if event_type in ("round_submitted", "round_advanced", "session_completed"):
+        # The payload carries the column values the change wrote
+        state.update({field: payload[field] for field in STATE_FIELDS if field in payload})
+    # voice_turn events are an audit/replay record; the transcript itself is in transcript_turns
+    return state
+
+def session_started_row(session_id: int, current_round: str, **initial) -> dict:
+    """Event row for a new session; `initial` holds state fields that differ from initial_state()."""
+    payload = {"current_round": current_round, **initial}
+    return {"session_id": session_id, "type": "session_started", "payload": payload}
+
+async def record_events(db: AsyncSession, rows: list[dict]):
+    """Appends events as one multi-row INSERT inside the caller's transaction."""
+    if rows:
+        await db.execute(insert(SessionEvent), rows)
+
+async def record_event(db: AsyncSession, session_id: int, event_type: str, payload: dict) -> int:
+    """Appends one event inside the caller's transaction and returns its id."""
+    payload = {key: _json_value(value) for key, value in payload.items()}
+    result = await db.execute(insert(SessionEvent).values(session_id=session_id, type=event_type, payload=payload))
+    return result.inserted_primary_key[0]
+
+async def record_state_change(db: AsyncSession, session: InterviewSession, event_type: str, payload: dict, force_snapshot: bool = False):
+    """
+    Appends a state-changing event (the payload carries the new column values) and
+    snapshots the session's state every SNAPSHOT_EVERY versions. The caller commits.
+    """
+    event_id = await record_event(db, session.id, event_type, payload)
+    if force_snapshot or (session.version or 0) % SNAPSHOT_EVERY == 0:
+        await db.execute(insert(SessionSnapshot).values(
+            session_id=session.id, last_event_id=event_id, state=session_state(session),
+        ))
+
+async def rebuild_state(db: AsyncSession, session_id: int) -> tuple[dict | None, int]:
+    """
+    Session state from the latest snapshot plus the events after it.
+    Returns (state, events replayed); the state is None for sessions without a log.
+    """
+    result = await db.execute(
+        select(SessionSnapshot)
+        .where(SessionSnapshot.session_id == session_id)
+        .order_by(SessionSnapshot.last_event_id.desc())
+        .limit(1)
+    )
+    snapshot = result.scalars().first()
+    state = copy.deepcopy(snapshot.state) if snapshot else None
+    after = snapshot.last_event_id if snapshot else 0
+
+    result = await db.execute(
+        select(SessionEvent.type, SessionEvent.payload)
+        .where(SessionEvent.session_id == session_id, SessionEvent.id > after)
+        .order_by(SessionEvent.id)
+    )
+    events = result.all()
+    for event_type, payload in events:
+        state = apply_event(state, event_type, payload)
+    return state, len(events)
+
+async def session_events(db: AsyncSession, session_id: int) -> list[SessionEvent]:
+    result = await db.execute(select(SessionEvent).where(SessionEvent.session_id == session_id).order_by(SessionEvent.id))
+    return list(result.scalars().all())
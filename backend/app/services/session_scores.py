@@ -0,0 +1,50 @@
+from ..models import InterviewSession, SessionScore
+from .unit_of_work import InterviewUnitOfWork
+from .results_aggregator import calculate_final_results, score_mcq, assemble_results
+
+def _store(uow: InterviewUnitOfWork, score: SessionScore | None, session: InterviewSession, results: dict) -> SessionScore:
+    if score is None:
+        score = SessionScore(session_id=session.id, candidate_id=session.candidate_id)
+        uow.add(score)
+        uow.remember_session_score(score)
+    mcq = results["scores"]["oa_mcq"]
+    score.mcq_score = mcq["score"]
+    score.mcq_total = mcq["total"]
+    score.coding_passed = results["scores"]["oa_coding"] == 100
+    score.overall_status = results["overall_status"]
+    score.results = results
+    return score
+
+async def rebuild_session_score(uow: InterviewUnitOfWork, session: InterviewSession) -> SessionScore:
+    """Recomputes the score record from round_data (legacy sessions, repairs). The caller commits."""
+    results = await calculate_final_results(session.id, uow)
+    return _store(uow, await uow.get_session_score(session.id), session, results)
+
+async def ensure_session_score(uow: InterviewUnitOfWork, session: InterviewSession) -> SessionScore:
+    return await uow.get_session_score(session.id) or await rebuild_session_score(uow, session)
+
+async def apply_round_submission(uow: InterviewUnitOfWork, session: InterviewSession, round_name: str, data: dict):
+    """
+    Folds one submitted round into the session's score record. Only the round that
+    changed is rescored; the question set is loaded for MCQ submissions only.
+    The caller commits.
+    """
+    score = await uow.get_session_score(session.id)
+    if score is None:
+        await rebuild_session_score(uow, session)
+        return
+
+    mcq_score, mcq_total = score.mcq_score, score.mcq_total
+    questions_analysis = (score.results or {}).get("questions_analysis", [])
+    coding_passed = score.coding_passed
+
+    if round_name == "oa_mcq":
+        questions = await uow.get_candidate_questions(session.candidate_id)
+        mcq_score, mcq_total, questions_analysis = score_mcq(questions, data.get("answers", {}))
+    elif round_name == "oa_coding":
+        coding_passed = bool(data.get("passed", False))
+    else:
+        return
+
+    results = assemble_results(session.id, session.candidate_id, mcq_score, mcq_total, questions_analysis, coding_passed)
+    _store(uow, score, session, results)
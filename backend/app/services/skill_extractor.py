@@ -0,0 +1,203 @@
+"""
+Deterministic skill extraction.
+
+A curated taxonomy of languages, frameworks/tools and engineering domains is
+compiled once into an Aho-Corasick automaton, so a resume is scanned for every
+alias in a single linear pass. Its `primary_languages` / `core_domains` are merged
+into the LLM analysis, and it is the whole analysis when Gemini fails or times out.
+"""
+import re
+from collections import Counter, deque
+from typing import Dict, Any, List, Tuple
+
+LANGUAGES = {
+    "Python": ["python", "python3", "pandas", "numpy"],
+    "JavaScript": ["javascript", "ecmascript", "es6", "node.js", "nodejs"],
+    "TypeScript": ["typescript"],
+    "Java": ["java", "j2ee"],
+    "C++": ["c++", "cpp"],
+    "C": ["c programming", "ansi c", "embedded c"],
+    "C#": ["c#", "csharp", ".net", "asp.net"],
+    "Go": ["golang", "go lang"],
+    "Rust": ["rust"],
+    "Kotlin": ["kotlin"],
+    "Swift": ["swift", "swiftui"],
+    "Ruby": ["ruby", "rails", "ruby on rails"],
+    "PHP": ["php", "laravel"],
+    "Scala": ["scala"],
+    "R": ["r programming", "rstudio"],
+    "SQL": ["sql", "mysql", "postgresql", "postgres", "sqlite", "pl/sql", "t-sql"],
+    "Dart": ["dart", "flutter"],
+    "Bash": ["bash", "shell scripting"],
+}
+
+# Frameworks/tools count as evidence for a domain (and sometimes a language)
+FRAMEWORKS = {
+    "React": ("Frontend", "JavaScript", ["react", "react.js", "reactjs", "next.js", "nextjs", "redux"]),
+    "Angular": ("Frontend", "TypeScript", ["angular", "angularjs"]),
+    "Vue": ("Frontend", "JavaScript", ["vue", "vue.js", "vuejs", "nuxt"]),
+    "HTML/CSS": ("Frontend", None, ["html", "html5", "css", "css3", "tailwind", "tailwindcss", "sass", "bootstrap"]),
+    "Django": ("Backend", "Python", ["django"]),
+    "Flask": ("Backend", "Python", ["flask"]),
+    "FastAPI": ("Backend", "Python", ["fastapi"]),
+    "Express": ("Backend", "JavaScript", ["express.js", "expressjs"]),
+    "Spring": ("Backend", "Java", ["spring boot", "springboot", "spring framework", "hibernate"]),
+    "GraphQL": ("Backend", None, ["graphql"]),
+    "Docker": ("DevOps", None, ["docker", "docker-compose", "containers"]),
+    "Kubernetes": ("DevOps", None, ["kubernetes", "k8s", "helm"]),
+    "Terraform": ("DevOps", None, ["terraform", "ansible"]),
+    "CI/CD": ("DevOps", None, ["ci/cd", "jenkins", "github actions", "gitlab ci", "circleci"]),
+    "AWS": ("Cloud", None, ["aws", "amazon web services", "ec2", "s3", "aws lambda"]),
+    "GCP": ("Cloud", None, ["gcp", "google cloud", "bigquery"]),
+    "Azure": ("Cloud", None, ["azure"]),
+    "TensorFlow": ("Machine Learning", "Python", ["tensorflow", "keras"]),
+    "PyTorch": ("Machine Learning", "Python", ["pytorch"]),
+    "scikit-learn": ("Machine Learning", "Python", ["scikit-learn", "sklearn"]),
+    "Spark": ("Data Engineering", None, ["spark", "pyspark", "hadoop", "airflow", "kafka"]),
+    "MongoDB": ("Databases", None, ["mongodb", "mongo", "redis", "cassandra", "dynamodb"]),
+    "Android": ("Mobile", "Kotlin", ["android", "jetpack compose"]),
+    "iOS": ("Mobile", "Swift", ["ios", "xcode"]),
+    "React Native": ("Mobile", "JavaScript", ["react native"]),
+}
+
+DOMAINS = {
+    "Backend": ["backend", "back-end", "back end", "rest api", "restful", "microservices", "api development", "server-side"],
+    "Frontend": ["frontend", "front-end", "front end", "ui development", "responsive design", "web development"],
+    "Full Stack": ["full stack", "full-stack", "fullstack", "mern", "mean stack"],
+    "DevOps": ["devops", "sre", "site reliability", "infrastructure as code"],
+    "Cloud": ["cloud computing", "cloud", "serverless"],
+    "Machine Learning": ["machine learning", "deep learning", "neural network", "nlp", "computer vision", "artificial intelligence", "llm"],
+    "Data Engineering": ["data engineering", "etl", "data pipeline", "data warehouse", "big data"],
+    "Data Science": ["data science", "data analysis", "statistics", "data visualization", "tableau", "power bi"],
+    "Databases": ["database", "dbms", "query optimization", "indexing"],
+    "Mobile": ["mobile development", "mobile app"],
+    "Security": ["cybersecurity", "information security", "application security", "network security", "penetration testing", "owasp", "cryptography"],
+    "Systems": ["operating systems", "distributed systems", "multithreading", "concurrency", "embedded", "linux kernel"],
+    "DSA": ["data structures", "algorithms", "competitive programming", "leetcode", "codeforces", "codechef"],
+}
+
+class AhoCorasick:
+    """Multi-pattern matcher: finds all (start, end, payload) for the added patterns in O(n + matches)."""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, Any]]] = [[]]
+
+    def add(self, pattern: str, payload: Any):
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(pattern), payload))
+
+    def build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+        return self
+
+    def iter(self, text: str):
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, payload in self._out[node]:
+                yield i - length + 1, i + 1, payload
+
+def _is_boundary(text: str, start: int, end: int) -> bool:
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    return not before.isalnum() and not (after.isalnum() or after in "+#")
+
+def _compile() -> AhoCorasick:
+    automaton = AhoCorasick()
+    for name, aliases in LANGUAGES.items():
+        for alias in aliases:
+            automaton.add(alias, ("language", name))
+    for name, (domain, language, aliases) in FRAMEWORKS.items():
+        for alias in aliases:
+            automaton.add(alias, ("framework", name))
+    for name, aliases in DOMAINS.items():
+        for alias in aliases:
+            automaton.add(alias, ("domain", name))
+    return automaton.build()
+
+_AUTOMATON = _compile()
+
+def extract_skills(text: str) -> Dict[str, Any]:
+    """Returns primary_languages / core_domains in the analytics shape, plus matched frameworks."""
+    lowered = (text or "").lower()
+    languages: Counter = Counter()
+    domains: Counter = Counter()
+    frameworks: Counter = Counter()
+
+    for start, end, (kind, name) in _AUTOMATON.iter(lowered):
+        if not _is_boundary(lowered, start, end):
+            continue
+        if kind == "language":
+            languages[name] += 1
+        elif kind == "domain":
+            domains[name] += 1
+        else:
+            frameworks[name] += 1
+
+    # Frameworks are evidence for their domain and language
+    for name, hits in frameworks.items():
+        domain, language, _ = FRAMEWORKS[name]
+        domains[domain] += hits
+        if language:
+            languages[language] += hits
+
+    return {
+        "primary_languages": [
+            {"name": name, "confidence": min(100, 40 + 15 * (hits - 1))}
+            for name, hits in languages.most_common(5)
+        ],
+        "core_domains": [
+            {"name": name, "coverage": min(100, 30 + 10 * (hits - 1))}
+            for name, hits in domains.most_common(5)
+        ],
+        "frameworks": [name for name, _ in frameworks.most_common(8)],
+    }
+
+_YEARS_RE = re.compile(r"(\d{1,2})\+?\s*(?:years|yrs)")
+
+def build_local_analytics(text: str) -> Dict[str, Any]:
+    """Full analytics payload computed without the LLM."""
+    skills = extract_skills(text)
+    years = max((int(y) for y in _YEARS_RE.findall((text or "").lower())), default=0)
+    level = "Senior" if years >= 6 else ("Mid" if years >= 3 else "Junior")
+
+    breadth = len(skills["primary_languages"]) + len(skills["core_domains"]) + len(skills["frameworks"])
+    readiness = min(90, 20 + 5 * breadth)
+
+    top_languages = [lang["name"] for lang in skills["primary_languages"][:3]]
+    top_domains = [domain["name"] for domain in skills["core_domains"][:3]]
+    strengths = [f"{name} experience" for name in top_languages] + [f"{name} exposure" for name in top_domains]
+
+    gaps = [name for name in ("DSA", "Systems", "Databases") if name not in top_domains]
+
+    return {
+        "experience_level": level,
+        "readiness_score": readiness,
+        "primary_languages": skills["primary_languages"],
+        "core_domains": skills["core_domains"],
+        "strengths": strengths[:3] or ["Resume parsed, no recognised skills"],
+        "improvement_areas": [f"Show more {name} depth" for name in gaps][:3] or ["Quantify project impact"],
+        "recommended_focus": (gaps or ["System Design"])[:3],
+    }
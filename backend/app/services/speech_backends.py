@@ -0,0 +1,146 @@
+import asyncio
+import hashlib
+import io
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import AsyncIterator
+import google.generativeai as genai
+from gtts import gTTS
+
+SPEECH_BACKEND = os.getenv("SPEECH_BACKEND", "gemini")
+
+class SpeechBackend(ABC):
+    """
+    The three speech stages of a voice turn, which every backend implements. `prepare_audio` makes the recorded
+    utterance available to the model (STT input), `stream_reply` yields the reply
+    text as it is generated and `synthesize` turns one sentence into mp3 bytes
+    (blocking; the pipeline runs it in a worker thread). `voice` identifies the TTS
+    output in cache keys.
+    """
+
+    name = "base"
+    voice = "base"
+
+    @abstractmethod
+    async def prepare_audio(self, audio_path: str):
+        ...
+
+    @abstractmethod
+    async def stream_reply(self, prompt: str, audio) -> AsyncIterator[str]:
+        ...
+
+    @abstractmethod
+    def synthesize(self, text: str) -> bytes:
+        ...
+
+    def remote_id(self, audio) -> str | None:
+        """Provider-side name of a prepared recording, or None if nothing is stored remotely."""
+        return None
+
+    async def delete_remote(self, remote_id: str):
+        pass
+
+    async def release_audio(self, audio):
+        """Deletes the provider's copy of the recording once the turn is answered."""
+        remote_id = self.remote_id(audio)
+        if remote_id is not None:
+            await self.delete_remote(remote_id)
+
+class GeminiSpeechBackend(SpeechBackend):
+    """Gemini multimodal reply over the uploaded recording, gTTS for speech."""
+
+    name = "gemini"
+
+    def __init__(self):
+        self.model_name = os.getenv("VOICE_MODEL", "gemini-1.5-flash")
+        self.lang = os.getenv("VOICE_LANG", "en")
+        self.tld = os.getenv("VOICE_TLD", "com") # gTTS accent
+        self.voice = f"gtts:{self.lang}:{self.tld}"
+
+    async def prepare_audio(self, audio_path: str):
+        return await asyncio.to_thread(genai.upload_file, audio_path)
+
+    def remote_id(self, audio) -> str | None:
+        return audio.name
+
+    async def delete_remote(self, remote_id: str):
+        # Uploaded files otherwise stay in the project's file storage for 48 hours
+        await asyncio.to_thread(genai.delete_file, remote_id)
+
+    async def stream_reply(self, prompt: str, audio) -> AsyncIterator[str]:
+        model = genai.GenerativeModel(self.model_name)
+        response = await model.generate_content_async([prompt, audio], stream=True)
+        async for chunk in response:
+            yield chunk.text
+
+    def synthesize(self, text: str) -> bytes:
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=self.lang, tld=self.tld).write_to_fp(buffer)
+        return buffer.getvalue()
+
+# One silent MPEG-1 Layer III frame (32 kbit/s, 44.1 kHz, ~26 ms)
+_SILENT_MP3_FRAME = b"\xff\xfb\x10\x64" + bytes(100)
+_LOCAL_REPLIES = [
+    "Thanks, that makes sense. Can you walk me through how you would test it?",
+    "Interesting approach. What would change if the traffic grew ten times?",
+    "Good. How would you handle a failure in that component?",
+    "Can you elaborate on the trade-offs you considered?",
+    "Let's move on. How would you design the data model for this?",
+]
+
+class LocalSpeechBackend(SpeechBackend):
+    """
+    Offline stand-in for load tests and CI: no network, deterministic output.
+    The reply is picked from a fixed set by hashing the recording and prompt and
+    streamed word by word; speech is silent mp3 whose length follows the text.
+    Latencies (ms) are configurable to model the real providers.
+    """
+
+    name = "local"
+    voice = "local:silent"
+
+    def __init__(self):
+        self.upload_ms = float(os.getenv("SPEECH_LOCAL_UPLOAD_MS", "50"))
+        self.first_token_ms = float(os.getenv("SPEECH_LOCAL_FIRST_TOKEN_MS", "200"))
+        self.token_ms = float(os.getenv("SPEECH_LOCAL_TOKEN_MS", "20"))
+        self.tts_ms = float(os.getenv("SPEECH_LOCAL_TTS_MS", "100"))
+
+    async def prepare_audio(self, audio_path: str):
+        await asyncio.sleep(self.upload_ms / 1000)
+        return await asyncio.to_thread(self._digest, audio_path)
+
+    @staticmethod
+    def _digest(audio_path: str) -> str:
+        with open(audio_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    async def stream_reply(self, prompt: str, audio) -> AsyncIterator[str]:
+        seed = int(hashlib.sha256(f"{audio}|{prompt}".encode()).hexdigest(), 16)
+        reply = _LOCAL_REPLIES[seed % len(_LOCAL_REPLIES)]
+        await asyncio.sleep(self.first_token_ms / 1000)
+        words = reply.split(" ")
+        for i, word in enumerate(words):
+            if i:
+                await asyncio.sleep(self.token_ms / 1000)
+            yield word + (" " if i < len(words) - 1 else "")
+
+    def synthesize(self, text: str) -> bytes:
+        time.sleep(self.tts_ms / 1000)
+        # ~60 ms of audio per character, like natural speech
+        return _SILENT_MP3_FRAME * max(1, len(text) * 60 // 26)
+
+BACKENDS = {
+    "gemini": GeminiSpeechBackend,
+    "local": LocalSpeechBackend,
+}
+
+_backend: SpeechBackend | None = None
+
+def get_speech_backend() -> SpeechBackend:
+    global _backend
+    if _backend is None:
+        if SPEECH_BACKEND not in BACKENDS:
+            raise ValueError(f"Unknown SPEECH_BACKEND '{SPEECH_BACKEND}', expected one of: {', '.join(BACKENDS)}")
+        _backend = BACKENDS[SPEECH_BACKEND]()
+    return _backend
@@ -0,0 +1,50 @@
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from ..models import InterviewSession, TranscriptTurn
+
+APPEND_RETRIES = 3
+
+async def append_turns(db: AsyncSession, session: InterviewSession, turns: list[tuple[str, str]]) -> int:
+    """
+    Appends (role, content) turns to the session's current round and flushes them.
+    Cost is O(turns) regardless of how long the interview already is. Concurrent
+    appends racing for the same seq hit the unique index and retry with the next one.
+    Returns the seq of the last appended turn; the caller commits.
+    """
+    round_name = session.current_round
+    for attempt in range(APPEND_RETRIES):
+        result = await db.execute(
+            select(func.coalesce(func.max(TranscriptTurn.seq), 0))
+            .where(TranscriptTurn.session_id == session.id, TranscriptTurn.round == round_name)
+        )
+        last_seq = result.scalar_one()
+        rows = [
+            TranscriptTurn(session_id=session.id, round=round_name, seq=last_seq + i, role=role, content=content)
+            for i, (role, content) in enumerate(turns, start=1)
+        ]
+        try:
+            async with db.begin_nested():
+                db.add_all(rows)
+        except IntegrityError:
+            if attempt == APPEND_RETRIES - 1:
+                raise
+            continue
+        return last_seq + len(rows)
+
+async def recent_turns(db: AsyncSession, session: InterviewSession, limit: int = 5) -> list[dict]:
+    """Last `limit` turns of the current round in chronological order (served by the (session, round, seq) index)."""
+    result = await db.execute(
+        select(TranscriptTurn.role, TranscriptTurn.content)
+        .where(TranscriptTurn.session_id == session.id, TranscriptTurn.round == session.current_round)
+        .order_by(TranscriptTurn.seq.desc())
+        .limit(limit)
+    )
+    turns = [{"role": role, "content": content} for role, content in result.all()]
+    if turns:
+        return turns[::-1]
+
+    # Sessions started before transcripts moved out of round_data
+    legacy = (session.round_data or {}).get(session.current_round, {})
+    return legacy.get("transcript", [])[-limit:] if isinstance(legacy, dict) else []
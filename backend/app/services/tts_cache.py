@@ -0,0 +1,163 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "uploads/tts_cache")
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+# How long the sentences of a returned reply are kept from eviction if it is never fetched
+TTS_PIN_SECONDS = float(os.getenv("TTS_PIN_SECONDS", "300"))
+
+def normalize_text(text: str) -> str:
+    """Spoken output does not change with case or spacing, so neither does the cache key."""
+    return " ".join(unicodedata.normalize("NFKC", text).split()).lower()
+
+class TTSCache:
+    """
+    Content-addressed store of synthesized speech: `{sha256(normalized text|voice)}.mp3`
+    in TTS_CACHE_DIR. Entries are evicted least recently used first once the directory
+    exceeds its byte budget; access order survives restarts through file mtimes.
+    Pinned entries (replies returned but not fetched yet) are skipped by eviction.
+    Thread safe, since synthesis runs in worker threads.
+    """
+
+    def __init__(self, cache_dir: str = TTS_CACHE_DIR, max_bytes: int = TTS_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] | None = None # key -> size, least recently used first
+        self._bytes = 0
+        self._pins: dict[str, tuple[int, float]] = {} # key -> (pin count, expiry)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, text: str, voice: str) -> str:
+        return hashlib.sha256(f"{voice}|{normalize_text(text)}".encode()).hexdigest()
+
+    def filename(self, key: str) -> str:
+        return f"{key}.mp3"
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, self.filename(key))
+
+    def _load_index(self):
+        # Called with the lock held
+        if self._entries is not None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".mp3"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        self._entries = OrderedDict((key, size) for _, key, size in sorted(files))
+        self._bytes = sum(self._entries.values())
+
+    def get(self, key: str, count: bool = True) -> bytes | None:
+        """Entry bytes (marking it recently used) or None; count=False leaves the hit/miss stats alone."""
+        with self._lock:
+            self._load_index()
+            if key not in self._entries:
+                if count:
+                    self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if count:
+                self.hits += 1
+        try:
+            os.utime(self.path(key))
+            with open(self.path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self._forget(key)
+            return None
+
+    def put(self, key: str, data: bytes):
+        with self._lock:
+            self._load_index()
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".part")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path(key))
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = len(data)
+                self._bytes += len(data)
+            self._evict()
+
+    def pin(self, keys: list[str], seconds: float = TTS_PIN_SECONDS):
+        """Keeps the entries from eviction until unpinned or for `seconds`."""
+        expires = time.monotonic() + seconds
+        with self._lock:
+            for key in keys:
+                count, _ = self._pins.get(key, (0, 0))
+                self._pins[key] = (count + 1, expires)
+
+    def unpin(self, keys: list[str]):
+        with self._lock:
+            for key in keys:
+                count, expires = self._pins.pop(key, (0, 0))
+                if count > 1:
+                    self._pins[key] = (count - 1, expires)
+
+    def _pinned(self, key: str, now: float) -> bool:
+        pin = self._pins.get(key)
+        if pin is None:
+            return False
+        if pin[1] <= now:
+            del self._pins[key] # Never fetched
+            return False
+        return True
+
+    def _forget(self, key: str):
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._bytes -= size
+
+    def _evict(self):
+        # Called with the lock held; the newest entry is never evicted
+        now = time.monotonic()
+        for key in list(self._entries)[:-1]:
+            if self._bytes <= self.max_bytes:
+                break
+            if self._pinned(key, now):
+                continue
+            self._forget(key)
+            self.evictions += 1
+            try:
+                os.remove(self.path(key))
+            except FileNotFoundError:
+                pass
+
+    def get_or_synthesize(self, text: str, voice: str, synthesize) -> tuple[str, bytes]:
+        """Returns (key, mp3 bytes), calling synthesize(text) only on a miss."""
+        key = self.key(text, voice)
+        data = self.get(key)
+        if data is None:
+            data = synthesize(text)
+            self.put(key, data)
+        return key, data
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries or {}),
+                "pinned": len(self._pins),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else None,
+                "evictions": self.evictions,
+            }
+
+tts_cache = TTSCache()
@@ -0,0 +1,73 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from ..database import get_db, get_read_db, current_query_count
+from ..models import InterviewSession, Candidate, Question, SessionScore
+from .question_bank import live_candidate_questions
+
+class InterviewUnitOfWork:
+    """
+    Request-scoped repository for the interview aggregate.
+    Each session/candidate/question set is loaded at most once per request,
+    services mutate the loaded objects and the request commits once.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._sessions: dict[int, InterviewSession] = {}
+        self._candidates: dict[int, Candidate] = {}
+        self._questions: dict[tuple[str, int], list[Question]] = {}
+        self._scores: dict[int, SessionScore | None] = {}
+        self._start_count = current_query_count() or 0
+
+    async def get_session(self, session_id: int) -> InterviewSession | None:
+        if session_id not in self._sessions:
+            result = await self.db.execute(select(InterviewSession).where(InterviewSession.id == session_id))
+            session = result.scalars().first()
+            if session is None:
+                return None
+            self._sessions[session_id] = session
+        return self._sessions[session_id]
+
+    async def get_candidate(self, candidate_id: int) -> Candidate | None:
+        if candidate_id not in self._candidates:
+            result = await self.db.execute(select(Candidate).where(Candidate.id == candidate_id))
+            candidate = result.scalars().first()
+            if candidate is None:
+                return None
+            self._candidates[candidate_id] = candidate
+        return self._candidates[candidate_id]
+
+    async def get_candidate_questions(self, candidate_id: int) -> list[Question]:
+        key = ("candidate", candidate_id)
+        if key not in self._questions:
+            result = await self.db.execute(live_candidate_questions(candidate_id))
+            self._questions[key] = list(result.scalars().all())
+        return self._questions[key]
+
+    async def get_session_score(self, session_id: int) -> SessionScore | None:
+        if session_id not in self._scores:
+            result = await self.db.execute(select(SessionScore).where(SessionScore.session_id == session_id))
+            self._scores[session_id] = result.scalars().first()
+        return self._scores[session_id]
+
+    def remember_session_score(self, score: SessionScore):
+        self._scores[score.session_id] = score
+
+    def add(self, obj):
+        self.db.add(obj)
+
+    async def commit(self):
+        await self.db.commit()
+
+    @property
+    def query_count(self) -> int:
+        """Statements executed since this unit of work was created (needs a QueryCounter in scope)."""
+        return (current_query_count() or 0) - self._start_count
+
+async def get_uow(db: AsyncSession = Depends(get_db)) -> InterviewUnitOfWork:
+    return InterviewUnitOfWork(db)
+
+async def get_read_uow(db: AsyncSession = Depends(get_read_db)) -> InterviewUnitOfWork:
+    """Unit of work for read-only handlers; may be served by the read replica."""
+    return InterviewUnitOfWork(db)
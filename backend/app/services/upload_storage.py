@@ -0,0 +1,129 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from fastapi import UploadFile
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_RESUME_BYTES = int(os.getenv("MAX_RESUME_BYTES", 10 * 1024 * 1024))
+MAX_AUDIO_BYTES = int(os.getenv("MAX_AUDIO_BYTES", 25 * 1024 * 1024))
+
+class UploadTooLarge(Exception):
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Upload exceeds the {max_bytes} byte limit")
+        self.max_bytes = max_bytes
+
+@dataclass
+class StoredUpload:
+    path: str
+    sha256: str
+    size: int
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+async def save_upload(
+    upload: UploadFile,
+    upload_dir: str,
+    max_bytes: int,
+    prefix: str = "",
+    suffix: str = "",
+) -> StoredUpload:
+    """
+    Streams an upload to disk in chunks without blocking the event loop.
+    The sha256 is computed in the same pass, the data lands in a temp file first
+    and is then renamed atomically to `{prefix}{sha256}{suffix}`, so concurrent
+    uploads never overwrite each other's partial data.
+    Raises UploadTooLarge as soon as more than `max_bytes` have been received.
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+
+    os.makedirs(upload_dir, exist_ok=True)
+    fd, tmp_path = await asyncio.to_thread(tempfile.mkstemp, dir=upload_dir, suffix=".part")
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                digest.update(chunk)
+                await asyncio.to_thread(buffer.write, chunk)
+
+        sha256 = digest.hexdigest()
+        path = os.path.join(upload_dir, f"{prefix}{sha256}{suffix}")
+        await asyncio.to_thread(os.replace, tmp_path, path)
+    except BaseException:
+        await asyncio.to_thread(_remove_quietly, tmp_path)
+        raise
+
+    return StoredUpload(path=path, sha256=sha256, size=size)
+
+def store_bytes(data: bytes, upload_dir: str, prefix: str = "", suffix: str = "") -> StoredUpload:
+    """Synchronous counterpart of save_upload for scripts and worker processes."""
+    os.makedirs(upload_dir, exist_ok=True)
+    sha256 = hashlib.sha256(data).hexdigest()
+    path = os.path.join(upload_dir, f"{prefix}{sha256}{suffix}")
+
+    fd, tmp_path = tempfile.mkstemp(dir=upload_dir, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            buffer.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        _remove_quietly(tmp_path)
+        raise
+
+    return StoredUpload(path=path, sha256=sha256, size=len(data))
+
+class IncrementalUpload:
+    """
+    Receives an upload as a sequence of chunks (e.g. WebSocket audio frames) with the
+    same guarantees as save_upload: temp file, running sha256, size limit, atomic
+    rename to `{prefix}{sha256}{suffix}` on finish().
+    """
+
+    def __init__(self, upload_dir: str, max_bytes: int, prefix: str = "", suffix: str = ""):
+        self.upload_dir = upload_dir
+        self.max_bytes = max_bytes
+        self.prefix = prefix
+        self.suffix = suffix
+        self.size = 0
+        self._digest = hashlib.sha256()
+        self._file = None
+        self._tmp_path = None
+
+    async def write(self, chunk: bytes):
+        if self.size + len(chunk) > self.max_bytes:
+            await self.abort()
+            raise UploadTooLarge(self.max_bytes)
+        if self._file is None:
+            os.makedirs(self.upload_dir, exist_ok=True)
+            fd, self._tmp_path = await asyncio.to_thread(tempfile.mkstemp, dir=self.upload_dir, suffix=".part")
+            self._file = os.fdopen(fd, "wb")
+        self.size += len(chunk)
+        self._digest.update(chunk)
+        await asyncio.to_thread(self._file.write, chunk)
+
+    async def finish(self) -> StoredUpload:
+        if self._file is None:
+            raise ValueError("No data received")
+        self._file.close()
+        sha256 = self._digest.hexdigest()
+        path = os.path.join(self.upload_dir, f"{self.prefix}{sha256}{self.suffix}")
+        await asyncio.to_thread(os.replace, self._tmp_path, path)
+        self._file = None
+        return StoredUpload(path=path, sha256=sha256, size=self.size)
+
+    async def abort(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            await asyncio.to_thread(_remove_quietly, self._tmp_path)
@@ -0,0 +1,272 @@
+import asyncio
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from ..database import run_write
+from ..models import Candidate, InterviewSession
+from .transcript_store import append_turns, recent_turns
+from .tts_cache import tts_cache
+from .speech_backends import SpeechBackend, get_speech_backend
+from .session_events import record_event
+from .media_lifecycle import MediaQuotaExceeded, over_quota, remove_files, track_artifact, usage_subquery
+
+TTS_CONCURRENCY = int(os.getenv("TTS_CONCURRENCY", "2"))
+AUDIO_DIR = "uploads/audio"
+
+VOICE_PROMPT = (
+    "You are an expert technical interviewer. "
+    "You are conducting a spoken interview. "
+    "Listen to the candidate's audio input. "
+    "Respond naturally as an interviewer. "
+    "If they answered a question, acknowledge it and ask a follow-up or move to the next topic. "
+    "Keep your response concise (1-3 sentences) suitable for spoken conversation. "
+)
+
+class StageTimer:
+    """Per-stage wall clock timings of one voice turn, in milliseconds."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: dict[str, float] = {}
+
+    async def measure(self, name: str, awaitable):
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.stages[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    def mark(self, name: str):
+        """Records the time since the turn started (e.g. time to first sentence)."""
+        self.stages.setdefault(name, round((time.perf_counter() - self.started) * 1000, 1))
+
+    def as_dict(self) -> dict:
+        return {**self.stages, "total": round((time.perf_counter() - self.started) * 1000, 1)}
+
+    def server_timing(self) -> str:
+        return ", ".join(f"{name};dur={ms}" for name, ms in self.as_dict().items())
+
+class SentenceSplitter:
+    """Cuts streamed LLM text into sentences so TTS can start before the reply is complete."""
+
+    BOUNDARY = re.compile(r'(?<=[.!?])["\')\]]*\s+')
+    MAX_CHARS = 240
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, text: str) -> list[str]:
+        self._buffer += text
+        sentences = []
+        while True:
+            match = self.BOUNDARY.search(self._buffer)
+            if match is None:
+                break
+            sentences.append(self._buffer[:match.end()].strip())
+            self._buffer = self._buffer[match.end():]
+        # Run-on text: cut at the last space so the first audio is not held back
+        if len(self._buffer) > self.MAX_CHARS and " " in self._buffer:
+            cut = self._buffer.rfind(" ", 0, self.MAX_CHARS)
+            sentences.append(self._buffer[:cut].strip())
+            self._buffer = self._buffer[cut:]
+        return [s for s in sentences if s]
+
+    def flush(self) -> list[str]:
+        rest, self._buffer = self._buffer.strip(), ""
+        return [rest] if rest else []
+
+def speak_sentence(backend: SpeechBackend, text: str) -> tuple[str, bytes]:
+    """TTS through the content-addressed cache; common lines are synthesized once. Returns (cache key, mp3)."""
+    return tts_cache.get_or_synthesize(text, backend.voice, backend.synthesize)
+
+HISTORY_TURNS = 5
+
+@dataclass
+class VoiceContext:
+    """Session and recent transcript a voice turn is answered in (kept in memory by the WebSocket transport)."""
+    session: InterviewSession | None
+    history: list[dict] = field(default_factory=list)
+    owner_id: int = 0 # Recruiter the recordings count against
+    media_bytes: int = 0 # Their stored media, checked against MEDIA_QUOTA_BYTES
+
+    def prompt_context(self) -> str:
+        return "\n".join(f"{msg['role']}: {msg['content']}" for msg in self.history[-HISTORY_TURNS:])
+
+    def record(self, turns: list[tuple[str, str]]):
+        self.history.extend({"role": role, "content": content} for role, content in turns)
+        del self.history[:-HISTORY_TURNS]
+
+@dataclass
+class VoiceTurn:
+    context: VoiceContext | None = None
+    text: str = ""
+    audio_keys: list[str] = field(default_factory=list) # TTS cache entries of the reply's sentences, in order
+    timer: StageTimer = field(default_factory=StageTimer)
+    remote_pending: str | None = None # Provider copy of the recording that could not be deleted
+
+async def load_voice_context(db: AsyncSession, session_id: int) -> VoiceContext:
+    owner_id = func.coalesce(Candidate.user_id, 0)
+    row = (await db.execute(
+        select(InterviewSession, owner_id, usage_subquery(owner_id))
+        .outerjoin(Candidate, Candidate.id == InterviewSession.candidate_id)
+        .where(InterviewSession.id == session_id)
+    )).first()
+    if row is None:
+        return VoiceContext(session=None)
+    session, owner, media_bytes = row
+    return VoiceContext(
+        session=session,
+        history=await recent_turns(db, session, limit=HISTORY_TURNS),
+        owner_id=owner,
+        media_bytes=media_bytes,
+    )
+
+async def voice_turn_events(
+    audio_path: str,
+    context: VoiceContext | Awaitable[VoiceContext],
+    turn: VoiceTurn | None = None,
+) -> AsyncIterator[dict]:
+    """
+    Runs one voice turn as a pipeline and yields events as they become ready:
+    {"type": "text", "index", "text"} per sentence, {"type": "audio", "index", "audio"}
+    with the sentence's mp3 bytes, in order, and a final {"type": "done", "text", "timings"}.
+    The Gemini upload runs while the session context loads (pass the load_voice_context
+    awaitable, or an already loaded context), the reply is streamed and every finished
+    sentence goes to TTS while the rest is still being generated.
+    The transcript is appended, and recorded in the context, once the reply is complete.
+    """
+    turn = turn or VoiceTurn()
+    timer = turn.timer
+    backend = get_speech_backend()
+    upload = asyncio.create_task(timer.measure("upload", backend.prepare_audio(audio_path)))
+    try:
+        if not isinstance(context, VoiceContext):
+            context = await timer.measure("context", context)
+        turn.context = context
+        audio_size = os.path.getsize(audio_path)
+        remote_audio = await upload
+    except BaseException:
+        upload.cancel()
+        raise
+    if over_quota(context.media_bytes, audio_size):
+        await backend.release_audio(remote_audio)
+        await asyncio.to_thread(remove_files, [audio_path])
+        raise MediaQuotaExceeded(context.owner_id)
+    history = context.prompt_context()
+
+    events: asyncio.Queue = asyncio.Queue()
+    tts_slots = asyncio.Semaphore(TTS_CONCURRENCY)
+    tts_tasks: asyncio.Queue = asyncio.Queue()
+
+    async def tts(text: str) -> tuple[str, bytes]:
+        async with tts_slots:
+            return await asyncio.to_thread(speak_sentence, backend, text)
+
+    async def generate():
+        splitter = SentenceSplitter()
+        index = 0
+        llm_start = time.perf_counter()
+        async for text in backend.stream_reply(VOICE_PROMPT + f"\n\nContext:\n{history}", remote_audio):
+            timer.mark("first_token")
+            for sentence in splitter.feed(text):
+                timer.mark("first_sentence")
+                await events.put({"type": "text", "index": index, "text": sentence})
+                await tts_tasks.put((index, asyncio.create_task(tts(sentence))))
+                index += 1
+                turn.text += ("" if not turn.text else " ") + sentence
+        for sentence in splitter.flush():
+            timer.mark("first_sentence")
+            await events.put({"type": "text", "index": index, "text": sentence})
+            await tts_tasks.put((index, asyncio.create_task(tts(sentence))))
+            index += 1
+            turn.text += ("" if not turn.text else " ") + sentence
+        timer.stages["llm"] = round((time.perf_counter() - llm_start) * 1000, 1)
+        await tts_tasks.put(None)
+
+    async def emit_audio():
+        tts_start = time.perf_counter()
+        while (item := await tts_tasks.get()) is not None:
+            index, task = item
+            key, audio = await task
+            timer.mark("first_audio")
+            turn.audio_keys.append(key)
+            await events.put({"type": "audio", "index": index, "audio": audio})
+        timer.stages["tts"] = round((time.perf_counter() - tts_start) * 1000, 1)
+
+    async def persist(write_db: AsyncSession, turns: list[tuple[str, str]]):
+        await append_turns(write_db, context.session, turns)
+        await track_artifact(
+            write_db, audio_path, "user_audio", audio_size, context.owner_id, context.session.id,
+            remote_id=turn.remote_pending,
+        )
+        await record_event(write_db, context.session.id, "voice_turn", {
+            "round": context.session.current_round, "text": turn.text,
+            "audio": audio_path, "audio_bytes": audio_size, "timings": timer.as_dict(),
+        })
+
+    async def produce():
+        audio_emitter = asyncio.create_task(emit_audio())
+        try:
+            try:
+                await generate()
+            finally:
+                try:
+                    await backend.release_audio(remote_audio)
+                except Exception as e:
+                    # Retried by the media sweep
+                    print(f"Could not delete remote audio: {e}")
+                    turn.remote_pending = backend.remote_id(remote_audio)
+            await audio_emitter
+            turns = [("user_audio", "(Audio Input)"), ("ai", turn.text)]
+            if context.session is not None:
+                await timer.measure("persist", run_write(lambda write_db: persist(write_db, turns)))
+                context.media_bytes += audio_size
+            context.record(turns)
+            await events.put({"type": "done", "text": turn.text, "timings": timer.as_dict()})
+        except Exception as e:
+            audio_emitter.cancel()
+            await events.put(e)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            event = await events.get()
+            if isinstance(event, Exception):
+                raise event
+            yield event
+            if event["type"] == "done":
+                break
+    finally:
+        if not producer.done():
+            producer.cancel()
+
+async def run_voice_turn(audio_path: str, context: VoiceContext | Awaitable[VoiceContext]) -> VoiceTurn:
+    """Runs the whole pipeline and collects the reply text and audio."""
+    turn = VoiceTurn()
+    async for _ in voice_turn_events(audio_path, context, turn):
+        pass
+    return turn
+
+def reply_audio_query(keys: list[str]) -> str:
+    """
+    Query string for GET /interviews/{id}/reply_audio, which serves the reply as its
+    sentence entries concatenated (MPEG frames concatenate), so the reply is not stored
+    twice. The entries stay pinned in the TTS cache until fetched (or TTS_PIN_SECONDS).
+    """
+    tts_cache.pin(keys)
+    return "&".join(f"k={key}" for key in keys)
+
+def read_reply_audio(keys: list[str]) -> bytes | None:
+    """The reply's mp3, unpinning its entries; None if one of them is gone."""
+    try:
+        parts = [tts_cache.get(key, count=False) for key in keys]
+    finally:
+        tts_cache.unpin(keys)
+    if any(part is None for part in parts):
+        return None
+    return b"".join(parts)
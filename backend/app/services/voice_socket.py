@@ -0,0 +1,150 @@
+import asyncio
+import json
+from fastapi import WebSocket, WebSocketDisconnect
+from ..database import AsyncSessionLocal
+from .upload_storage import IncrementalUpload, UploadTooLarge, MAX_AUDIO_BYTES
+from .voice_pipeline import VoiceContext, load_voice_context, voice_turn_events, AUDIO_DIR
+
+class VoiceSocketSession:
+    """
+    One interview voice connection. Protocol (all control messages are JSON text frames):
+
+    client -> server
+        binary frame            audio bytes of the utterance being recorded
+        {"type": "end_turn"}    the utterance is complete; answer it
+        {"type": "cancel"}      drop the current recording and interrupt a reply in progress
+        {"type": "refresh"}     reload the session context (e.g. after the round advanced)
+        {"type": "ping"}
+
+    server -> client
+        {"type": "ready", "session_id", "current_round"}
+        {"type": "text", "index", "text"}           a sentence of the reply
+        {"type": "audio", "index", "bytes"}         followed by one binary frame with its mp3
+        {"type": "done", "text", "timings"}
+        {"type": "error", "detail"} / {"type": "pong"}
+
+    An utterance over MAX_AUDIO_BYTES is answered with an error and dropped: its
+    remaining frames are discarded up to the client's next end_turn or cancel, and
+    the following binary frame starts a new recording.
+
+    The session and recent transcript stay in memory for the connection's lifetime,
+    so a turn costs no context query. The next utterance can be streamed while a
+    reply is still being spoken.
+    """
+
+    def __init__(self, websocket: WebSocket, session_id: int):
+        self.websocket = websocket
+        self.session_id = session_id
+        self.context: VoiceContext | None = None
+        self.recording: IncrementalUpload | None = None
+        self.discarding = False # The current utterance was too large; drop it up to end_turn/cancel
+        self.reply: asyncio.Task | None = None
+        self._send_lock = asyncio.Lock()
+
+    async def send(self, message: dict, payload: bytes | None = None):
+        # A header and its binary frame must not be interleaved with other messages
+        async with self._send_lock:
+            await self.websocket.send_json(message)
+            if payload is not None:
+                await self.websocket.send_bytes(payload)
+
+    async def load_context(self):
+        async with AsyncSessionLocal() as db:
+            self.context = await load_voice_context(db, self.session_id)
+
+    def _new_recording(self) -> IncrementalUpload:
+        return IncrementalUpload(AUDIO_DIR, MAX_AUDIO_BYTES, prefix=f"{self.session_id}_", suffix="_user.webm")
+
+    async def run(self):
+        await self.websocket.accept()
+        await self.load_context()
+        if self.context.session is None:
+            await self.send({"type": "error", "detail": "Session not found"})
+            await self.websocket.close(code=4404)
+            return
+        await self.send({"type": "ready", "session_id": self.session_id, "current_round": self.context.session.current_round})
+
+        try:
+            while True:
+                message = await self.websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                if message.get("bytes") is not None:
+                    await self.on_audio(message["bytes"])
+                elif message.get("text") is not None:
+                    await self.on_control(message["text"])
+        except WebSocketDisconnect:
+            pass
+        finally:
+            await self.interrupt()
+            if self.recording is not None:
+                await self.recording.abort()
+
+    async def on_audio(self, chunk: bytes):
+        if self.discarding:
+            return
+        self.recording = self.recording or self._new_recording()
+        try:
+            await self.recording.write(chunk)
+        except UploadTooLarge as e:
+            self.recording = None
+            self.discarding = True
+            await self.send({"type": "error", "detail": f"{e}; the utterance was discarded"})
+
+    async def on_control(self, text: str):
+        try:
+            command = json.loads(text).get("type")
+        except (ValueError, AttributeError):
+            await self.send({"type": "error", "detail": "Control messages must be JSON objects"})
+            return
+
+        if command == "end_turn":
+            if self.discarding:
+                # The oversized utterance ends here; it is not answered
+                self.discarding = False
+                return
+            if self.recording is None:
+                await self.send({"type": "error", "detail": "No audio received for this turn"})
+                return
+            stored = await self.recording.finish()
+            self.recording = None
+            # Replies are answered in order; the previous one finishes first
+            previous = self.reply
+            self.reply = asyncio.create_task(self.answer(stored.path, previous))
+        elif command == "cancel":
+            self.discarding = False
+            if self.recording is not None:
+                await self.recording.abort()
+                self.recording = None
+            await self.interrupt()
+        elif command == "refresh":
+            await self.load_context()
+        elif command == "ping":
+            await self.send({"type": "pong"})
+        else:
+            await self.send({"type": "error", "detail": f"Unknown message type: {command}"})
+
+    async def interrupt(self):
+        if self.reply is not None and not self.reply.done():
+            self.reply.cancel()
+            try:
+                await self.reply
+            except asyncio.CancelledError:
+                pass
+        self.reply = None
+
+    async def answer(self, audio_path: str, previous: asyncio.Task | None):
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        try:
+            async for event in voice_turn_events(audio_path, self.context):
+                if event["type"] == "audio":
+                    audio = event["audio"]
+                    await self.send({"type": "audio", "index": event["index"], "bytes": len(audio)}, audio)
+                else:
+                    await self.send(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"CRITICAL ERROR in voice socket: {e}")
+            await self.send({"type": "error", "detail": str(e)})
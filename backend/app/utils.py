@@ -1,11 +1,21 @@
 from passlib.context import CryptContext
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import jwt
+import asyncio
 import os
+import threading
 
 # Password Hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes below BCRYPT_ROUNDS are upgraded on the next successful login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+)
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
@@ -13,6 +23,51 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+# bcrypt is CPU bound by design: it runs on its own small pool so a burst of
+# logins cannot occupy the event loop or the default threadpool
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_hash_lock = threading.Lock()
+_hash_stats = {"pending": 0, "max_pending": 0, "completed": 0, "rejected": 0}
+
+class PasswordHashingBusy(Exception):
+    """Raised when more than PASSWORD_HASH_MAX_QUEUE hash operations are already waiting."""
+
+async def _run_hashing(fn, *args):
+    with _hash_lock:
+        if _hash_stats["pending"] >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE:
+            _hash_stats["rejected"] += 1
+            raise PasswordHashingBusy()
+        _hash_stats["pending"] += 1
+        _hash_stats["max_pending"] = max(_hash_stats["max_pending"], _hash_stats["pending"])
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, fn, *args)
+    finally:
+        with _hash_lock:
+            _hash_stats["pending"] -= 1
+            _hash_stats["completed"] += 1
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hashing(pwd_context.hash, password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Returns (valid, new_hash); new_hash is set when the stored hash should be replaced."""
+    return await _run_hashing(pwd_context.verify_and_update, plain_password, hashed_password)
+
+def password_hashing_stats() -> dict:
+    with _hash_lock:
+        pending = _hash_stats["pending"]
+        return {
+            "workers": PASSWORD_HASH_WORKERS,
+            "rounds": BCRYPT_ROUNDS,
+            "queue_depth": max(0, pending - PASSWORD_HASH_WORKERS),
+            "in_flight": min(pending, PASSWORD_HASH_WORKERS),
+            "max_pending": _hash_stats["max_pending"],
+            "completed": _hash_stats["completed"],
+            "rejected": _hash_stats["rejected"],
+        }
+
 # JWT Token
 SECRET_KEY = os.getenv("SECRET_KEY", "supersecretkey") # Should be in env
 ALGORITHM = "HS256"
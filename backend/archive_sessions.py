@@ -0,0 +1,40 @@
+"""
+Moves completed sessions older than the retention window to cold storage.
+
+Each run writes gzip JSONL segments under ARCHIVE_DIR, records every archived
+session in the archived_sessions index, deletes the hot rows (session, questions,
+snapshots, transcript, score, event log) and prunes the session's audio files. Archived
+sessions remain readable through GET /interviews/{id}, /results and the history list.
+
+Usage:
+    python archive_sessions.py                 # ARCHIVE_RETENTION_DAYS (default 90)
+    python archive_sessions.py --days 30 --batch-size 500
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import AsyncSessionLocal
+from app.services.session_archive import archive_batch, ARCHIVE_DIR, ARCHIVE_RETENTION_DAYS
+
+async def run(days: int, batch_size: int):
+    sessions, audio = 0, 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            archived, removed = await archive_batch(db, days, batch_size)
+        if not archived:
+            break
+        sessions += archived
+        audio += removed
+        print(f"Archived {sessions} sessions, removed {audio} audio files")
+    print(f"Done: {sessions} sessions archived to {ARCHIVE_DIR}/")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=ARCHIVE_RETENTION_DAYS, help="Retention window for hot sessions")
+    parser.add_argument("--batch-size", type=int, default=200, help="Sessions per segment file")
+    args = parser.parse_args()
+    asyncio.run(run(args.days, args.batch_size))
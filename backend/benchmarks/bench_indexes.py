@@ -0,0 +1,114 @@
+"""
+Before/after benchmark for the hot-path indexes added by migration 0004.
+
+Seeds a scratch database, times the hot queries with the indexes dropped,
+applies the migration and times them again.
+
+Usage:
+    python benchmarks/bench_indexes.py [--url sqlite:///bench.db] [--candidates 20000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, text
+
+from app.database import Base
+from app.models import User, Candidate, InterviewSession, Question, AnalyticsSnapshot
+from app.migrations import m0004_hot_path_indexes
+
+QUERIES = {
+    "questions by candidate": "SELECT * FROM questions WHERE candidate_id = :cid",
+    "questions by session": "SELECT * FROM questions WHERE session_id = :sid",
+    "sessions by candidate (latest first)": "SELECT * FROM interview_sessions WHERE candidate_id = :cid ORDER BY start_time DESC",
+    "candidates by user (latest first)": "SELECT * FROM candidates WHERE user_id = :uid ORDER BY created_at DESC",
+    "snapshot by session": "SELECT * FROM analytics_snapshots WHERE interview_session_id = :sid",
+}
+
+def seed(conn, n_candidates: int):
+    n_users = max(1, n_candidates // 10)
+    now = datetime.utcnow()
+    conn.execute(insert(User), [
+        {"id": u, "email": f"user{u}@bench.local", "hashed_password": "x", "full_name": f"User {u}"}
+        for u in range(1, n_users + 1)
+    ])
+    conn.execute(insert(Candidate), [
+        {"id": c, "name": f"Candidate {c}", "email": f"c{c}@bench.local", "resume_url": "bench.pdf",
+         "status": "ready", "user_id": random.randint(1, n_users), "created_at": now - timedelta(minutes=c)}
+        for c in range(1, n_candidates + 1)
+    ])
+    sessions = [
+        {"id": s, "candidate_id": random.randint(1, n_candidates), "status": "completed",
+         "current_round": "completed", "round_data": {}, "start_time": now - timedelta(minutes=s)}
+        for s in range(1, n_candidates * 2 + 1)
+    ]
+    conn.execute(insert(InterviewSession), sessions)
+    conn.execute(insert(Question), [
+        {"candidate_id": s["candidate_id"], "session_id": s["id"], "text": "q", "options": ["a", "b", "c", "d"],
+         "correct_answer": 0, "difficulty": "easy", "tags": []}
+        for s in sessions for _ in range(5)
+    ])
+    conn.execute(insert(AnalyticsSnapshot), [
+        {"resume_id": s["candidate_id"], "interview_session_id": s["id"], "data": {}} for s in sessions
+    ])
+    conn.commit()
+    return n_users, n_candidates, len(sessions)
+
+def time_queries(conn, n_users, n_candidates, n_sessions, repeats: int) -> dict:
+    timings = {}
+    for name, sql in QUERIES.items():
+        samples = []
+        for _ in range(repeats):
+            params = {"cid": random.randint(1, n_candidates), "sid": random.randint(1, n_sessions),
+                      "uid": random.randint(1, n_users)}
+            start = time.perf_counter()
+            conn.execute(text(sql), params).fetchall()
+            samples.append((time.perf_counter() - start) * 1000)
+        timings[name] = statistics.median(samples)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="Sync SQLAlchemy URL of a scratch database (default: temp sqlite file)")
+    parser.add_argument("--candidates", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    if not args.url:
+        args.url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+
+    engine = create_engine(args.url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    with engine.connect() as conn:
+        for name, _, _ in m0004_hot_path_indexes.INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        conn.commit()
+
+        print(f"Seeding {args.candidates} candidates into {args.url} ...")
+        counts = seed(conn, args.candidates)
+
+        before = time_queries(conn, *counts, args.repeats)
+        m0004_hot_path_indexes.upgrade(conn)
+        conn.commit()
+        conn.execute(text("ANALYZE"))
+        conn.commit()
+        after = time_queries(conn, *counts, args.repeats)
+
+    print(f"\n{'query':40} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for name in QUERIES:
+        print(f"{name:40} {before[name]:10.3f} {after[name]:10.3f} {before[name] / max(after[name], 1e-6):7.1f}x")
+
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Sustained write throughput of the SQLite modes under concurrent interview sessions.
+
+Every simulated session appends transcript turns in a loop (the /speak write path)
+for a fixed duration. Three configurations are compared on a scratch file:
+
+    default     rollback journal, one commit per write, writers race for the file lock
+    serialized  WAL + tuned pragmas, writes serialized by SerializedWriteSession
+    queue       WAL + tuned pragmas, writes group-committed by the WriteQueue task
+
+Usage:
+    python benchmarks/bench_sqlite_writes.py [--sessions 50] [--seconds 5]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base, SerializedWriteSession, WriteQueue, configure_sqlite, _sqlite_write_lock
+from app.models import Candidate, InterviewSession
+from app.services.transcript_store import append_turns
+
+async def prepare(url: str, n_sessions: int):
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Candidate), [{"id": 1, "name": "Bench", "email": "b@bench.local", "resume_url": "x"}])
+        await conn.execute(insert(InterviewSession), [
+            {"id": i, "candidate_id": 1, "status": "active", "current_round": "tech_1", "round_data": {}}
+            for i in range(1, n_sessions + 1)
+        ])
+    await engine.dispose()
+
+async def run_mode(mode: str, url: str, n_sessions: int, seconds: float) -> dict:
+    await prepare(url, n_sessions)
+    engine = create_async_engine(url)
+    if mode != "default":
+        configure_sqlite(engine)
+    session_class = SerializedWriteSession if mode == "serialized" else AsyncSession
+    factory = async_sessionmaker(bind=engine, class_=session_class, expire_on_commit=False, autoflush=False)
+    queue = WriteQueue(async_sessionmaker(bind=engine, expire_on_commit=False, autoflush=False), _sqlite_write_lock)
+    if mode == "queue":
+        queue.start()
+
+    writes, errors, latencies = 0, 0, []
+    deadline = time.perf_counter() + seconds
+
+    async def interview(session_id: int):
+        nonlocal writes, errors
+        async with factory() as db:
+            session = await db.get(InterviewSession, session_id)
+        turns = [("user_audio", "(Audio Input)"), ("ai", "Tell me about a project you are proud of.")]
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                if mode == "queue":
+                    await queue.submit(lambda db: append_turns(db, session, turns))
+                else:
+                    async with factory() as db:
+                        await append_turns(db, session, turns)
+                        await db.commit()
+                writes += 1
+                latencies.append(time.perf_counter() - start)
+            except OperationalError:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(interview(i) for i in range(1, n_sessions + 1)))
+    elapsed = time.perf_counter() - started
+    await queue.stop()
+    await engine.dispose()
+
+    latencies.sort()
+    return {
+        "writes/s": writes / elapsed,
+        "errors": errors,
+        "p50 ms": latencies[len(latencies) // 2] * 1000 if latencies else 0,
+        "p99 ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0,
+        "commits": queue.commits if mode == "queue" else writes,
+    }
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=50, help="Concurrent interview sessions")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--modes", default="default,serialized,queue")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    url = f"sqlite+aiosqlite:///{path}"
+
+    print(f"{args.sessions} concurrent sessions, {args.seconds:.0f}s per mode\n")
+    print(f"{'mode':12} {'writes/s':>10} {'errors':>8} {'p50 ms':>8} {'p99 ms':>8} {'commits':>8}")
+    for mode in args.modes.split(","):
+        r = await run_mode(mode, url, args.sessions, args.seconds)
+        print(f"{mode:12} {r['writes/s']:10.0f} {r['errors']:8d} {r['p50 ms']:8.1f} {r['p99 ms']:8.1f} {r['commits']:8d}")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+"""
+Offline capacity test of the voice round.
+
+Virtual candidates each hold an interview session and send /speak turns back to
+back. The app runs in-process on a scratch SQLite file with SPEECH_BACKEND=local,
+so no network or API key is needed and results are reproducible in CI; the
+SPEECH_LOCAL_*_MS variables set the simulated provider latencies.
+
+Usage:
+    python benchmarks/load_test_voice.py [--candidates 20] [--turns 5]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_ROOT)
+
+# Configure before the app is imported: scratch database and working directory,
+# offline speech backend
+WORK_DIR = tempfile.mkdtemp(prefix="voice_load_")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(WORK_DIR, 'load.db')}"
+os.environ["SPEECH_BACKEND"] = "local"
+os.environ.setdefault("GEMINI_API_KEY", "")
+os.chdir(WORK_DIR)
+os.makedirs("uploads", exist_ok=True)
+
+import httpx
+from sqlalchemy import insert
+
+from app.database import engine, read_engine
+from app.main import app
+from app.models import Candidate, InterviewSession
+
+# The engines echo every statement; that output would dominate the run
+engine.echo = read_engine.echo = False
+
+# A few bytes stand in for the recording; the local backend only hashes it
+UTTERANCE = b"\x1aE\xdf\xa3" + os.urandom(2048)
+
+async def seed(n_candidates: int):
+    async with engine.begin() as conn:
+        await conn.execute(insert(Candidate), [
+            {"id": i, "name": f"Load {i}", "email": f"load{i}@bench.local", "resume_url": "x"}
+            for i in range(1, n_candidates + 1)
+        ])
+        await conn.execute(insert(InterviewSession), [
+            {"id": i, "candidate_id": i, "status": "active", "current_round": "hr", "round_data": {}}
+            for i in range(1, n_candidates + 1)
+        ])
+
+def percentile(values: list[float], p: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", type=int, default=20, help="Concurrent virtual candidates")
+    parser.add_argument("--turns", type=int, default=5, help="Voice turns per candidate")
+    args = parser.parse_args()
+
+    latencies, errors = [], 0
+    stages: dict[str, list[float]] = {}
+
+    async with app.router.lifespan_context(app):
+        await seed(args.candidates)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=60) as client:
+
+            async def candidate(session_id: int):
+                nonlocal errors
+                for _ in range(args.turns):
+                    start = time.perf_counter()
+                    r = await client.post(
+                        f"/interviews/{session_id}/speak",
+                        files={"audio": ("turn.webm", UTTERANCE, "audio/webm")},
+                    )
+                    if r.status_code != 200:
+                        errors += 1
+                        continue
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    for name, ms in r.json()["timings"].items():
+                        stages.setdefault(name, []).append(ms)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(candidate(i) for i in range(1, args.candidates + 1)))
+            elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"{args.candidates} candidates x {args.turns} turns, speech backend 'local' ({WORK_DIR})\n")
+    print(f"turns/s   {len(latencies) / elapsed:8.1f}")
+    print(f"errors    {errors:8d}")
+    print(f"p50 ms    {percentile(latencies, 0.50):8.1f}")
+    print(f"p95 ms    {percentile(latencies, 0.95):8.1f}")
+    print(f"p99 ms    {percentile(latencies, 0.99):8.1f}")
+    print("\nmean stage timings (ms)")
+    for name, values in stages.items():
+        print(f"  {name:16} {statistics.mean(values):8.1f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
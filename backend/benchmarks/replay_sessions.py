@@ -0,0 +1,174 @@
+"""
+Replays recorded interview sessions from their event log against the app.
+
+Events are read from the source database (--source, default DATABASE_URL) and
+re-issued in order against an in-process app on a scratch SQLite file with
+SPEECH_BACKEND=local, as fast as possible and all sessions concurrently:
+
+    round_submitted     POST /interviews/{id}/submit_round (which also advances the round)
+    round_advanced      POST /interviews/{id}/advance
+    voice_turn          POST /interviews/{id}/speak (recorded audio if still on disk, else same-size filler)
+    session_completed   POST /interviews/{id}/complete
+
+Per-endpoint latencies are reported, and for voice turns the replayed stage
+timings next to the ones recorded in production.
+
+Usage:
+    python benchmarks/replay_sessions.py [--source sqlite+aiosqlite:///./interview.db] [--limit 20]
+    python benchmarks/replay_sessions.py --session 42 --session 43 --repeat 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_ROOT)
+
+SOURCE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./interview.db")
+
+# The app under test runs on a scratch database and working directory with the offline speech backend
+WORK_DIR = tempfile.mkdtemp(prefix="session_replay_")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(WORK_DIR, 'replay.db')}"
+os.environ["SPEECH_BACKEND"] = "local"
+os.environ["MEDIA_SWEEP_INTERVAL"] = "0"
+os.environ.setdefault("GEMINI_API_KEY", "")
+
+import httpx
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.future import select
+
+from app.database import engine, read_engine
+from app.models import Candidate, InterviewSession, SessionEvent
+
+# The engines echo every statement; that output would dominate the run
+engine.echo = read_engine.echo = False
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0
+
+async def load_recorded(source_url: str, session_ids: list[int] | None, limit: int) -> dict[int, list[tuple[str, dict]]]:
+    """session id -> [(event type, payload)] in log order, for sessions whose log starts at session_started."""
+    source = create_async_engine(source_url)
+    factory = async_sessionmaker(bind=source, expire_on_commit=False)
+    async with factory() as db:
+        if not session_ids:
+            result = await db.execute(
+                select(SessionEvent.session_id)
+                .where(SessionEvent.type == "session_started")
+                .order_by(SessionEvent.id.desc())
+                .limit(limit)
+            )
+            session_ids = list(result.scalars().all())
+        result = await db.execute(
+            select(SessionEvent.session_id, SessionEvent.type, SessionEvent.payload)
+            .where(SessionEvent.session_id.in_(session_ids))
+            .order_by(SessionEvent.id)
+        )
+        recorded: dict[int, list[tuple[str, dict]]] = {}
+        for session_id, event_type, payload in result.all():
+            recorded.setdefault(session_id, []).append((event_type, payload))
+    await source.dispose()
+    return {sid: events for sid, events in recorded.items() if events[0][0] == "session_started"}
+
+async def seed(sessions: list[tuple[int, dict]]):
+    """Creates one candidate and session per replay, in the recorded starting state."""
+    async with engine.begin() as conn:
+        await conn.execute(insert(Candidate), [
+            {"id": i, "name": f"Replay {i}", "email": f"replay{i}@bench.local", "resume_url": "x"}
+            for i, _ in sessions
+        ])
+        await conn.execute(insert(InterviewSession), [
+            {"id": i, "candidate_id": i, "status": "active", "round_data": {}, **started}
+            for i, started in sessions
+        ])
+
+def recorded_audio(payload: dict) -> bytes:
+    path = os.path.join(BACKEND_ROOT, payload.get("audio") or "")
+    if os.path.isfile(path):
+        with open(path, "rb") as f:
+            return f.read()
+    return b"\x1aE\xdf\xa3" + bytes(max(0, payload.get("audio_bytes", 0) - 4))
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--source", default=SOURCE_URL, help="Database holding the recorded sessions")
+    parser.add_argument("--session", type=int, action="append", help="Replay this session id (repeatable)")
+    parser.add_argument("--limit", type=int, default=20, help="Most recent sessions to replay without --session")
+    parser.add_argument("--repeat", type=int, default=1, help="Concurrent copies of each session")
+    args = parser.parse_args()
+
+    recorded = await load_recorded(args.source, args.session, args.limit)
+    if not recorded:
+        print("No recorded sessions with an event log found")
+        return
+    # Read recorded audio before leaving the backend directory
+    audio = {
+        (sid, i): recorded_audio(payload)
+        for sid, events in recorded.items()
+        for i, (event_type, payload) in enumerate(events) if event_type == "voice_turn"
+    }
+
+    os.chdir(WORK_DIR)
+    os.makedirs("uploads", exist_ok=True)
+    from app.main import app
+
+    replays = [(copy * len(recorded) + n + 1, sid) for copy in range(args.repeat) for n, sid in enumerate(recorded)]
+    latencies: dict[str, list[float]] = {}
+    voice_stages: dict[str, tuple[list[float], list[float]]] = {}
+    errors = 0
+
+    async with app.router.lifespan_context(app):
+        await seed([(replay_id, recorded[sid][0][1]) for replay_id, sid in replays])
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://replay", timeout=60) as client:
+
+            async def replay(replay_id: int, sid: int):
+                nonlocal errors
+                for i, (event_type, payload) in enumerate(recorded[sid][1:], start=1):
+                    url = f"/interviews/{replay_id}"
+                    start = time.perf_counter()
+                    if event_type == "round_submitted":
+                        r = await client.post(f"{url}/submit_round", json={"data": payload["data"]})
+                    elif event_type == "round_advanced":
+                        r = await client.post(f"{url}/advance")
+                    elif event_type == "voice_turn":
+                        r = await client.post(f"{url}/speak", files={"audio": ("turn.webm", audio[(sid, i)], "audio/webm")})
+                    elif event_type == "session_completed":
+                        r = await client.post(f"{url}/complete")
+                    else:
+                        continue
+                    elapsed = (time.perf_counter() - start) * 1000
+                    if r.status_code != 200:
+                        errors += 1
+                        continue
+                    latencies.setdefault(event_type, []).append(elapsed)
+                    if event_type == "voice_turn":
+                        for stage, ms in r.json()["timings"].items():
+                            replayed_ms, recorded_ms = voice_stages.setdefault(stage, ([], []))
+                            replayed_ms.append(ms)
+                            if stage in payload.get("timings", {}):
+                                recorded_ms.append(payload["timings"][stage])
+
+            started = time.perf_counter()
+            await asyncio.gather(*(replay(replay_id, sid) for replay_id, sid in replays))
+            elapsed = time.perf_counter() - started
+
+    requests = sum(len(v) for v in latencies.values())
+    print(f"{len(replays)} session replays ({len(recorded)} recorded x {args.repeat}), {requests} requests in {elapsed:.1f}s, {errors} errors ({WORK_DIR})\n")
+    print(f"{'event':20} {'count':>6} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for event_type, values in latencies.items():
+        print(f"{event_type:20} {len(values):6d} {statistics.mean(values):9.1f} {percentile(values, 0.5):8.1f} {percentile(values, 0.95):8.1f}")
+    if voice_stages:
+        print(f"\n{'voice stage':20} {'replayed':>9} {'recorded':>9}  (mean ms)")
+        for stage, (replayed_ms, recorded_ms) in voice_stages.items():
+            recorded_mean = f"{statistics.mean(recorded_ms):9.1f}" if recorded_ms else f"{'-':>9}"
+            print(f"{stage:20} {statistics.mean(replayed_ms):9.1f} {recorded_mean}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,221 @@
+"""
+Bulk resume ingestion for hiring campaigns.
+
+Walks a directory (recursively) or a .zip archive, parses the resumes in
+parallel worker processes with the regular resume_parser functions and
+batch-inserts Candidate rows for one user. With --create-sessions every
+imported candidate also gets an interview session and its MCQ set, created
+through the same bulk path as POST /interviews/.
+
+Progress is checkpointed after every committed batch, so an interrupted run
+can simply be restarted with the same arguments.
+
+Usage:
+    python bulk_ingest.py <dir-or-zip> --user-id 1 [--workers 8] [--batch-size 200] [--analytics] [--create-sessions]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import insert
+from sqlalchemy.future import select
+
+from app.database import AsyncSessionLocal
+from app.models import Candidate, User
+from app.services.resume_parser import parse_resume_bounded, generate_analytics
+from app.services.question_generator import generate_mcqs
+from app.services.question_bank import create_sessions_with_questions
+from app.services.upload_storage import StoredUpload, store_bytes
+from app.services.media_lifecycle import admit_upload, MediaQuotaExceeded
+
+RESUME_EXTENSIONS = (".pdf", ".docx")
+UPLOAD_DIR = "uploads/resumes"
+
+def discover(source: str) -> list[str]:
+    """Returns stable ids for every resume in the source ("path" or "archive.zip::member")."""
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            members = [n for n in archive.namelist() if n.lower().endswith(RESUME_EXTENSIONS)]
+        return sorted(f"{source}::{name}" for name in members)
+
+    found = []
+    for root, _, files in os.walk(source):
+        for name in files:
+            if name.lower().endswith(RESUME_EXTENSIONS):
+                found.append(os.path.join(root, name))
+    return sorted(found)
+
+def _read_source(source_id: str) -> bytes:
+    if "::" in source_id:
+        archive_path, member = source_id.split("::", 1)
+        with zipfile.ZipFile(archive_path) as archive:
+            return archive.read(member)
+    with open(source_id, "rb") as f:
+        return f.read()
+
+def _display_name(source_id: str) -> str:
+    stem = os.path.splitext(os.path.basename(source_id.split("::")[-1]))[0]
+    return stem.replace("_", " ").replace("-", " ").strip() or "Unknown"
+
+def process_resume(source_id: str, with_analytics: bool, with_questions: bool) -> dict:
+    """Runs in a worker process: store the file content-addressed, then parse it."""
+    try:
+        data = _read_source(source_id)
+        ext = os.path.splitext(source_id)[1].lower()
+        stored = store_bytes(data, UPLOAD_DIR, suffix=ext)
+        text, complete = parse_resume_bounded(stored.path)
+        analytics = generate_analytics(text, use_llm=with_analytics)
+        return {
+            "source_id": source_id,
+            "name": _display_name(source_id),
+            "resume_url": stored.path,
+            "resume_hash": stored.sha256,
+            "resume_size": stored.size,
+            "resume_text": text,
+            "resume_text_complete": complete,
+            "analytics": analytics,
+            "status": "ready" if text else "failed",
+            "questions": generate_mcqs(text) if with_questions else None,
+        }
+    except Exception as e:
+        return {"source_id": source_id, "error": str(e)}
+
+class Checkpoint:
+    """Append-only list of finished source ids, one per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done = set()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.done = {line.rstrip("\n") for line in f if line.strip()}
+
+    def record(self, source_ids: list[str]):
+        with open(self.path, "a") as f:
+            f.writelines(f"{sid}\n" for sid in source_ids)
+            f.flush()
+            os.fsync(f.fileno())
+        self.done.update(source_ids)
+
+async def flush_batch(batch: list[dict], user: User, checkpoint: Checkpoint, with_sessions: bool) -> int:
+    """Inserts one batch in a single statement and transaction. Returns rows inserted."""
+    async with AsyncSessionLocal() as db:
+        # A crash between commit and checkpoint must not duplicate rows on resume
+        hashes = [r["resume_hash"] for r in batch]
+        result = await db.execute(
+            select(Candidate.resume_hash)
+            .where(Candidate.user_id == user.id, Candidate.resume_hash.in_(hashes))
+        )
+        existing = set(result.scalars().all())
+
+        rows = []
+        questions_by_row = []
+        over_quota = []
+        for r in batch:
+            if r["resume_hash"] in existing:
+                continue
+            # Index the stored file and count it against the user's media quota, like uploads
+            try:
+                await admit_upload(db, StoredUpload(r["resume_url"], r["resume_hash"], r["resume_size"]), "resume", user.id)
+            except MediaQuotaExceeded:
+                over_quota.append(r["source_id"])
+                continue
+            existing.add(r["resume_hash"])
+            rows.append({
+                "name": r["name"],
+                "email": user.email,
+                "resume_url": r["resume_url"],
+                "resume_hash": r["resume_hash"],
+                "resume_text": r["resume_text"],
+                "resume_text_complete": r["resume_text_complete"],
+                "analytics": r["analytics"],
+                "status": r["status"],
+                "user_id": user.id,
+            })
+            questions_by_row.append(r["questions"] or [])
+
+        if rows:
+            result = await db.execute(insert(Candidate).returning(Candidate.id, sort_by_parameter_order=True), rows)
+            candidate_ids = list(result.scalars().all())
+            if with_sessions:
+                await create_sessions_with_questions(
+                    db, list(zip(candidate_ids, questions_by_row))
+                )
+            await db.commit()
+
+    if over_quota:
+        # Not checkpointed: a rerun after the quota is raised picks them up
+        print(f"Media quota of user {user.id} exceeded, skipped {len(over_quota)} resumes")
+    checkpoint.record([r["source_id"] for r in batch if r["source_id"] not in over_quota])
+    return len(rows)
+
+async def ingest(args):
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User).where(User.id == args.user_id))
+        user = result.scalars().first()
+    if not user:
+        print(f"User {args.user_id} not found.")
+        return
+
+    checkpoint = Checkpoint(args.checkpoint)
+    sources = discover(args.source)
+    pending = [s for s in sources if s not in checkpoint.done]
+    print(f"Found {len(sources)} resumes, {len(sources) - len(pending)} already ingested, {len(pending)} to go.")
+    if not pending:
+        return
+
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    processed = inserted = failed = 0
+    batch = []
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [loop.run_in_executor(pool, process_resume, s, args.analytics, args.create_sessions) for s in pending]
+        for future in asyncio.as_completed(futures):
+            result = await future
+            processed += 1
+            if "error" in result:
+                failed += 1
+                print(f"Failed: {result['source_id']}: {result['error']}")
+            else:
+                batch.append(result)
+
+            if len(batch) >= args.batch_size:
+                inserted += await flush_batch(batch, user, checkpoint, args.create_sessions)
+                batch = []
+                elapsed = time.perf_counter() - started
+                print(f"{processed}/{len(pending)} parsed, {inserted} inserted, {processed / elapsed:.1f} resumes/s")
+
+        if batch:
+            inserted += await flush_batch(batch, user, checkpoint, args.create_sessions)
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Done: {processed} parsed, {inserted} inserted, {failed} failed "
+        f"in {elapsed:.1f}s ({processed / elapsed:.1f} resumes/s, {args.workers} workers)"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-ingest resumes from a directory or .zip archive.")
+    parser.add_argument("source", help="Directory or .zip archive containing PDF/DOCX resumes")
+    parser.add_argument("--user-id", type=int, required=True, help="Owner of the imported candidates")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--analytics", action="store_true", help="Also run the LLM resume analysis (the local skill scan always runs)")
+    parser.add_argument("--create-sessions", action="store_true", help="Open an interview session with generated MCQs per candidate")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <source>.ingest-checkpoint)")
+    args = parser.parse_args()
+
+    if not args.checkpoint:
+        args.checkpoint = os.path.abspath(args.source).rstrip(os.sep) + ".ingest-checkpoint"
+
+    asyncio.run(ingest(args))
+
+if __name__ == "__main__":
+    main()
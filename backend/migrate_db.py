@@ -1,30 +1,30 @@
-import sqlite3
+"""
+Applies pending schema migrations (app/migrations) to DATABASE_URL.
+
+Usage:
+    python migrate_db.py            # upgrade to the latest version
+    python migrate_db.py --status   # list applied and pending migrations
+"""
+import asyncio
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import engine
+from app.migrations.runner import MIGRATIONS, applied_versions, run_migrations
 
-db_path = os.path.join(os.getcwd(), 'interview.db')
+async def status():
+    async with engine.connect() as conn:
+        done = await conn.run_sync(applied_versions)
+        await conn.commit()
+    for migration in MIGRATIONS:
+        state = "applied" if migration.VERSION in done else "pending"
+        print(f"{migration.VERSION:04d}  {state:8}  {migration.DESCRIPTION}")
 
-def migrate():
-    print(f"Connecting to {db_path}...")
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    try:
-        print("Checking for 'status' column in 'candidates' table...")
-        cursor.execute("PRAGMA table_info(candidates)")
-        columns = [column[1] for column in cursor.fetchall()]
-        
-        if 'status' not in columns:
-            print("Adding 'status' column to 'candidates' table...")
-            cursor.execute("ALTER TABLE candidates ADD COLUMN status VARCHAR DEFAULT 'processing' NOT NULL")
-            conn.commit()
-            print("Migration successful.")
-        else:
-            print("'status' column already exists.")
-            
-    except Exception as e:
-        print(f"Error during migration: {e}")
-    finally:
-        conn.close()
+async def migrate():
+    applied = await run_migrations(engine)
+    print(f"Applied {len(applied)} migration(s)." if applied else "Schema is up to date.")
 
 if __name__ == "__main__":
-    migrate()
+    asyncio.run(status() if "--status" in sys.argv else migrate())
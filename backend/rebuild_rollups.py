@@ -0,0 +1,81 @@
+"""
+Recomputes analytics_rollups from completed sessions, live and archived.
+
+Rollups are maintained incrementally by POST /interviews/{id}/complete; run this
+to backfill sessions completed before the rollup table existed, or after changing
+which metrics are collected.
+
+Usage:
+    python rebuild_rollups.py
+"""
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import delete
+from sqlalchemy.future import select
+
+from app.database import AsyncSessionLocal
+from app.models import AnalyticsRollup, ArchivedSession, Candidate, InterviewSession
+from app.services.analytics_rollups import record_completed_session
+from app.services.session_archive import read_record
+
+BATCH_SIZE = 500
+
+async def rebuild():
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(AnalyticsRollup))
+
+        last_id, total = 0, 0
+        while True:
+            result = await db.execute(
+                select(InterviewSession, Candidate.user_id)
+                .join(Candidate, Candidate.id == InterviewSession.candidate_id)
+                .where(InterviewSession.decision.is_not(None), InterviewSession.id > last_id)
+                .order_by(InterviewSession.id)
+                .limit(BATCH_SIZE)
+            )
+            batch = result.all()
+            if not batch:
+                break
+            for session, user_id in batch:
+                await record_completed_session(db, user_id, session, session.breakdown or {})
+            last_id = batch[-1][0].id
+            total += len(batch)
+            print(f"Rolled up {total} sessions")
+
+        # Archived sessions no longer have hot rows; their round data and frozen
+        # breakdown are read back from the segments
+        last_id = 0
+        while True:
+            result = await db.execute(
+                select(ArchivedSession, Candidate.user_id)
+                .join(Candidate, Candidate.id == ArchivedSession.candidate_id)
+                .where(ArchivedSession.decision.is_not(None), ArchivedSession.session_id > last_id)
+                .order_by(ArchivedSession.session_id)
+                .limit(BATCH_SIZE)
+            )
+            batch = result.all()
+            if not batch:
+                break
+            records = await asyncio.to_thread(
+                lambda: [read_record(entry.segment, entry.offset, entry.length) for entry, _ in batch]
+            )
+            for (entry, user_id), record in zip(batch, records):
+                # Transient stand-in for the deleted row, never added to the session
+                session = InterviewSession(
+                    id=entry.session_id, decision=entry.decision, score=entry.score,
+                    end_time=entry.end_time, round_data=record["session"].get("round_data"),
+                )
+                await record_completed_session(db, user_id, session, record["session"].get("breakdown") or {})
+            last_id = batch[-1][0].session_id
+            total += len(batch)
+            print(f"Rolled up {total} sessions")
+
+        # Replaced in one transaction so the dashboard never sees a partial rebuild
+        await db.commit()
+
+if __name__ == "__main__":
+    asyncio.run(rebuild())
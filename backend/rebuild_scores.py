@@ -0,0 +1,52 @@
+"""
+Rebuilds the materialized session_scores records from round_data.
+
+Live scores are maintained incrementally by submit_round; run this after changing
+the scoring rules or to backfill sessions created before session_scores existed.
+
+Usage:
+    python rebuild_scores.py                 # every session without a score record
+    python rebuild_scores.py --all           # recompute every session
+    python rebuild_scores.py --session 42    # one session
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy.future import select
+
+from app.database import AsyncSessionLocal
+from app.models import InterviewSession, SessionScore
+from app.services.unit_of_work import InterviewUnitOfWork
+from app.services.session_scores import rebuild_session_score
+
+BATCH_SIZE = 200
+
+async def rebuild(session_ids: list[int] | None, everything: bool):
+    async with AsyncSessionLocal() as db:
+        stmt = select(InterviewSession.id).order_by(InterviewSession.id)
+        if session_ids:
+            stmt = stmt.where(InterviewSession.id.in_(session_ids))
+        elif not everything:
+            stmt = stmt.where(~InterviewSession.id.in_(select(SessionScore.session_id)))
+        ids = list((await db.execute(stmt)).scalars().all())
+
+    done = 0
+    for start in range(0, len(ids), BATCH_SIZE):
+        async with AsyncSessionLocal() as db:
+            uow = InterviewUnitOfWork(db)
+            for session_id in ids[start:start + BATCH_SIZE]:
+                await rebuild_session_score(uow, await uow.get_session(session_id))
+            await uow.commit()
+        done += len(ids[start:start + BATCH_SIZE])
+        print(f"Rebuilt {done}/{len(ids)} session scores")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--all", action="store_true", help="Recompute sessions that already have a record")
+    parser.add_argument("--session", type=int, action="append", help="Only this session id (repeatable)")
+    args = parser.parse_args()
+    asyncio.run(rebuild(args.session, args.all))
@@ -0,0 +1,73 @@
+"""
+Rebuilds interview session state from the session_events log and checks it
+against the interview_sessions rows.
+
+The state is folded from the latest snapshot plus the events after it, so the
+cost per session is the number of events since that snapshot. Sessions created
+before the event log existed have no events and are reported as skipped.
+
+Usage:
+    python rebuild_session_state.py                  # verify every session
+    python rebuild_session_state.py --session 42     # print one session's rebuilt state
+    python rebuild_session_state.py --snapshot       # also store a fresh snapshot where events were replayed
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import insert
+from sqlalchemy.future import select
+
+from app.database import AsyncSessionLocal
+from app.models import InterviewSession, SessionEvent, SessionSnapshot
+from app.services.session_events import rebuild_state, session_state
+
+BATCH_SIZE = 200
+
+async def verify(session_ids: list[int] | None, snapshot: bool):
+    async with AsyncSessionLocal() as db:
+        stmt = select(InterviewSession.id).order_by(InterviewSession.id)
+        if session_ids:
+            stmt = stmt.where(InterviewSession.id.in_(session_ids))
+        ids = list((await db.execute(stmt)).scalars().all())
+
+    matched, mismatched, skipped, replayed = 0, 0, 0, 0
+    for start in range(0, len(ids), BATCH_SIZE):
+        async with AsyncSessionLocal() as db:
+            for session_id in ids[start:start + BATCH_SIZE]:
+                state, events = await rebuild_state(db, session_id)
+                replayed += events
+                if state is None:
+                    skipped += 1
+                    continue
+                live = session_state(await db.get(InterviewSession, session_id))
+                if session_ids:
+                    print(json.dumps({"session_id": session_id, "events_replayed": events, "state": state}, indent=2))
+                if state == live:
+                    matched += 1
+                else:
+                    mismatched += 1
+                    diff = {k: {"log": state.get(k), "row": v} for k, v in live.items() if state.get(k) != v}
+                    print(f"Session {session_id} differs from its log: {json.dumps(diff, default=str)}")
+                if snapshot and events:
+                    last_event_id = (await db.execute(
+                        select(SessionEvent.id).where(SessionEvent.session_id == session_id)
+                        .order_by(SessionEvent.id.desc()).limit(1)
+                    )).scalar_one()
+                    await db.execute(insert(SessionSnapshot).values(
+                        session_id=session_id, last_event_id=last_event_id, state=state,
+                    ))
+            await db.commit()
+
+    print(f"{matched} match, {mismatched} differ, {skipped} without events ({replayed} events replayed)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--session", type=int, action="append", help="Only this session id (repeatable)")
+    parser.add_argument("--snapshot", action="store_true", help="Store the rebuilt state as a new snapshot")
+    args = parser.parse_args()
+    asyncio.run(verify(args.session, args.snapshot))
@@ -0,0 +1,31 @@
+"""
+Runs one media garbage collection pass (the app also does this every
+MEDIA_SWEEP_INTERVAL seconds while it runs).
+
+Expired recordings (AUDIO_RETENTION_DAYS) are deleted, provider copies whose
+deletion failed are retried, index rows of vanished files are dropped, and files in
+uploads/audio and uploads/resumes missing from the media_artifacts index are either
+adopted (a candidate or session still refers to them) or removed as orphans.
+Run it once after upgrading to index the files stored before the index existed.
+
+Usage:
+    python sweep_media.py
+"""
+import asyncio
+import os
+import sys
+from dataclasses import asdict
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import AsyncSessionLocal
+from app.services.media_lifecycle import sweep
+
+async def run():
+    async with AsyncSessionLocal() as db:
+        report = await sweep(db)
+    for name, value in asdict(report).items():
+        print(f"{name:15} {value}")
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,96 @@
+"""
+Runs the app in-process on a scratch SQLite database and working directory, with
+the offline speech backend and no LLM key, so the suite needs no network.
+"""
+import os
+import sys
+import tempfile
+
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_ROOT)
+
+# Must be set before the app is imported (the engines are created at import time)
+WORK_DIR = tempfile.mkdtemp(prefix="interviewer_tests_")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(WORK_DIR, 'test.db')}"
+os.environ["SPEECH_BACKEND"] = "local"
+os.environ["MEDIA_SWEEP_INTERVAL"] = "0"
+os.environ["GEMINI_API_KEY"] = ""
+# Every test signs up and logs in from the same client address
+os.environ["LOGIN_MAX_ATTEMPTS_PER_IP"] = "100000"
+os.chdir(WORK_DIR)
+os.makedirs("uploads", exist_ok=True)
+
+import itertools
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.database import engine, read_engine, AsyncSessionLocal
+from app.models import Candidate
+from app.services.question_bank import create_sessions_with_questions
+
+# The engines echo every statement
+engine.echo = read_engine.echo = False
+
+RESUME_PDF = os.path.join(BACKEND_ROOT, "uploads", "resumes", "Dev_Agarwal_Resume.pdf")
+
+_emails = itertools.count(1)
+
+QUESTIONS = [
+    {"text": f"Question {i}?", "options": ["a", "b", "c", "d"], "correct_answer": i % 4}
+    for i in range(3)
+]
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+@pytest.fixture
+def run(client):
+    """Runs a coroutine function on the app's event loop (where its engines live)."""
+    return lambda fn, *args: client.portal.call(fn, *args)
+
+def signup(client) -> tuple[dict, int]:
+    """Registers a fresh recruiter; returns (auth headers, user id)."""
+    email = f"recruiter{next(_emails)}@example.com"
+    client.post("/auth/signup", json={"email": email, "password": "pw123456", "full_name": "Recruiter"})
+    token = client.post("/auth/login", data={"username": email, "password": "pw123456"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    return headers, client.get("/auth/me", headers=headers).json()["id"]
+
+@pytest.fixture
+def recruiter(client):
+    return signup(client)
+
+def upload_resume(client, headers, name="Candidate") -> dict:
+    with open(RESUME_PDF, "rb") as f:
+        r = client.post(
+            "/candidates/register", headers=headers,
+            data={"name": name}, files={"resume": ("resume.pdf", f, "application/pdf")},
+        )
+    assert r.status_code == 201, r.text
+    return r.json()
+
+async def _create_session(user_id: int, current_round: str) -> int:
+    async with AsyncSessionLocal() as db:
+        candidate = Candidate(name="Candidate", email="candidate@example.com", resume_url="pending_upload", user_id=user_id, analytics={})
+        db.add(candidate)
+        await db.flush()
+        [session_id] = await create_sessions_with_questions(db, [(candidate.id, QUESTIONS)], current_round)
+        await db.commit()
+        return session_id
+
+async def run_with_db(fn, sessions: int, *args):
+    """Calls fn(db_1, ..., db_n, *args) with n fresh database sessions (use through `run`)."""
+    dbs = [AsyncSessionLocal() for _ in range(sessions)]
+    try:
+        return await fn(*dbs, *args)
+    finally:
+        for db in dbs:
+            await db.close()
+
+@pytest.fixture
+def new_session(run, recruiter):
+    """Creates a session with a fixed question set (no LLM), starting at current_round."""
+    return lambda current_round="prep_oa": run(_create_session, recruiter[1], current_round)
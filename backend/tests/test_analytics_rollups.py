@@ -0,0 +1,55 @@
+import sys
+from conftest import BACKEND_ROOT, QUESTIONS, run_with_db
+from app.services.session_archive import archive_batch
+
+sys.path.append(BACKEND_ROOT)
+import rebuild_rollups
+
+def run_full_session(client, sid: int, problem_id: int, coding_passed: bool = True):
+    """Plays a session from the MCQ round to completion through the API."""
+    questions = client.get(f"/interviews/{sid}/questions").json()
+    answers = {str(q["id"]): spec["correct_answer"] for q, spec in zip(questions, QUESTIONS)}
+    steps = [
+        ("submit_round", {"data": {"answers": answers}}, None),
+        ("advance", None, None),
+        ("submit_round", {"data": {"type": "oa_coding", "passed": coding_passed}}, {"problem_id": problem_id}),
+        ("advance", None, None),
+        ("submit_round", {"data": {"score": 80}}, None),
+        ("advance", None, None),
+        ("submit_round", {"data": {"score": 90}}, None),
+        ("complete", None, None),
+    ]
+    for action, body, params in steps:
+        r = client.post(f"/interviews/{sid}/{action}", json=body, params=params)
+        assert r.status_code == 200, (action, r.text)
+    return r.json()
+
+def test_completed_session_counts_towards_its_problem(client, recruiter, new_session):
+    headers, _ = recruiter
+    sid = new_session("oa_mcq")
+    assert run_full_session(client, sid, problem_id=7)["decision"] == "Strong Hire"
+
+    r = client.get(f"/interviews/{sid}/state")
+    assert r.json()["current_round"] == "completed"
+
+    dashboard = client.get("/analytics/dashboard", headers=headers).json()
+    assert dashboard["totals"]["sessions"] == 1
+    [problem] = dashboard["problems"]
+    assert problem["problem_id"] == "7"
+    assert (problem["attempts"], problem["passed"], problem["pass_rate"]) == (1, 1, 1.0)
+    # Same bucket as the overall histogram: one session, one score
+    assert problem["score_histogram"] == dashboard["totals"]["score_histogram"]
+    assert sum(problem["score_histogram"]) == 1
+
+def test_rebuild_keeps_archived_sessions(client, run, recruiter, new_session):
+    headers, _ = recruiter
+    for problem_id in (3, 4):
+        run_full_session(client, new_session("oa_mcq"), problem_id, coding_passed=problem_id == 3)
+    before = client.get("/analytics/dashboard", headers=headers).json()
+    assert before["totals"]["sessions"] == 2
+
+    # Everything completed before tomorrow
+    run(run_with_db, archive_batch, 1, -1, 1000)
+    run(rebuild_rollups.rebuild)
+
+    assert client.get("/analytics/dashboard", headers=headers).json() == before
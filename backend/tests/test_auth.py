@@ -0,0 +1,75 @@
+import asyncio
+import threading
+import pytest
+from conftest import signup
+from app import utils
+from app.routers import auth
+from app.services.rate_limiter import LoginThrottle
+from app.utils import PasswordHashingBusy, hash_password_async, verify_and_update_password
+
+def test_hashing_runs_on_the_bcrypt_pool(run, monkeypatch):
+    threads = []
+    real_hash = utils.pwd_context.hash
+
+    def recording_hash(password):
+        threads.append(threading.current_thread().name)
+        return real_hash(password)
+
+    monkeypatch.setattr(utils.pwd_context, "hash", recording_hash)
+    hashed = run(hash_password_async, "pw123456")
+    assert threads[0].startswith("bcrypt")
+    assert run(verify_and_update_password, "pw123456", hashed) == (True, None)
+    assert run(verify_and_update_password, "wrong", hashed)[0] is False
+
+async def _saturate(release: threading.Event):
+    """Occupies every worker, then submits one more hash than the queue allows."""
+    def blocked():
+        release.wait(5)
+        return "done"
+
+    running = [asyncio.ensure_future(utils._run_hashing(blocked)) for _ in range(utils.PASSWORD_HASH_WORKERS)]
+    await asyncio.sleep(0)
+    try:
+        with pytest.raises(PasswordHashingBusy):
+            await utils._run_hashing(blocked)
+    finally:
+        release.set()
+    return await asyncio.gather(*running)
+
+def test_hashing_rejects_work_beyond_the_queue(run, monkeypatch):
+    monkeypatch.setattr(utils, "PASSWORD_HASH_MAX_QUEUE", 0)
+    rejected = utils.password_hashing_stats()["rejected"]
+    assert run(_saturate, threading.Event()) == ["done"] * utils.PASSWORD_HASH_WORKERS
+    assert utils.password_hashing_stats()["rejected"] == rejected + 1
+
+def make_throttle(monkeypatch, per_ip: int, per_account: int) -> LoginThrottle:
+    monkeypatch.setenv("LOGIN_MAX_ATTEMPTS_PER_IP", str(per_ip))
+    monkeypatch.setenv("LOGIN_MAX_FAILURES_PER_ACCOUNT", str(per_account))
+    return LoginThrottle()
+
+def test_throttle_limits_attempts_per_ip(monkeypatch):
+    throttle = make_throttle(monkeypatch, per_ip=3, per_account=100)
+    assert [throttle.check("10.0.0.1", f"user{i}@example.com") for i in range(3)] == [0, 0, 0]
+    assert throttle.check("10.0.0.1", "user9@example.com") > 0
+    assert throttle.check("10.0.0.2", "user9@example.com") == 0
+
+def test_throttle_counts_account_failures_until_success(monkeypatch):
+    throttle = make_throttle(monkeypatch, per_ip=100, per_account=2)
+    throttle.failed("Victim@example.com")
+    assert throttle.check("10.0.0.1", "victim@example.com") == 0
+    throttle.failed("victim@example.com")
+    assert throttle.check("10.0.0.3", "VICTIM@example.com") > 0
+    throttle.succeeded("victim@example.com")
+    assert throttle.check("10.0.0.1", "victim@example.com") == 0
+
+def test_login_is_refused_after_repeated_failures(client, monkeypatch):
+    monkeypatch.setattr(auth, "login_throttle", make_throttle(monkeypatch, per_ip=100, per_account=2))
+    headers, _ = signup(client)
+    email = client.get("/auth/me", headers=headers).json()["email"]
+
+    for _ in range(2):
+        r = client.post("/auth/login", data={"username": email, "password": "wrong-password"})
+        assert r.status_code == 401
+    r = client.post("/auth/login", data={"username": email, "password": "pw123456"})
+    assert r.status_code == 429
+    assert int(r.headers["Retry-After"]) > 0
@@ -0,0 +1,30 @@
+import pytest
+from conftest import run_with_db
+from app.services.interview_flow import advance_round_state, TransitionConflict
+from app.services.unit_of_work import InterviewUnitOfWork
+
+async def _advance_stale(db_a, db_b, session_id: int):
+    """Two requests read the same version; the second to write must lose."""
+    first, second = InterviewUnitOfWork(db_a), InterviewUnitOfWork(db_b)
+    await first.get_session(session_id)
+    await second.get_session(session_id)
+    await advance_round_state(session_id, first)
+    with pytest.raises(TransitionConflict):
+        await advance_round_state(session_id, second)
+
+def test_concurrent_advance_conflicts(client, run, new_session):
+    sid = new_session("prep_oa")
+    run(run_with_db, _advance_stale, 2, sid)
+    # Advanced exactly once
+    assert client.get(f"/interviews/{sid}/state").json()["current_round"] == "oa_mcq"
+
+def test_conflict_is_409(client, new_session, monkeypatch):
+    sid = new_session()
+
+    async def conflicting(session_id, uow):
+        raise TransitionConflict(session_id)
+
+    monkeypatch.setattr("app.routers.interview.advance_round_state", conflicting)
+    monkeypatch.setattr("app.routers.interview.submit_round", lambda session_id, data, uow: conflicting(session_id, uow))
+    assert client.post(f"/interviews/{sid}/advance").status_code == 409
+    assert client.post(f"/interviews/{sid}/submit_round", json={"data": {}}).status_code == 409
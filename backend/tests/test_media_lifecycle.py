@@ -0,0 +1,142 @@
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from sqlalchemy.future import select
+from conftest import BACKEND_ROOT, RESUME_PDF, run_with_db, signup, upload_resume
+from app import database
+from app.models import Candidate, MediaArtifact, User
+from app.services import media_lifecycle
+from app.services.media_lifecycle import sweep, track_artifact, usage_bytes, AUDIO_DIR, RESUME_DIR
+from app.services.upload_storage import store_bytes
+
+sys.path.append(BACKEND_ROOT)
+import bulk_ingest
+
+def write_old(path: str, size: int = 10):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(bytes(size))
+    day_ago = time.time() - 86400
+    os.utime(path, (day_ago, day_ago))
+
+async def _add_candidate(db, user_id: int, resume_url: str):
+    db.add(Candidate(name="Kept", email="kept@example.com", resume_url=resume_url, user_id=user_id))
+    await db.commit()
+
+async def _tracked(db) -> set[str]:
+    return set((await db.execute(select(MediaArtifact.path))).scalars().all())
+
+def test_sweep_keeps_every_referenced_file(client, run, recruiter, new_session):
+    _, user_id = recruiter
+    sid = new_session()
+    kept_docx = os.path.join(RESUME_DIR, "kept.docx")
+    kept_txt = os.path.join(RESUME_DIR, "kept.txt")
+    orphan_docx = os.path.join(RESUME_DIR, "orphan.docx")
+    user_audio = os.path.join(AUDIO_DIR, f"{sid}_abc_user.webm")
+    legacy_reply = os.path.join(AUDIO_DIR, f"{sid}_legacy.mp3")
+    orphan_audio = os.path.join(AUDIO_DIR, "999999_abc_user.webm")
+    for path in (kept_docx, kept_txt, orphan_docx, user_audio, legacy_reply, orphan_audio):
+        write_old(path)
+    run(run_with_db, _add_candidate, 1, user_id, kept_docx)
+    run(run_with_db, _add_candidate, 1, user_id, kept_txt)
+
+    run(run_with_db, sweep, 1)
+
+    for path in (kept_docx, kept_txt, user_audio, legacy_reply):
+        assert os.path.exists(path), path
+    for path in (orphan_docx, orphan_audio):
+        assert not os.path.exists(path), path
+    assert {kept_docx, kept_txt, user_audio, legacy_reply} <= run(run_with_db, _tracked, 1)
+
+async def _flush(db, user_id: int, batch: list[dict], checkpoint_path: str):
+    user = await db.get(User, user_id)
+    inserted = await bulk_ingest.flush_batch(batch, user, bulk_ingest.Checkpoint(checkpoint_path), False)
+    return inserted, await usage_bytes(db, user_id)
+
+def test_bulk_ingest_counts_stored_resumes(run, recruiter, tmp_path):
+    _, user_id = recruiter
+    stored = store_bytes(b"PK docx resume bytes", bulk_ingest.UPLOAD_DIR, suffix=".docx")
+    batch = [{
+        "source_id": "campaign/resume.docx", "name": "Bulk", "resume_url": stored.path,
+        "resume_hash": stored.sha256, "resume_size": stored.size, "resume_text": "Python",
+        "resume_text_complete": True, "analytics": {}, "status": "ready", "questions": None,
+    }]
+    inserted, used = run(run_with_db, _flush, 1, user_id, batch, str(tmp_path / "checkpoint"))
+    assert inserted == 1
+    assert used == stored.size
+    assert stored.path in run(run_with_db, _tracked, 1)
+
+class RemoteStore:
+    """Speech backend stand-in that records whether a write was in progress during its calls."""
+
+    def __init__(self, failing: set[str]):
+        self.failing = failing
+        self.calls_under_lock = 0
+
+    async def delete_remote(self, remote_id: str):
+        self.calls_under_lock += database._sqlite_write_lock.locked()
+        if remote_id in self.failing:
+            raise ConnectionError("provider unavailable")
+
+async def _add_remote_copies(db, user_id: int, count: int) -> list[str]:
+    paths = [os.path.join(AUDIO_DIR, f"remote_{time.time_ns()}_{i}.webm") for i in range(count)]
+    for path in paths:
+        write_old(path, 1) # Tracked, so kept whatever its age
+        await track_artifact(db, path, "user_audio", 1, user_id, remote_id=f"files/{os.path.basename(path)}")
+    await db.commit()
+    return paths
+
+async def _remote_ids(db, paths: list[str]) -> dict:
+    rows = await db.execute(select(MediaArtifact.path, MediaArtifact.remote_id).where(MediaArtifact.path.in_(paths)))
+    return dict(rows.all())
+
+def test_sweep_deletes_remote_copies_outside_the_write_lock(run, recruiter, monkeypatch):
+    _, user_id = recruiter
+    paths = run(run_with_db, _add_remote_copies, 1, user_id, media_lifecycle.REMOTE_DELETE_BATCH + 5)
+    store = RemoteStore({f"files/{os.path.basename(paths[0])}"})
+    monkeypatch.setattr(media_lifecycle, "get_speech_backend", lambda: store)
+
+    report = run(run_with_db, sweep, 1)
+
+    assert store.calls_under_lock == 0
+    assert report.remote_deleted == len(paths) - 1
+    remote_ids = run(run_with_db, _remote_ids, 1, paths)
+    assert remote_ids.pop(paths[0]) is not None # Retried on the next sweep
+    assert set(remote_ids.values()) == {None}
+
+async def _usage(db, *owner_ids: int) -> list[int]:
+    return [await usage_bytes(db, owner_id) for owner_id in owner_ids]
+
+def test_identical_uploads_charge_every_owner(client, run):
+    alice, alice_id = signup(client)
+    bob, bob_id = signup(client)
+    size = os.path.getsize(RESUME_PDF)
+
+    upload_resume(client, alice, name="Shared")
+    upload_resume(client, bob, name="Shared")
+    upload_resume(client, alice, name="Shared again") # Same owner, same content: charged once
+    assert run(run_with_db, _usage, 1, alice_id, bob_id) == [size, size]
+
+async def _share_audio(db, path: str, owners: list[tuple[int, datetime]]):
+    for owner_id, created_at in owners:
+        await track_artifact(db, path, "user_audio", 10, owner_id, created_at=created_at)
+    await db.commit()
+
+def test_sweep_keeps_a_file_until_its_last_reference_expires(run, recruiter):
+    _, user_id = recruiter
+    other_id = user_id + 100000
+    path = os.path.join(AUDIO_DIR, f"shared_{time.time_ns()}_user.webm")
+    write_old(path)
+    long_ago = datetime.utcnow() - timedelta(days=media_lifecycle.AUDIO_RETENTION_DAYS + 1)
+    run(run_with_db, _share_audio, 1, path, [(user_id, long_ago), (other_id, datetime.utcnow())])
+
+    run(run_with_db, sweep, 1)
+    assert os.path.exists(path)
+    assert run(run_with_db, _usage, 1, user_id, other_id) == [0, 10]
+
+    later = datetime.utcnow() + timedelta(days=media_lifecycle.AUDIO_RETENTION_DAYS + 1)
+    run(run_with_db, sweep, 1, later)
+    assert not os.path.exists(path)
+    assert path not in run(run_with_db, _tracked, 1)
+    assert run(run_with_db, _usage, 1, other_id) == [0]
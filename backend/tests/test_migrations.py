@@ -0,0 +1,69 @@
+from sqlalchemy import create_engine, inspect, text
+from app.migrations.runner import MIGRATIONS, applied_versions, upgrade
+
+# Tables as an early create_all left them, before the columns that m0002 backfills
+LEGACY_SCHEMA = [
+    """CREATE TABLE users (
+        id INTEGER PRIMARY KEY, email VARCHAR NOT NULL UNIQUE, hashed_password VARCHAR NOT NULL,
+        full_name VARCHAR, created_at DATETIME)""",
+    """CREATE TABLE candidates (
+        id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, email VARCHAR NOT NULL, resume_url VARCHAR NOT NULL,
+        resume_text VARCHAR, created_at DATETIME DEFAULT CURRENT_TIMESTAMP, user_id INTEGER REFERENCES users (id))""",
+    """CREATE TABLE interview_sessions (
+        id INTEGER PRIMARY KEY, candidate_id INTEGER REFERENCES candidates (id), status VARCHAR, score INTEGER,
+        current_round VARCHAR, round_data JSON, start_time DATETIME, end_time DATETIME)""",
+    """CREATE TABLE questions (
+        id INTEGER PRIMARY KEY, text VARCHAR, options JSON, correct_answer INTEGER, difficulty VARCHAR, tags JSON,
+        candidate_id INTEGER REFERENCES candidates (id), session_id INTEGER REFERENCES interview_sessions (id))""",
+]
+
+def legacy_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        for ddl in LEGACY_SCHEMA:
+            conn.execute(text(ddl))
+        conn.execute(text("INSERT INTO users (id, email, hashed_password) VALUES (1, 'legacy@example.com', 'x')"))
+        conn.execute(text(
+            "INSERT INTO candidates (id, name, email, resume_url, resume_text, user_id) "
+            "VALUES (1, 'Legacy', 'legacy@example.com', 'uploads/resumes/legacy.pdf', 'Python developer', 1)"
+        ))
+        conn.execute(text(
+            "INSERT INTO interview_sessions (id, candidate_id, status, score, current_round, round_data) "
+            "VALUES (5, 1, 'in_progress', 0, 'oa_mcq', '{}')"
+        ))
+    return engine
+
+def test_upgrades_a_legacy_database(tmp_path):
+    engine = legacy_engine(tmp_path)
+    with engine.connect() as conn:
+        assert upgrade(conn) == [m.VERSION for m in MIGRATIONS]
+
+    with engine.connect() as conn:
+        columns = {c["name"] for c in inspect(conn).get_columns("candidates")}
+        assert {"status", "analytics", "resume_hash", "resume_text_complete"} <= columns
+        columns = {c["name"] for c in inspect(conn).get_columns("interview_sessions")}
+        assert {"decision", "breakdown", "version"} <= columns
+        assert "media_refs" in inspect(conn).get_table_names()
+
+        # Existing rows survive, with the backfilled defaults
+        assert conn.execute(text("SELECT name, status, resume_text_complete FROM candidates")).one() == ("Legacy", "processing", 1)
+        assert conn.execute(text("SELECT id, current_round FROM interview_sessions")).one() == (5, "oa_mcq")
+        # ... and are in the search index built on top of them
+        hits = conn.execute(text("SELECT rowid FROM candidates_fts WHERE candidates_fts MATCH 'python'")).scalars().all()
+        assert hits == [1]
+
+def test_upgrade_is_idempotent(tmp_path):
+    engine = legacy_engine(tmp_path)
+    with engine.connect() as conn:
+        upgrade(conn)
+    with engine.connect() as conn:
+        assert upgrade(conn) == []
+        assert applied_versions(conn) == {m.VERSION for m in MIGRATIONS}
+
+def test_fresh_database_gets_the_current_schema(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    with engine.connect() as conn:
+        assert upgrade(conn) == [m.VERSION for m in MIGRATIONS]
+        assert {"candidates", "interview_sessions", "media_artifacts", "media_refs", "session_events"} <= set(
+            inspect(conn).get_table_names()
+        )
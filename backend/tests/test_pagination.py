@@ -0,0 +1,50 @@
+from sqlalchemy import insert
+from conftest import run_with_db, QUESTIONS
+from app.models import Candidate
+from app.services.question_bank import create_sessions_with_questions
+
+def walk(client, url, headers=None, limit=2) -> list[int]:
+    ids, cursor = [], None
+    for _ in range(50):
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        r = client.get(url, params=params, headers=headers)
+        assert r.status_code == 200, r.text
+        ids += [row["id"] for row in r.json()]
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            return ids
+    raise AssertionError(f"Pagination did not terminate: {ids}")
+
+async def _add_candidates(db, user_id: int, count: int):
+    # One statement: the server default gives every row the same created_at
+    await db.execute(insert(Candidate), [
+        {"name": f"Paged {i}", "email": "paged@example.com", "resume_url": "pending_upload", "user_id": user_id}
+        for i in range(count)
+    ])
+    await db.commit()
+
+async def _add_sessions(db, candidate_id: int, count: int):
+    await create_sessions_with_questions(db, [(candidate_id, QUESTIONS)] * count)
+    await db.commit()
+
+def test_candidate_pages_cover_every_row_once(client, run, recruiter):
+    headers, user_id = recruiter
+    run(run_with_db, _add_candidates, 1, user_id, 7)
+    everything = [row["id"] for row in client.get("/candidates/", params={"limit": 200}, headers=headers).json()]
+    assert len(everything) == 8 # Plus the profile created at signup
+
+    for limit in (1, 2, 3, 7):
+        assert walk(client, "/candidates/", headers, limit) == everything
+
+def test_session_history_pages_cover_every_row_once(client, run, new_session):
+    sid = new_session()
+    candidate_id = client.get(f"/interviews/{sid}").json()["candidate_id"]
+    run(run_with_db, _add_sessions, 1, candidate_id, 4)
+    everything = [row["id"] for row in client.get(f"/interviews/resume/{candidate_id}", params={"limit": 200}).json()]
+    assert len(everything) == 5
+
+    assert walk(client, f"/interviews/resume/{candidate_id}") == everything
+
+def test_invalid_cursor(client, recruiter):
+    headers, _ = recruiter
+    assert client.get("/candidates/", params={"cursor": "not a cursor"}, headers=headers).status_code == 400
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+from app.services.principal_cache import PrincipalCache, principal_cache
+
+def user(user_id: int, email: str):
+    return SimpleNamespace(id=user_id, email=email)
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("app.services.principal_cache.time.monotonic", lambda: clock[0])
+    cache = PrincipalCache(ttl=60, max_size=10)
+    cache.set(1, user(1, "a@example.com"))
+    clock[0] += 59
+    assert cache.get(1).email == "a@example.com"
+    clock[0] += 1
+    assert cache.get(1) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_size_is_bounded_and_invalidation_matches_id_or_email():
+    cache = PrincipalCache(ttl=60, max_size=2)
+    cache.set(1, user(1, "a@example.com"))
+    cache.set("b@example.com", user(2, "b@example.com"))
+    cache.set(3, user(3, "c@example.com")) # Evicts the oldest entry
+    assert cache.get(1) is None
+    cache.invalidate(email="b@example.com")
+    assert cache.get("b@example.com") is None
+    cache.invalidate(user_id=3)
+    assert cache.get(3) is None
+
+def test_zero_ttl_disables_caching():
+    cache = PrincipalCache(ttl=0)
+    cache.set(1, user(1, "a@example.com"))
+    assert cache.get(1) is None
+
+def test_authenticated_requests_reuse_the_principal(client, recruiter):
+    headers, user_id = recruiter
+    client.get("/auth/me", headers=headers)
+    hits = principal_cache.hits
+    r = client.get("/auth/me", headers=headers)
+    assert r.json()["id"] == user_id
+    assert principal_cache.hits == hits + 1
+    # The cached user is served without a database lookup
+    assert r.headers["X-DB-Query-Count"] == "0"
@@ -0,0 +1,35 @@
+"""
+Statements per request on the interview hot path, from the X-DB-Query-Count header
+(see database.QueryCounter). A higher count is a regression: the unit of work loads
+each session, candidate and question set at most once and commits once.
+"""
+
+def query_count(response) -> int:
+    assert response.status_code == 200, response.text
+    return int(response.headers["X-DB-Query-Count"])
+
+def test_state(client, new_session):
+    sid = new_session()
+    # The session, read once
+    assert query_count(client.get(f"/interviews/{sid}/state")) == 1
+
+def test_submit_round(client, new_session):
+    sid = new_session("oa_mcq")
+    # Session, score row lookup, questions (MCQ grading), conditional UPDATE, event, score row insert
+    assert query_count(client.post(f"/interviews/{sid}/submit_round", json={"data": {"answers": {}}})) == 6
+    # Later rounds: session, score row, conditional UPDATE, event
+    assert query_count(client.post(f"/interviews/{sid}/submit_round", json={"data": {"score": 70}})) == 4
+
+def test_results(client, new_session):
+    sid = new_session("oa_mcq")
+    client.post(f"/interviews/{sid}/submit_round", json={"data": {"answers": {}}})
+    # The materialized score record only
+    assert query_count(client.get(f"/interviews/{sid}/results")) == 1
+
+def test_complete(client, new_session):
+    sid = new_session("tech_2")
+    client.post(f"/interviews/{sid}/submit_round", json={"data": {"score": 90}})
+    # Session, score, candidate, snapshot, conditional UPDATE, event + state snapshot, rollup
+    assert query_count(client.post(f"/interviews/{sid}/complete")) == 8
+    # Completing again leaves the rollups alone
+    assert query_count(client.post(f"/interviews/{sid}/complete")) == 7
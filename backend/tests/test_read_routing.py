@@ -0,0 +1,53 @@
+import pytest
+from starlette.requests import Request
+from app import database
+from app.database import get_read_db, mark_write, sticky_key, wrote_recently
+
+def make_request(token: str | None = None, host: str = "10.0.0.1") -> Request:
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "client": (host, 1234)})
+
+async def _read_bind(request: Request):
+    dependency = get_read_db(request)
+    session = await dependency.__anext__()
+    try:
+        return session.bind
+    finally:
+        await dependency.aclose()
+
+@pytest.fixture
+def replica(monkeypatch):
+    """Pretends a replica is configured; its sessions are those of database.ReadSessionLocal."""
+    monkeypatch.setattr(database, "DATABASE_REPLICA_URL", "sqlite+aiosqlite:///replica.db")
+
+def test_sticky_key_prefers_the_token():
+    assert sticky_key(make_request("abc", "10.0.0.1")) == sticky_key(make_request("abc", "10.0.0.2"))
+    assert sticky_key(make_request("abc")) != sticky_key(make_request("abd"))
+    assert sticky_key(make_request(host="10.0.0.1")) != sticky_key(make_request(host="10.0.0.2"))
+
+def test_writes_are_sticky_for_the_window(monkeypatch):
+    key = sticky_key(make_request("window"))
+    assert not wrote_recently(key)
+    mark_write(key)
+    assert wrote_recently(key)
+    monkeypatch.setattr(database, "READ_STICKY_SECONDS", 0)
+    assert not wrote_recently(key)
+
+def test_reads_follow_recent_writes_to_the_primary(replica, run):
+    request = make_request("sticky-reader")
+    assert run(_read_bind, request) is database.read_engine
+    mark_write(sticky_key(request))
+    assert run(_read_bind, request) is database.engine
+    # Other clients keep reading from the replica
+    assert run(_read_bind, make_request("someone-else")) is database.read_engine
+
+def test_only_writing_requests_start_the_window(client, recruiter, new_session):
+    headers, _ = recruiter
+    key = sticky_key(make_request(headers["Authorization"].removeprefix("Bearer ")))
+    database._last_write_at.pop(key, None)
+    sid = new_session()
+
+    client.get(f"/interviews/{sid}/state", headers=headers)
+    assert not wrote_recently(key)
+    client.post(f"/interviews/{sid}/advance", headers=headers)
+    assert wrote_recently(key)
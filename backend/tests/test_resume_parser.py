@@ -0,0 +1,36 @@
+from conftest import RESUME_PDF
+from app.services.resume_parser import _join_bounded, parse_resume_bounded, parse_resume
+
+class CountingChunks:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.pulled = 0
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.pulled += 1
+            yield chunk
+
+def test_join_bounded_stops_pulling_at_the_budget():
+    chunks = CountingChunks(["aaaa", "bbbb", "cccc", "dddd"])
+    text, complete = _join_bounded(chunks, 6)
+    assert (text, complete) == ("aaaabb", False)
+    assert chunks.pulled == 2
+
+def test_join_bounded_reports_complete_text():
+    assert _join_bounded(["ab", "cd"], 10) == ("abcd", True)
+    assert _join_bounded(["ab", "cd"], None) == ("abcd", True)
+    # Ending exactly on the budget: the rest was never read
+    assert _join_bounded(["ab", "cd", "ef"], 4) == ("abcd", False)
+
+def test_parse_resume_bounded_truncates_the_pdf():
+    full = parse_resume(RESUME_PDF)
+    text, complete = parse_resume_bounded(RESUME_PDF, max_chars=200)
+    assert len(text) == 200 and not complete
+    assert full.startswith(text)
+    assert parse_resume_bounded(RESUME_PDF, max_chars=len(full) + 1) == (full, True)
+
+def test_parse_resume_bounded_ignores_unknown_types(tmp_path):
+    path = tmp_path / "resume.txt"
+    path.write_text("plain text")
+    assert parse_resume_bounded(str(path)) == ("", True)
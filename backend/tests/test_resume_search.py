@@ -0,0 +1,37 @@
+from conftest import RESUME_PDF, run_with_db, signup, upload_resume
+from app.models import Candidate
+from app.services.resume_parser import parse_resume_bounded, parse_resume
+
+def test_search_only_returns_own_candidates(client):
+    alice, _ = signup(client)
+    bob, _ = signup(client)
+    mine = upload_resume(client, alice, name="Alice Pick")
+    theirs = upload_resume(client, bob, name="Bob Pick")
+
+    for headers, own, other in ((alice, mine, theirs), (bob, theirs, mine)):
+        r = client.get("/candidates/search", params={"q": "Agarwal"}, headers=headers)
+        assert r.status_code == 200
+        ids = [hit["id"] for hit in r.json()["results"]]
+        assert own["id"] in ids
+        assert other["id"] not in ids
+
+async def _truncate_resume_text(db, candidate_id: int, max_chars: int):
+    candidate = await db.get(Candidate, candidate_id)
+    candidate.resume_text, candidate.resume_text_complete = parse_resume_bounded(candidate.resume_url, max_chars)
+    await db.commit()
+
+def test_search_and_detail_complete_budget_limited_text(client, run):
+    headers, _ = signup(client)
+    cid = upload_resume(client, headers, name="Budget Pick")["id"]
+    # As if the upload had stopped parsing well before the certifications section
+    run(run_with_db, _truncate_resume_text, 1, cid, 200)
+
+    r = client.get("/candidates/search", params={"q": "HackerRank"}, headers=headers)
+    assert [hit["id"] for hit in r.json()["results"]] == [cid]
+
+    r = client.get(f"/candidates/{cid}", headers=headers)
+    assert r.status_code == 200
+    assert r.json()["resume_text"] == parse_resume(RESUME_PDF)
+
+    other, _ = signup(client)
+    assert client.get(f"/candidates/{cid}", headers=other).status_code == 404
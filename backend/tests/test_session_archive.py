@@ -0,0 +1,43 @@
+from conftest import run_with_db, QUESTIONS
+from app.services.question_bank import create_sessions_with_questions
+from app.services.session_archive import archive_batch
+
+def test_archive_round_trip(client, run, new_session):
+    sid = new_session("tech_2")
+    client.post(f"/interviews/{sid}/submit_round", json={"data": {"score": 90}})
+    client.post(f"/interviews/{sid}/complete")
+    session = client.get(f"/interviews/{sid}").json()
+    results = client.get(f"/interviews/{sid}/results").json()
+
+    # Everything completed before tomorrow
+    archived, _ = run(run_with_db, archive_batch, 1, -1, 1000)
+    assert archived >= 1
+
+    restored = client.get(f"/interviews/{sid}").json()
+    assert restored["archived"] is True
+    for key in ("id", "candidate_id", "status", "decision", "score", "current_round", "round_data", "breakdown"):
+        assert restored[key] == session[key]
+    assert client.get(f"/interviews/{sid}/results").json() == results
+    # The hot rows are gone
+    assert client.get(f"/interviews/{sid}/state").status_code == 404
+
+async def _add_live_session(db, candidate_id: int) -> int:
+    [session_id] = await create_sessions_with_questions(db, [(candidate_id, QUESTIONS)])
+    await db.commit()
+    return session_id
+
+def test_candidate_questions_after_archiving(client, run, new_session):
+    archived_sid = new_session("tech_2")
+    candidate_id = client.get(f"/interviews/{archived_sid}").json()["candidate_id"]
+    live_sid = run(run_with_db, _add_live_session, 1, candidate_id)
+    client.post(f"/interviews/{archived_sid}/submit_round", json={"data": {"score": 90}})
+    client.post(f"/interviews/{archived_sid}/complete")
+    run(run_with_db, archive_batch, 1, -1, 1000)
+
+    questions = client.get(f"/candidates/{candidate_id}/questions").json()
+    assert len(questions) == len(QUESTIONS)
+    assert {q["session_id"] for q in questions} == {live_sid}
+
+    answers = {q["id"]: q["correct_answer"] for q in questions}
+    r = client.post(f"/candidates/{candidate_id}/quiz_submit", json={"answers": answers})
+    assert r.json()["score"] == len(QUESTIONS)
@@ -0,0 +1,24 @@
+from conftest import run_with_db
+from app.services.session_events import rebuild_state, session_state, SNAPSHOT_EVERY
+from app.models import InterviewSession
+
+async def _rebuilt_and_stored(db, session_id: int):
+    state, replayed = await rebuild_state(db, session_id)
+    session = await db.get(InterviewSession, session_id)
+    return state, replayed, session_state(session)
+
+def test_event_log_rebuilds_session(client, run, new_session):
+    sid = new_session("prep_oa")
+    requests = [lambda: client.post(f"/interviews/{sid}/advance")]
+    requests += [lambda: client.post(f"/interviews/{sid}/submit_round", json={"data": {"answers": {}}})]
+    requests += [lambda: client.post(f"/interviews/{sid}/submit_round", json={"data": {"score": 75}})] * 6
+    requests += [lambda: client.post(f"/interviews/{sid}/complete")]
+
+    for request in requests:
+        assert request().status_code == 200
+        # Before the first snapshot, from one, and after the forced snapshot at completion
+        rebuilt, replayed, stored = run(run_with_db, _rebuilt_and_stored, 1, sid)
+        assert rebuilt == stored
+        # Snapshots bound the replay (the log starts with session_started)
+        assert replayed <= SNAPSHOT_EVERY
+    assert stored["status"] == "completed"
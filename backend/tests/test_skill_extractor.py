@@ -0,0 +1,65 @@
+from app.services import resume_parser
+from app.services.skill_extractor import AhoCorasick, build_local_analytics, extract_skills
+
+def test_aho_corasick_finds_overlapping_patterns():
+    automaton = AhoCorasick()
+    for pattern in ("he", "she", "his", "hers"):
+        automaton.add(pattern, pattern)
+    automaton.build()
+    matches = sorted(automaton.iter("ushers"))
+    assert matches == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+def test_aho_corasick_without_matches():
+    automaton = AhoCorasick()
+    automaton.add("java", "Java")
+    automaton.build()
+    assert list(automaton.iter("python only")) == []
+    assert list(automaton.iter("")) == []
+
+def test_extract_skills_respects_word_boundaries():
+    skills = extract_skills("Built services in Java and C++, not JavaScript. Go-getter.")
+    languages = [lang["name"] for lang in skills["primary_languages"]]
+    assert set(languages) == {"Java", "C++", "JavaScript"}
+
+def test_noisy_aliases_are_not_skills():
+    text = "Loaded cargo with a torch at night. Campus security lead. Used lambda functions, the STL and monitoring."
+    skills = extract_skills(text)
+    assert skills["primary_languages"] == []
+    assert skills["core_domains"] == []
+
+def test_build_local_analytics():
+    text = (
+        "Senior engineer, 7 years of Python and Django building REST APIs. "
+        "Deployed with Docker and Kubernetes on AWS. Strong data structures and algorithms."
+    )
+    analytics = build_local_analytics(text)
+    assert analytics["experience_level"] == "Senior"
+    assert analytics["primary_languages"][0]["name"] == "Python"
+    domains = {domain["name"] for domain in analytics["core_domains"]}
+    assert {"Backend", "DevOps", "Cloud", "DSA"} <= domains
+    assert "DSA" not in analytics["recommended_focus"]
+    assert 0 < analytics["readiness_score"] <= 90
+
+def test_generate_analytics_merges_the_local_scan(monkeypatch):
+    monkeypatch.setattr(resume_parser, "generate_json", lambda prompt, timeout=None: {
+        "experience_level": "Mid",
+        "readiness_score": 70,
+        "primary_languages": [{"name": "python", "confidence": 90}, {"name": "Haskell", "confidence": 60}],
+        "core_domains": [{"name": "Compilers", "coverage": 50}],
+        "strengths": ["Typed functional code"],
+    })
+    analytics = resume_parser.generate_analytics("Python and Django backend developer")
+    assert analytics["experience_level"] == "Mid"
+    assert analytics["strengths"] == ["Typed functional code"]
+    assert [lang["name"] for lang in analytics["primary_languages"]] == ["Python", "Haskell"]
+    assert [domain["name"] for domain in analytics["core_domains"]] == ["Backend", "Compilers"]
+
+def test_generate_analytics_falls_back_to_the_local_scan(monkeypatch):
+    def timed_out(prompt, timeout=None):
+        raise TimeoutError("deadline exceeded")
+    text = "Python and Django backend developer"
+    monkeypatch.setattr(resume_parser, "generate_json", timed_out)
+    assert resume_parser.generate_analytics(text) == build_local_analytics(text)
+    # No API key: generate_json returns {} without a network call
+    monkeypatch.undo()
+    assert resume_parser.generate_analytics(text) == build_local_analytics(text)
@@ -0,0 +1,58 @@
+import os
+import pytest
+from app.services.speech_backends import SpeechBackend
+from app.services.tts_cache import TTSCache
+
+def test_reply_audio_is_served_from_sentence_entries(client, new_session):
+    sid = new_session("tech_1")
+    r = client.post(f"/interviews/{sid}/speak", files={"audio": ("turn.webm", b"\x1aE\xdf\xa3" + bytes(2048), "audio/webm")})
+    assert r.status_code == 200, r.text
+    url = r.json()["audio_url"].removeprefix("http://localhost:8000")
+
+    reply = client.get(url)
+    assert reply.status_code == 200
+    assert reply.headers["content-type"] == "audio/mpeg"
+    assert len(reply.content) > 0
+    # Nothing but the per-sentence entries is written to the cache
+    keys = [part.removeprefix("k=") for part in url.split("?", 1)[1].split("&")]
+    cache_dir = os.path.join("uploads", "tts_cache")
+    assert reply.content == b"".join(open(os.path.join(cache_dir, f"{key}.mp3"), "rb").read() for key in keys)
+
+def test_reply_audio_rejects_other_paths(client, new_session):
+    sid = new_session()
+    assert client.get(f"/interviews/{sid}/reply_audio", params={"k": "../../test.db"}).status_code == 400
+    assert client.get(f"/interviews/{sid}/reply_audio", params={"k": "0" * 64}).status_code == 404
+
+def test_pinned_entries_survive_eviction(tmp_path):
+    cache = TTSCache(str(tmp_path), max_bytes=250)
+    pinned = cache.key("Returned reply", "voice")
+    cache.put(pinned, bytes(100))
+    cache.pin([pinned])
+    for i in range(5):
+        cache.put(cache.key(f"Sentence {i}", "voice"), bytes(100))
+    assert cache.get(pinned) is not None
+    assert cache.stats()["bytes"] <= 250
+
+    cache.unpin([pinned])
+    for i in range(5, 8):
+        cache.put(cache.key(f"Sentence {i}", "voice"), bytes(100))
+    assert cache.get(pinned) is None
+
+def test_pins_expire(tmp_path):
+    cache = TTSCache(str(tmp_path), max_bytes=150)
+    key = cache.key("Never fetched", "voice")
+    cache.put(key, bytes(100))
+    cache.pin([key], seconds=0)
+    cache.put(cache.key("Next", "voice"), bytes(100))
+    assert cache.get(key) is None
+
+def test_backend_missing_a_stage_fails_at_construction():
+    class NoSpeech(SpeechBackend):
+        async def prepare_audio(self, audio_path):
+            return audio_path
+
+        async def stream_reply(self, prompt, audio):
+            yield "Hello."
+
+    with pytest.raises(TypeError, match="synthesize"):
+        NoSpeech()
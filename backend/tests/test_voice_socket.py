@@ -0,0 +1,66 @@
+import json
+from sqlalchemy import func
+from sqlalchemy.future import select
+from conftest import run_with_db
+from app.models import TranscriptTurn
+
+def receive_turn(ws) -> list[dict]:
+    """Messages of one answered turn, up to done (or an error)."""
+    messages = []
+    while True:
+        message = ws.receive_json()
+        if message["type"] == "audio":
+            message["payload"] = ws.receive_bytes()
+        messages.append(message)
+        if message["type"] in ("done", "error"):
+            return messages
+
+async def _transcript_size(db, session_id: int) -> int:
+    return (await db.execute(select(func.count()).select_from(TranscriptTurn).where(TranscriptTurn.session_id == session_id))).scalar()
+
+def test_voice_turn_over_websocket(client, run, new_session):
+    sid = new_session("tech_1")
+    with client.websocket_connect(f"/interviews/{sid}/voice") as ws:
+        assert ws.receive_json() == {"type": "ready", "session_id": sid, "current_round": "tech_1"}
+        for _ in range(2):
+            ws.send_bytes(b"\x1aE\xdf\xa3" + bytes(512))
+            ws.send_bytes(bytes(512))
+            ws.send_text(json.dumps({"type": "end_turn"}))
+            messages = receive_turn(ws)
+            assert messages[-1]["type"] == "done"
+            texts = [m["text"] for m in messages if m["type"] == "text"]
+            audio = [m for m in messages if m["type"] == "audio"]
+            assert " ".join(texts) == messages[-1]["text"]
+            assert [m["index"] for m in audio] == list(range(len(texts)))
+            assert all(len(m["payload"]) == m["bytes"] for m in audio)
+
+        ws.send_text(json.dumps({"type": "ping"}))
+        assert ws.receive_json() == {"type": "pong"}
+        ws.send_text("not json")
+        assert ws.receive_json()["type"] == "error"
+
+    # Both turns were persisted (user audio + ai reply each)
+    assert run(run_with_db, _transcript_size, 1, sid) == 4
+
+def test_oversized_utterance_is_discarded_up_to_end_turn(client, new_session, monkeypatch):
+    monkeypatch.setattr("app.services.voice_socket.MAX_AUDIO_BYTES", 1000)
+    sid = new_session("tech_1")
+    with client.websocket_connect(f"/interviews/{sid}/voice") as ws:
+        ws.receive_json()
+        ws.send_bytes(bytes(600))
+        ws.send_bytes(bytes(600))
+        error = ws.receive_json()
+        assert error["type"] == "error" and "discarded" in error["detail"]
+        # The rest of the oversized utterance is dropped, and it is not answered
+        ws.send_bytes(bytes(600))
+        ws.send_text(json.dumps({"type": "end_turn"}))
+        ws.send_text(json.dumps({"type": "ping"}))
+        assert ws.receive_json() == {"type": "pong"}
+
+        ws.send_bytes(b"\x1aE\xdf\xa3" + bytes(100))
+        ws.send_text(json.dumps({"type": "end_turn"}))
+        assert receive_turn(ws)[-1]["type"] == "done"
+
+def test_unknown_session_is_closed(client):
+    with client.websocket_connect("/interviews/999999/voice") as ws:
+        assert ws.receive_json() == {"type": "error", "detail": "Session not found"}
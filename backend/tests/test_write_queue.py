@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+from sqlalchemy import func, insert
+from sqlalchemy.future import select
+from app.database import (
+    write_queue, run_write, AsyncSessionLocal, ReadSessionLocal, WriteQueue, WriteLockReentered,
+)
+from app.models import Candidate
+
+async def _committed(name: str) -> int:
+    """Rows visible to another connection, i.e. committed."""
+    async with ReadSessionLocal() as db:
+        return (await db.execute(select(func.count()).select_from(Candidate).where(Candidate.name == name))).scalar()
+
+async def _group(name: str, size: int, failing: int | None):
+    seen_uncommitted = []
+
+    def op(i):
+        async def write(session):
+            await session.execute(insert(Candidate).values(name=name, email="queue@example.com", resume_url="x"))
+            if i == failing:
+                raise ValueError("op failed")
+            # Rows of the earlier ops are not committed yet
+            seen_uncommitted.append(await _committed(name))
+            return i
+        return write
+
+    commits = write_queue.commits
+    results = await asyncio.gather(*(write_queue.submit(op(i)) for i in range(size)), return_exceptions=True)
+    return results, write_queue.commits - commits, seen_uncommitted, await _committed(name)
+
+def test_group_commits_once(run):
+    results, commits, seen_uncommitted, committed = run(_group, "Group commit", 8, None)
+    assert results == list(range(8))
+    assert commits == 1
+    assert seen_uncommitted == [0] * 8
+    assert committed == 8
+
+def test_failed_op_rolls_back_only_its_savepoint(run):
+    results, commits, _, committed = run(_group, "Group with failure", 5, 2)
+    assert isinstance(results[2], ValueError)
+    assert [r for i, r in enumerate(results) if i != 2] == [0, 1, 3, 4]
+    assert commits == 1
+    assert committed == 4
+
+async def _run_write_while_holding_the_lock():
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(Candidate).values(name="Reentrant", email="queue@example.com", resume_url="x"))
+        try:
+            # Called on the holding task itself (wait_for would run it in a task of its own)
+            await run_write(lambda session: session.execute(select(1)))
+        finally:
+            await db.rollback()
+
+def test_run_write_refuses_reentry(run):
+    with pytest.raises(WriteLockReentered):
+        run(_run_write_while_holding_the_lock)
+    # The lock was released with the outer session
+    assert run(run_write, lambda session: _echo(7)) == 7
+
+async def _echo(value):
+    return value
+
+async def _submit_with_lock_held():
+    lock = asyncio.Lock()
+    await lock.acquire()
+    queue = WriteQueue(write_queue._session_factory, lock, lock_timeout=0.05)
+    queue.start()
+    try:
+        return await asyncio.wait_for(queue.submit(lambda session: _echo(1)), 1)
+    finally:
+        await queue.stop()
+        lock.release()
+
+def test_queue_gives_up_on_a_held_lock(run):
+    with pytest.raises(TimeoutError):
+        run(_submit_with_lock_held)
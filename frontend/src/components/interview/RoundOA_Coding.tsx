@@ -40,17 +40,31 @@ export default function RoundOA_Coding({ sessionId, onComplete }: Props) {
     const [loading, setLoading] = useState(true);
     const [timeLeft, setTimeLeft] = useState(30 * 60);
 
+    // Records the round (and the problem it was on) for scoring and per-problem analytics
+    const submitRound = (passed: boolean, autoSubmitted = false) =>
+        axios.post(`http://localhost:8000/interview/${sessionId}/submit_round`, {
+            data: {
+                type: 'oa_coding',
+                language,
+                passed,
+                auto_submitted: autoSubmitted
+            }
+        }, {
+            params: { problem_id: problem!.problem_id }
+        });
+
     const handleForceSubmit = async () => {
         // ... (existing logic)
         if (!problem) return;
         setSubmitting(true);
         try {
-            await axios.post(`http://localhost:8000/interview/${sessionId}/coding/submit`, {
+            const response = await axios.post(`http://localhost:8000/interview/${sessionId}/coding/submit`, {
                 language,
                 code
             }, {
                 params: { problem_id: problem.problem_id }
             });
+            await submitRound(Boolean(response.data.passed), true);
             console.log("Interview Terminated. Submitting current progress.");
             onComplete();
         } catch (e) {
@@ -162,6 +176,7 @@ export default function RoundOA_Coding({ sessionId, onComplete }: Props) {
 
             const resultOutput = response.data.execution_result?.output || "";
             const passed = response.data.passed;
+            await submitRound(Boolean(passed));
 
             if (!passed) {
                 setOutput(prev => prev + "\n\n[System] Warning: Some test cases failed. Submitting anyway...");
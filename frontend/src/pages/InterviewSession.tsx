@@ -62,7 +62,12 @@ export default function InterviewSession() {
 
         try {
             if (action === 'advance') {
-                await axios.post(`http://localhost:8000/interview/${sessionId}/advance`);
+                try {
+                    await axios.post(`http://localhost:8000/interview/${sessionId}/advance`);
+                } catch (error) {
+                    // 409: the round already moved on (another tab or a retry), just reload it
+                    if (!axios.isAxiosError(error) || error.response?.status !== 409) throw error;
+                }
             }
             // 'refresh' just fetches new state (assuming submit happened inside component)
             await fetchState(true);
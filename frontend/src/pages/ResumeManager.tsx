@@ -206,10 +206,18 @@ const InterviewHistory = ({ resumeId }: { resumeId: number }) => {
             try {
                 const token = localStorage.getItem('token');
                 if (!token) return;
-                const res = await axios.get(`http://localhost:8000/interviews/resume/${resumeId}`, {
-                    headers: { Authorization: `Bearer ${token}` }
-                });
-                setHistory(res.data);
+                // The endpoint pages its results; follow X-Next-Cursor until the last page.
+                const items: HistoryItem[] = [];
+                let cursor: string | undefined;
+                do {
+                    const res = await axios.get(`http://localhost:8000/interviews/resume/${resumeId}`, {
+                        params: { cursor },
+                        headers: { Authorization: `Bearer ${token}` }
+                    });
+                    items.push(...res.data);
+                    cursor = res.headers['x-next-cursor'] || undefined;
+                } while (cursor);
+                setHistory(items);
             } catch (error) {
                 console.error("Fetch history failed", error);
             } finally {
@@ -298,14 +306,22 @@ export default function ResumeManager() {
             const token = localStorage.getItem('token');
             if (!token) return; // Guard against no auth
 
-            const response = await axios.get('http://localhost:8000/candidates/', {
-                headers: { Authorization: `Bearer ${token}` }
-            });
-            setResumes(response.data);
+            // The list is paged; keep following X-Next-Cursor until the last page.
+            const items: Resume[] = [];
+            let cursor: string | undefined;
+            do {
+                const response = await axios.get('http://localhost:8000/candidates/', {
+                    params: { fields: 'analytics', limit: 200, cursor },
+                    headers: { Authorization: `Bearer ${token}` }
+                });
+                items.push(...response.data);
+                cursor = response.headers['x-next-cursor'] || undefined;
+            } while (cursor);
+            setResumes(items);
 
             // Auto-select removed for strict resume-centric flow
-            // if (response.data.length > 0 && !selectedResumeId && !isPolling) {
-            //     setSelectedResumeId(response.data[0].id);
+            // if (items.length > 0 && !selectedResumeId && !isPolling) {
+            //     setSelectedResumeId(items[0].id);
             // }
         } catch (error) {
             console.error("Failed to fetch resumes", error);